@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Signature Matching Micro-Benchmark
+
+Times the verification tools' SignatureIndex checks on realistic response
+bodies against the alternatives: the inline `any(s in body ...)` loops the
+index replaced, and a compiled regex alternation of the same signatures.
+The index should never be slower than the inline loop.
+
+Usage:
+    python scripts/benchmark_matcher.py
+    python scripts/benchmark_matcher.py --body-chars 20000 --number 5000
+"""
+
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mcp_server.tools import FILE_SIGNATURE_INDEXES, SHELL_INDICATORS, XSS_SIGNATURES
+
+
+def make_page(chars: int, seed: int) -> str:
+    """HTML-ish filler with no signature in it"""
+    rng = random.Random(seed)
+    words = ["<div>", "</div>", "<p>", "</p>", "dvwa", "input", "submit", "form", "table", "help"]
+    page = []
+    while sum(map(len, page)) < chars:
+        page.append(rng.choice(words))
+    return " ".join(page)[:chars]
+
+
+def cases(chars: int, seed: int):
+    """(name, index, body, case_insensitive, method)"""
+    page = make_page(chars, seed)
+    passwd = "root:x:0:0:root:/root:/bin/bash\nwww-data:x:33:33:www-data:/var/www:/usr/sbin/nologin\n"
+    return [
+        ("shell indicators, no match", SHELL_INDICATORS, page, False, "matches"),
+        ("shell indicators, match at end", SHELL_INDICATORS, page + "uid=33", False, "matches"),
+        ("/etc/passwd signatures", FILE_SIGNATURE_INDEXES["/etc/passwd"],
+         (passwd * (chars // len(passwd) + 1))[:chars], False, "found_in_order"),
+        ("xss tokens, case-insensitive", XSS_SIGNATURES,
+         page + "<IMG SRC=x OnError=alert(document.cookie)>", True, "found_in_order"),
+    ]
+
+
+def time_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Signature matching micro-benchmark")
+    parser.add_argument("--body-chars", type=int, default=3000, help="Response body size")
+    parser.add_argument("--number", type=int, default=2000, help="Calls per timing")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the filler page")
+    args = parser.parse_args()
+
+    print(f"{'case':34} {'index':>10} {'inline in':>10} {'regex':>10}")
+    for name, index, body, case_insensitive, method in cases(args.body_chars, args.seed):
+        signatures = index.signatures
+        flags = re.IGNORECASE if case_insensitive else 0
+        alternation = re.compile("|".join(map(re.escape, signatures)), flags)
+
+        if method == "matches":
+            inline = lambda: any(s in body for s in signatures)
+            regex = lambda: alternation.search(body) is not None
+        else:
+            folded = [(s, s.lower() if case_insensitive else s) for s in signatures]
+
+            def inline():
+                text = body.lower() if case_insensitive else body
+                return [s for s, f in folded if f in text]
+
+            regex = lambda: {m.group().lower() for m in alternation.finditer(body)}
+
+        timings = [
+            time_us(lambda: getattr(index, method)(body), args.number),
+            time_us(inline, args.number),
+            time_us(regex, args.number),
+        ]
+        print(f"{name:34} " + " ".join(f"{t:8.2f}us" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Offline Rollout Throughput Benchmark
+
+Runs the rollout -> judge loop against the mock DVWA target and the
+scripted policy (src/dvwa_mock), both served in-process on free local
+ports. No GPU, no live DVWA and no Anthropic key are needed, so changes to
+connection pooling, tool concurrency or judging can be measured in
+trajectories per minute on a laptop.
+
+Usage:
+    python scripts/benchmark_rollouts.py --rollouts 200 --concurrency 32
+    python scripts/benchmark_rollouts.py --target-latency-ms 20 --failure-rate 0.02
+    python scripts/benchmark_rollouts.py --judge local
+    python scripts/benchmark_rollouts.py --judge http://127.0.0.1:8088   # real judge server
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import uvicorn
+
+from src.dvwa_mock.app import create_app as create_target_app
+from src.dvwa_mock.policy import MODEL_NAME, create_app as create_policy_app
+from src.training.art_trainer import JudgeClient
+from src.training.cai_integration import FullCAIRollout
+from src.training.challenges import get_challenges
+from src.training.evidence import build_evidence_digest
+from src.training.http_pool import close_all_clients, configure_inference_pool, configure_target_pool
+from src.training.local_verifier import LocalVerifier
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def serve(app, port: int) -> Tuple[uvicorn.Server, asyncio.Task]:
+    """Start an ASGI app on 127.0.0.1:port in the current event loop"""
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=port, log_level="warning", access_log=False,
+        backlog=4096, timeout_keep_alive=30,
+    ))
+    task = asyncio.ensure_future(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()  # Raise the startup error (e.g. port taken)
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def shutdown(servers: List[Tuple[uvicorn.Server, asyncio.Task]]):
+    """Stop the servers and wait for their lifespan shutdown to finish"""
+    for server, _ in servers:
+        server.should_exit = True
+    await asyncio.gather(*(task for _, task in servers))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def judge_rollout(
+    judge: Optional[str],
+    verifier: Optional[LocalVerifier],
+    client: Optional[JudgeClient],
+    challenge: Dict[str, Any],
+    result,
+) -> Optional[float]:
+    if judge == "none":
+        return None
+    if verifier is not None:
+        verdict = await verifier.verify(challenge, result.final_output, result.messages)
+        return verdict["score"] if verdict else None
+    evaluation = await client.evaluate(
+        challenge["task_description"],
+        result.final_output,
+        evidence=build_evidence_digest(result.messages),
+        tool_calls_count=result.total_tool_calls,
+    )
+    return evaluation["score"]
+
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    target_port, policy_port = free_port(), free_port()
+    target_app = create_target_app(
+        latency_ms=args.target_latency_ms,
+        jitter_ms=args.target_jitter_ms,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    servers = [
+        await serve(target_app, target_port),
+        await serve(create_policy_app(latency_ms=args.policy_latency_ms), policy_port),
+    ]
+    dvwa_url = f"http://127.0.0.1:{target_port}"
+    policy_url = f"http://127.0.0.1:{policy_port}/v1"
+
+    configure_target_pool(max_connections_per_host=args.concurrency * 2)
+    configure_inference_pool(max_connections=args.concurrency * 2)
+
+    verifier = LocalVerifier() if args.judge == "local" else None
+    client = JudgeClient(args.judge) if args.judge not in ("none", "local") else None
+
+    challenges = get_challenges(categories=args.categories)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    durations: List[float] = []
+    tool_calls: List[int] = []
+    scores: List[float] = []
+    errors = 0
+
+    async def one(index: int):
+        nonlocal errors
+        challenge = challenges[index % len(challenges)]
+        async with semaphore:
+            started = time.monotonic()
+            rollout = FullCAIRollout(
+                model_base_url=policy_url,
+                model_name=MODEL_NAME,
+                dvwa_url=dvwa_url,
+                max_tool_calls=args.max_tool_calls,
+            )
+            result = await rollout.execute(challenge)
+            score = await judge_rollout(args.judge, verifier, client, challenge, result)
+            durations.append(time.monotonic() - started)
+        if result.error:
+            errors += 1
+        tool_calls.append(result.total_tool_calls)
+        if score is not None:
+            scores.append(score)
+
+    try:
+        started = time.monotonic()
+        await asyncio.gather(*(one(i) for i in range(args.rollouts)))
+        elapsed = time.monotonic() - started
+    finally:
+        if client is not None:
+            await client.close()
+        await close_all_clients()
+        await shutdown(servers)
+
+    return {
+        "rollouts": args.rollouts,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": elapsed,
+        "trajectories_per_minute": args.rollouts / elapsed * 60,
+        "latency_p50": percentile(durations, 50),
+        "latency_p95": percentile(durations, 95),
+        "latency_max": max(durations, default=0.0),
+        "avg_tool_calls": statistics.mean(tool_calls) if tool_calls else 0.0,
+        "errors": errors,
+        "target_requests": target_app.state.requests,
+        "target_failures": target_app.state.failures,
+        "mean_score": statistics.mean(scores) if scores else None,
+        "judged": len(scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline rollout throughput benchmark")
+    parser.add_argument("--rollouts", type=int, default=100, help="Number of rollouts")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent rollouts")
+    parser.add_argument("--max-tool-calls", type=int, default=20, help="Turn limit per rollout")
+    parser.add_argument("--categories", nargs="*", help="Challenge categories (default: all)")
+    parser.add_argument("--target-latency-ms", type=float, default=0.0, help="Mock DVWA latency")
+    parser.add_argument("--target-jitter-ms", type=float, default=0.0, help="Mock DVWA latency jitter")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Mock DVWA 503 rate")
+    parser.add_argument("--policy-latency-ms", type=float, default=0.0, help="Scripted policy latency")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency/failure injection")
+    parser.add_argument(
+        "--judge", default="local",
+        help="'none', 'local' (LocalVerifier) or a judge server URL",
+    )
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_benchmark(args))
+
+    print("\n" + "=" * 50)
+    print("ROLLOUT BENCHMARK")
+    print("=" * 50)
+    print(f"Rollouts:          {stats['rollouts']} (concurrency {stats['concurrency']})")
+    print(f"Elapsed:           {stats['elapsed_seconds']:.2f}s")
+    print(f"Throughput:        {stats['trajectories_per_minute']:.1f} trajectories/min")
+    print(f"Latency p50/p95:   {stats['latency_p50']:.3f}s / {stats['latency_p95']:.3f}s "
+          f"(max {stats['latency_max']:.3f}s)")
+    print(f"Avg tool calls:    {stats['avg_tool_calls']:.1f}")
+    print(f"Rollout errors:    {stats['errors']}")
+    print(f"Target requests:   {stats['target_requests']} ({stats['target_failures']} injected failures)")
+    if stats["mean_score"] is not None:
+        print(f"Mean score:        {stats['mean_score']:.3f} over {stats['judged']} judged")
+
+
+if __name__ == "__main__":
+    main()
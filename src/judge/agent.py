@@ -8,13 +8,49 @@ to verify the state of the system.
 
 import asyncio
 import json
-from typing import Any, Dict, List, Optional
-from anthropic import Anthropic
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from typing import Any, Dict, List, Optional, Tuple
+from anthropic import AsyncAnthropic
+from mcp import StdioServerParameters
 
+from ..mcp_server.tools import AVAILABLE_TOOLS, close_http_client, execute_tool, format_tool_error
 from .config import JudgeConfig
-from .prompts import SYSTEM_PROMPT, create_evaluation_prompt
+from .mcp_pool import MCPSessionPool
+from .prompts import SUBMIT_VERDICT_TOOL, SYSTEM_PROMPT, create_evaluation_prompt
+
+
+# Token counters reported by the Messages API, summed over an evaluation's turns
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _add_usage(totals: Dict[str, int], usage: Any):
+    """Accumulate a response.usage object into totals"""
+    for field in USAGE_FIELDS:
+        totals[field] = totals.get(field, 0) + (getattr(usage, field, None) or 0)
+
+
+def _with_cache_breakpoint(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Copy of messages with a cache breakpoint on the last content block.
+
+    Only the request copy is marked, so earlier turns never carry stale
+    breakpoints (the API allows at most four per request). Each turn reads
+    the prefix cached by the previous turn and writes the extended one.
+    """
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = list(content)
+    blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+    return messages[:-1] + [{**last, "content": blocks}]
 
 
 class TaskEvaluation:
@@ -24,25 +60,65 @@ class TaskEvaluation:
         self,
         score: float,
         summary: str,
-        verification_steps: List[Dict[str, Any]] = None
+        verification_steps: List[Dict[str, Any]] = None,
+        usage: Optional[Dict[str, int]] = None,
+        hallucination_detected: bool = False,
+        verification_summary: str = "",
+        complete: bool = True
     ):
         self.score = score
         self.summary = summary
         self.verification_steps = verification_steps or []
+        # Summed token usage of the judge's Claude requests (USAGE_FIELDS)
+        self.usage = usage or {}
+        self.hallucination_detected = hallucination_detected
+        self.verification_summary = verification_summary
+        # False when the judge reached no usable verdict (tool budget spent,
+        # output cut off, malformed score); such results must not be cached
+        self.complete = complete
+
+    @classmethod
+    def from_verdict(
+        cls,
+        verdict: Dict[str, Any],
+        verification_steps: List[Dict[str, Any]],
+        usage: Dict[str, int]
+    ) -> "TaskEvaluation":
+        """Build an evaluation from submit_verdict tool input"""
+        try:
+            score = float(verdict["score"])
+            complete = True
+        except (KeyError, TypeError, ValueError):
+            score = 0.0
+            complete = False
+        hallucination = verdict.get("hallucination_detected", False)
+        if isinstance(hallucination, str):
+            hallucination = hallucination.strip().lower() == "true"
+        return cls(
+            score=max(-1.0, min(1.0, score)),
+            summary=str(verdict.get("summary", "")),
+            verification_steps=verification_steps,
+            usage=usage,
+            hallucination_detected=bool(hallucination),
+            verification_summary=str(verdict.get("verification_summary", "")),
+            complete=complete
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert evaluation to dictionary (API response format)"""
         return {
             "score": self.score,
-            "summary": self.summary
+            "summary": self.summary,
+            "hallucination_detected": self.hallucination_detected,
+            "verification_summary": self.verification_summary
         }
     
     def to_dict_detailed(self) -> Dict[str, Any]:
         """Convert evaluation to dictionary with verification steps"""
         return {
-            "score": self.score,
-            "summary": self.summary,
-            "verification_steps": self.verification_steps
+            **self.to_dict(),
+            "verification_steps": self.verification_steps,
+            "usage": self.usage
         }
     
     def __str__(self) -> str:
@@ -64,10 +140,28 @@ class LLMJudgeAgent:
         self.config = config or JudgeConfig()
         self.config.validate_config()
         
-        self.client = Anthropic(api_key=self.config.anthropic_api_key)
-        self.mcp_session: Optional[ClientSession] = None
-        self.stdio_context = None
+        self.client = AsyncAnthropic(api_key=self.config.anthropic_api_key)
+        # Bounds concurrent Claude requests across all in-flight evaluations
+        self._request_semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+        self.mcp_pool: Optional[MCPSessionPool] = None
+        self.in_process_tools = False
         self.available_tools: List[Dict[str, Any]] = []
+        # Token usage summed over every evaluation since startup
+        self.usage_totals: Dict[str, int] = {field: 0 for field in USAGE_FIELDS}
+
+        # The cached prefix is tools -> system -> messages, so one breakpoint
+        # on the static system prompt covers the tool schemas as well
+        if self.config.prompt_caching:
+            self.system = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": CACHE_CONTROL}]
+        else:
+            self.system = SYSTEM_PROMPT
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether verification tools are available"""
+        if self.in_process_tools:
+            return True
+        return self.mcp_pool is not None and self.mcp_pool.connected
     
     async def __aenter__(self):
         """Async context manager entry - connects to MCP server"""
@@ -79,24 +173,27 @@ class LLMJudgeAgent:
         await self.disconnect_mcp()
     
     async def connect_mcp(self):
-        """Connect to the MCP server and load available tools"""
+        """Start the pool of MCP server sessions and load available tools"""
+        if self.config.mcp_transport == "inprocess":
+            self._connect_in_process()
+            return
+
         server_params = StdioServerParameters(
             command=self.config.mcp_server_command.split()[0],
             args=self.config.mcp_server_command.split()[1:],
             env=None
         )
         
-        # Create stdio client connection (it's a context manager)
-        self.stdio_context = stdio_client(server_params)
-        self.stdio, self.write = await self.stdio_context.__aenter__()
-        
-        # Create MCP session
-        self.mcp_session = ClientSession(self.stdio, self.write)
-        await self.mcp_session.__aenter__()
+        # One subprocess per pooled session so tool calls run in parallel
+        self.mcp_pool = MCPSessionPool(
+            server_params,
+            size=self.config.mcp_pool_size,
+            health_check_interval=self.config.mcp_health_check_interval,
+        )
+        await self.mcp_pool.start()
         
-        # Initialize and get available tools
-        await self.mcp_session.initialize()
-        tools_response = await self.mcp_session.list_tools()
+        # Get available tools
+        tools_response = await self.mcp_pool.list_tools()
         
         # Convert MCP tools to Anthropic tool format
         self.available_tools = [
@@ -108,21 +205,95 @@ class LLMJudgeAgent:
             for tool in tools_response.tools
         ]
         
-        print(f"Connected to MCP server. Available tools: {[t['name'] for t in self.available_tools]}")
+        print(
+            f"Connected to {self.mcp_pool.size} MCP server session(s). "
+            f"Available tools: {[t['name'] for t in self.available_tools]}"
+        )
     
+    def _connect_in_process(self):
+        """
+        Use the verification tools directly instead of over stdio JSON-RPC.
+
+        Tool schemas are advertised exactly as the MCP server lists them;
+        only the transport differs.
+        """
+        self.in_process_tools = True
+        self.available_tools = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "input_schema": tool.inputSchema
+            }
+            for tool in AVAILABLE_TOOLS
+        ]
+        print(f"Using in-process verification tools: {[t['name'] for t in self.available_tools]}")
+
     async def disconnect_mcp(self):
-        """Disconnect from the MCP server"""
-        if self.mcp_session:
-            await self.mcp_session.__aexit__(None, None, None)
-            self.mcp_session = None
-        if self.stdio_context:
-            await self.stdio_context.__aexit__(None, None, None)
-            self.stdio_context = None
+        """Shut down all MCP server sessions (or the in-process tools' HTTP client)"""
+        if self.in_process_tools:
+            # The tools' pooled client lives in this process; with stdio it
+            # dies with the server subprocess
+            self.in_process_tools = False
+            await close_http_client()
+        if self.mcp_pool:
+            await self.mcp_pool.close()
+            self.mcp_pool = None
+
+    def usage_stats(self) -> Dict[str, Any]:
+        """Cumulative token usage and prompt cache hit ratio"""
+        cached = self.usage_totals["cache_read_input_tokens"]
+        prompt = (
+            self.usage_totals["input_tokens"]
+            + self.usage_totals["cache_creation_input_tokens"]
+            + cached
+        )
+        return {
+            **self.usage_totals,
+            "prompt_caching": self.config.prompt_caching,
+            "cache_read_ratio": cached / prompt if prompt else 0.0,
+        }
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> str:
+        """Run a verification tool and return its text output"""
+        if self.in_process_tools:
+            return await execute_tool(name, arguments)
+
+        # Call the MCP tool on a pooled session
+        async with self.mcp_pool.session() as session:
+            result = await session.call_tool(name, arguments)
+
+        # Extract text content from result
+        result_text = ""
+        for content in result.content:
+            if hasattr(content, 'text'):
+                result_text += content.text
+        return result_text
     
+    async def _run_tool_call(self, name: str, arguments: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Run a verification tool under the per-call timeout; returns (output, is_error).
+
+        Failures (a timeout, a tool exception, an McpError or a broken stdio
+        session) become an error result for that call only, so one failing
+        tool neither aborts the evaluation nor its sibling calls.
+        """
+        timeout = self.config.tool_call_timeout
+        try:
+            return await asyncio.wait_for(self._call_tool(name, arguments), timeout=timeout), False
+        except asyncio.TimeoutError:
+            return format_tool_error(
+                asyncio.TimeoutError(f"{name} did not finish within {timeout:g}s")
+            ), True
+        except Exception as e:
+            return format_tool_error(e), True
+
     async def evaluate_task(
         self,
         task_description: str,
-        agent_response: str
+        agent_response: str,
+        trajectory: Optional[List[Dict[str, Any]]] = None,
+        tool_calls_count: Optional[int] = None,
+        evidence: Optional[List[Dict[str, Any]]] = None
     ) -> TaskEvaluation:
         """
         Evaluate whether a task was completed successfully based on agent's response.
@@ -130,80 +301,99 @@ class LLMJudgeAgent:
         Args:
             task_description: Description of the task that was assigned
             agent_response: The response/output from the agent being evaluated
+            trajectory: Optional full message history of the rollout
+            tool_calls_count: Optional number of tool calls the agent made
+            evidence: Optional digest of the agent's tool observations, which
+                the judge cross-checks before probing the live target
             
         Returns:
-            TaskEvaluation with score (0.0-1.0) and summary
+            TaskEvaluation with score (-1.0 to 1.0), summary and
+            hallucination flag, taken from the judge's submit_verdict call
         """
-        if not self.mcp_session:
+        if not self.is_connected:
             raise RuntimeError("MCP session not connected. Use 'async with' context manager.")
         
         # Create the evaluation prompt
         user_prompt = create_evaluation_prompt(
             task_description=task_description,
-            agent_response=agent_response
+            agent_response=agent_response,
+            trajectory=trajectory,
+            tool_calls_count=tool_calls_count,
+            evidence=evidence
         )
         
         # Run the agentic loop with tool use
         messages = [{"role": "user", "content": user_prompt}]
         verification_steps = []
         tool_call_count = 0
+        usage: Dict[str, int] = {}
+        # Verification tools plus the terminal submit_verdict tool
+        tools = self.available_tools + [SUBMIT_VERDICT_TOOL]
         
-        while tool_call_count < self.config.max_tool_calls:
-            response = self.client.messages.create(
-                model=self.config.model,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                system=SYSTEM_PROMPT,
-                tools=self.available_tools,
-                messages=messages
+        while True:
+            # Every turn must call a tool; once the verification budget is
+            # spent, the only tool left to call is submit_verdict (changing
+            # tool_choice costs the message cache on that one final turn)
+            budget_left = tool_call_count < self.config.max_tool_calls
+            tool_choice = (
+                {"type": "any"} if budget_left
+                else {"type": "tool", "name": SUBMIT_VERDICT_TOOL["name"]}
             )
+            async with self._request_semaphore:
+                response = await self.client.messages.create(
+                    model=self.config.model,
+                    max_tokens=self.config.max_tokens,
+                    temperature=self.config.temperature,
+                    system=self.system,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    messages=(
+                        _with_cache_breakpoint(messages)
+                        if self.config.prompt_caching else messages
+                    )
+                )
+            _add_usage(usage, response.usage)
+            _add_usage(self.usage_totals, response.usage)
             
-            # Check if we're done (no more tool calls)
-            if response.stop_reason == "end_turn":
-                # Extract final evaluation from response
-                final_text = ""
-                for block in response.content:
-                    if block.type == "text":
-                        final_text += block.text
-                
-                return self._parse_final_evaluation(final_text, verification_steps)
+            # A verdict ends the evaluation, even alongside other tool calls
+            for block in response.content:
+                if block.type == "tool_use" and block.name == SUBMIT_VERDICT_TOOL["name"]:
+                    return TaskEvaluation.from_verdict(block.input, verification_steps, usage)
+
+            if not budget_left:
+                break
             
             # Process tool calls
             if response.stop_reason == "tool_use":
                 # Add assistant's response to messages
                 messages.append({"role": "assistant", "content": response.content})
                 
-                # Execute each tool call
+                # The checks of one turn are independent, so run them
+                # concurrently; results keep the order of the tool_use blocks
+                tool_uses = [block for block in response.content if block.type == "tool_use"]
+                tool_call_count += len(tool_uses)
+                outcomes = await asyncio.gather(*(
+                    self._run_tool_call(block.name, block.input) for block in tool_uses
+                ))
+
                 tool_results = []
-                for block in response.content:
-                    if block.type == "tool_use":
-                        tool_call_count += 1
-                        
-                        # Call the MCP tool
-                        result = await self.mcp_session.call_tool(
-                            block.name,
-                            block.input
-                        )
-                        
-                        # Extract text content from result
-                        result_text = ""
-                        for content in result.content:
-                            if hasattr(content, 'text'):
-                                result_text += content.text
-                        
-                        # Record verification step
-                        verification_steps.append({
-                            "tool": block.name,
-                            "input": block.input,
-                            "result": result_text
-                        })
-                        
-                        # Add tool result to messages
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": block.id,
-                            "content": result_text
-                        })
+                for block, (result_text, is_error) in zip(tool_uses, outcomes):
+                    # Record verification step
+                    verification_steps.append({
+                        "tool": block.name,
+                        "input": block.input,
+                        "result": result_text
+                    })
+                    
+                    # Add tool result to messages
+                    tool_result = {
+                        "type": "tool_result",
+                        "tool_use_id": block.id,
+                        "content": result_text
+                    }
+                    if is_error:
+                        tool_result["is_error"] = True
+                    tool_results.append(tool_result)
                 
                 # Add tool results to messages
                 messages.append({"role": "user", "content": tool_results})
@@ -211,44 +401,11 @@ class LLMJudgeAgent:
                 # Unexpected stop reason
                 raise RuntimeError(f"Unexpected stop reason: {response.stop_reason}")
         
-        # Max tool calls reached without conclusion
+        # Forced verdict was not returned (e.g. cut off by max_tokens)
         return TaskEvaluation(
             score=0.0,
             summary="Evaluation incomplete: maximum tool calls reached without conclusion",
-            verification_steps=verification_steps
-        )
-    
-    def _parse_final_evaluation(
-        self,
-        response_text: str,
-        verification_steps: List[Dict[str, Any]]
-    ) -> TaskEvaluation:
-        """
-        Parse the final evaluation from the LLM's response.
-        
-        Expected format in response:
-        SCORE: 0.0-1.0
-        SUMMARY: explanation
-        """
-        lines = response_text.strip().split('\n')
-        score = 0.0
-        summary = response_text
-        
-        # Try to parse structured output
-        for line in lines:
-            line = line.strip()
-            if line.startswith("SCORE:"):
-                try:
-                    score = float(line.split(":", 1)[1].strip())
-                    # Clamp score between 0 and 1
-                    score = max(0.0, min(1.0, score))
-                except ValueError:
-                    score = 0.0
-            elif line.startswith("SUMMARY:"):
-                summary = line.split(":", 1)[1].strip()
-        
-        return TaskEvaluation(
-            score=score,
-            summary=summary,
-            verification_steps=verification_steps
+            verification_steps=verification_steps,
+            usage=usage,
+            complete=False
         )
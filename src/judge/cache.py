@@ -0,0 +1,155 @@
+"""
+Evaluation cache for the LLM-judge
+
+GRPO groups often produce identical final answers (ten "I don't know"s, the
+same extracted users table), and each one would otherwise trigger a full
+multi-turn Claude evaluation. This cache is content-addressed on the task,
+the normalized agent response and the judge model/prompt version, with an
+in-memory LRU + TTL layer and an optional SQLite file behind it so results
+survive judge restarts.
+
+The rollout evidence digest is deliberately not part of the key. Rollouts
+that converge on the same answer reach it by different tool paths, and
+their page bodies differ (tokens, timestamps, echoed input), so keying on
+the digest would defeat the cache for exactly those groups. The verdict
+scores the answer's claims, which the judge checks against the target, so
+identical answers share it; the cost is that a later rollout with the same
+answer but weaker evidence inherits the earlier verdict.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def normalize_response(agent_response: str) -> str:
+    """Normalize an agent response so trivially different outputs share a key"""
+    return re.sub(r"\s+", " ", agent_response).strip().casefold()
+
+
+def make_cache_key(
+    task_description: str,
+    agent_response: str,
+    model: str,
+    prompt_version: str,
+) -> str:
+    """Hash the inputs that determine a judge verdict"""
+    payload = json.dumps(
+        [
+            task_description.strip(),
+            normalize_response(agent_response),
+            model,
+            prompt_version,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """
+    LRU + TTL cache of judge results with optional SQLite persistence.
+
+    Values are plain dicts (the serialized VerifyResponse). Memory is checked
+    first; on a miss the SQLite file is consulted and hits are promoted back
+    into memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: float = 86400.0,
+        db_path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "DELETE FROM evaluations WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None if missing/expired"""
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            created_at, value = entry
+            if now - created_at <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT value, created_at FROM evaluations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                value_json, created_at = row
+                if now - created_at <= self.ttl_seconds:
+                    value = json.loads(value_json)
+                    self._remember(key, created_at, value)
+                    self.hits += 1
+                    return value
+                self._db.execute("DELETE FROM evaluations WHERE key = ?", (key,))
+                self._db.commit()
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store a value under key"""
+        created_at = time.time()
+        self._remember(key, created_at, value)
+
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO evaluations (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), created_at),
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics for /health"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+            "persistent": self._db is not None,
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, created_at: float, value: Dict[str, Any]):
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -3,7 +3,7 @@ Configuration for the LLM-judge agent
 """
 
 import os
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -29,13 +29,58 @@ class JudgeConfig(BaseModel):
     )
     max_tokens: int = 4096
     temperature: float = 0.0  # Use 0 for deterministic judging
+    max_concurrent_requests: int = Field(
+        default_factory=lambda: int(os.getenv("JUDGE_MAX_CONCURRENT_REQUESTS", "32")),
+        description="Maximum in-flight Claude requests across concurrent evaluations"
+    )
+    prompt_caching: bool = Field(
+        default_factory=lambda: os.getenv("JUDGE_PROMPT_CACHING", "true").lower() == "true",
+        description="Mark the system prompt, tools and conversation prefix for Anthropic prompt caching"
+    )
     
     # MCP server settings
     mcp_server_command: str = Field(
         default="python -m src.mcp_server.server",
         description="Command to start the MCP server"
     )
+    mcp_pool_size: int = Field(
+        default_factory=lambda: int(os.getenv("JUDGE_MCP_POOL_SIZE", "4")),
+        description="Number of MCP server subprocesses/sessions"
+    )
+    mcp_health_check_interval: float = 30.0  # Seconds between idle-session pings (0 = off)
+    tool_call_timeout: float = Field(
+        default_factory=lambda: float(os.getenv("JUDGE_TOOL_CALL_TIMEOUT", "30")),
+        description="Seconds before a verification tool call is abandoned and reported as an error"
+    )
+    mcp_transport: Literal["stdio", "inprocess"] = Field(
+        default_factory=lambda: os.getenv("JUDGE_MCP_TRANSPORT", "stdio"),
+        description="'inprocess' calls the local verification tools directly, skipping stdio IPC"
+    )
     
+    # Server settings
+    batch_concurrency: int = Field(
+        default_factory=lambda: int(os.getenv("JUDGE_BATCH_CONCURRENCY", "16")),
+        description="Concurrent evaluations per /verify_batch request"
+    )
+
+    # Evaluation cache settings
+    cache_enabled: bool = Field(
+        default_factory=lambda: os.getenv("JUDGE_CACHE_ENABLED", "true").lower() == "true",
+        description="Reuse verdicts for identical (task, normalized response) pairs"
+    )
+    cache_max_entries: int = 4096
+    singleflight_enabled: bool = Field(
+        default_factory=lambda: os.getenv("JUDGE_SINGLEFLIGHT", "true").lower() == "true",
+        description="Share one evaluation between concurrent identical requests"
+    )
+    cache_ttl_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("JUDGE_CACHE_TTL_SECONDS", "86400"))
+    )
+    cache_db_path: str = Field(
+        default_factory=lambda: os.getenv("JUDGE_CACHE_PATH", ".judge_cache.sqlite3"),
+        description="SQLite file backing the cache (empty = memory only)"
+    )
+
     # Judge behavior settings
     max_tool_calls: int = 10  # Maximum tool calls per evaluation
     strict_mode: bool = True  # If True, requires explicit verification of all criteria
@@ -0,0 +1,196 @@
+"""
+MCP session pool for the LLM-judge
+
+A single stdio ClientSession serializes every verification tool call of every
+concurrent evaluation through one pipe. This pool keeps N MCP server
+subprocesses, each with its own ClientSession, and hands them out with
+checkout/return semantics. Idle sessions are pinged periodically and crashed
+subprocesses are respawned.
+
+Each session is owned by a dedicated task, because the stdio transport's
+task groups must be entered and exited from the same task.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+
+class PooledMCPSession:
+    """One MCP server subprocess and its ClientSession"""
+
+    def __init__(self, server_params: StdioServerParameters, index: int):
+        self.server_params = server_params
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        self.error: Optional[BaseException] = None
+        # Set when a call on this session failed at the transport level
+        self.broken = False
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> bool:
+        return (
+            self.session is not None
+            and not self.broken
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self):
+        """Spawn the subprocess and wait until the session is initialized"""
+        self._task = asyncio.create_task(self._run(), name=f"mcp-session-{self.index}")
+        await self._ready.wait()
+        if self.session is None:
+            raise RuntimeError(f"MCP session {self.index} failed to start: {self.error}")
+
+    async def stop(self, timeout: float = 5.0):
+        """Close the session and terminate its subprocess"""
+        self._closing.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Check that the subprocess still answers"""
+        if not self.healthy:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+            return True
+        except Exception:
+            self.broken = True
+            return False
+
+    async def _run(self):
+        try:
+            async with stdio_client(self.server_params) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+
+class MCPSessionPool:
+    """
+    Pool of MCP sessions with checkout/return semantics.
+
+    Usage:
+        pool = MCPSessionPool(server_params, size=4)
+        await pool.start()
+        async with pool.session() as session:
+            result = await session.call_tool(name, arguments)
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        server_params: StdioServerParameters,
+        size: int = 4,
+        health_check_interval: float = 30.0,
+    ):
+        self.server_params = server_params
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self._slots: List[PooledMCPSession] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._next_index = 0
+        self.respawns = 0
+
+    @property
+    def connected(self) -> bool:
+        return any(slot.healthy for slot in self._slots)
+
+    async def start(self):
+        """Spawn all subprocesses and start the health checker"""
+        self._idle = asyncio.Queue()
+        self._slots = await asyncio.gather(*(self._spawn() for _ in range(self.size)))
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+        if self.health_check_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop(), name="mcp-pool-health")
+
+    async def close(self):
+        """Stop the health checker and every subprocess"""
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        await asyncio.gather(*(slot.stop() for slot in self._slots), return_exceptions=True)
+        self._slots = []
+        self._idle = None
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        """Check out a healthy session for the duration of the block"""
+        slot = await self._idle.get()
+        try:
+            if not slot.healthy:
+                slot = await self._respawn(slot)
+            try:
+                yield slot.session
+            except (Exception, asyncio.CancelledError):
+                # Tool errors come back as content, so an exception here means
+                # the transport failed; a call cancelled mid-flight (timeout)
+                # leaves an unmatched response in the pipe. Either way,
+                # respawn before the next checkout
+                slot.broken = True
+                raise
+        finally:
+            self._idle.put_nowait(slot)
+
+    async def list_tools(self) -> Any:
+        async with self.session() as session:
+            return await session.list_tools()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "healthy": sum(1 for slot in self._slots if slot.healthy),
+            "idle": self._idle.qsize() if self._idle else 0,
+            "respawns": self.respawns,
+        }
+
+    async def _spawn(self) -> PooledMCPSession:
+        slot = PooledMCPSession(self.server_params, self._next_index)
+        self._next_index += 1
+        await slot.start()
+        return slot
+
+    async def _respawn(self, slot: PooledMCPSession) -> PooledMCPSession:
+        """Replace a dead session with a fresh subprocess"""
+        await slot.stop()
+        new_slot = await self._spawn()
+        self._slots[self._slots.index(slot)] = new_slot
+        self.respawns += 1
+        print(f"Respawned MCP session {slot.index} as {new_slot.index}")
+        return new_slot
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            # Only ping idle sessions; busy ones prove themselves by working
+            for _ in range(self._idle.qsize()):
+                slot = self._idle.get_nowait()
+                try:
+                    if not await slot.ping():
+                        slot = await self._respawn(slot)
+                except Exception as e:
+                    print(f"MCP health check failed to respawn session {slot.index}: {e}")
+                finally:
+                    self._idle.put_nowait(slot)
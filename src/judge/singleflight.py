@@ -0,0 +1,91 @@
+"""
+Single-flight coalescing for judge evaluations
+
+A GRPO group launches its rollouts together, so identical (task, response)
+pairs reach /verify at the same moment, before the first evaluation could
+populate the cache. SingleFlight runs one evaluation per key and fans its
+result (or exception) out to every concurrent caller with that key.
+
+The shared evaluation runs in its own task, shielded from any single
+caller: a waiter that disconnects does not cancel it for the others. It is
+cancelled only when every waiter has gone away.
+
+Exactly one caller receives the result as its own (shared=False): the first
+to observe it. That is normally the caller that started the flight, but if
+it was cancelled a follower takes over, so per-evaluation accounting such
+as token usage is reported once and never lost.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """One in-flight call and the number of callers waiting on it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        # Set once a caller has received the result as its own
+        self.claimed = False
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key onto one in-flight task.
+
+    Usage:
+        flights = SingleFlight()
+        result, shared = await flights.do(key, lambda: evaluate(item))
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+
+        # Metrics
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await fn() once per key across concurrent callers.
+
+        Returns (result, shared), where shared is True when another caller
+        already received this result as its own.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+            shared, flight.claimed = flight.claimed, True
+            return result, shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is left to receive the result
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Coalescing metrics for /health"""
+        requests = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / requests if requests else 0.0,
+        }
@@ -0,0 +1,54 @@
+"""
+Multi-signature matching for verification tools
+
+Several verification tools check a response body against a fixed list of
+literal signatures (file contents, shell output indicators, XSS handlers).
+A SignatureIndex folds the signatures once, at import time, and checks
+them with `in`. Each check is a single C-level substring scan, which for
+lists of a dozen short signatures beats both a pure-Python multi-pattern
+automaton (one interpreted step per character) and a compiled regex
+alternation (every alternative tried at every offset). See
+scripts/benchmark_matcher.py.
+"""
+
+from typing import Iterable, List, Tuple
+
+
+class SignatureIndex:
+    """
+    A fixed list of literal signatures, matched with substring scans.
+
+    Results are reported in the order the signatures were given, so callers
+    that used to loop over a list see identical output.
+
+    Usage:
+        index = SignatureIndex(["root:", "bin:", "www-data:"])
+        index.found_in_order(body)  # -> ["root:", "www-data:"]
+    """
+
+    def __init__(self, signatures: Iterable[str], case_insensitive: bool = False):
+        self.signatures: List[str] = list(signatures)
+        self.case_insensitive = case_insensitive
+
+        # (signature as declared, signature as searched for)
+        self._folded: Tuple[Tuple[str, str], ...] = tuple(
+            (signature, self._fold(signature)) for signature in self.signatures
+        )
+
+    def _fold(self, text: str) -> str:
+        return text.lower() if self.case_insensitive else text
+
+    def found_in_order(self, text: str) -> List[str]:
+        """Signatures occurring in text, in declaration order"""
+        text = self._fold(text)
+        return [signature for signature, folded in self._folded if folded in text]
+
+    def first_match(self, text: str) -> str:
+        """Earliest-declared signature occurring in text ("" if none)"""
+        text = self._fold(text)
+        return next((signature for signature, folded in self._folded if folded in text), "")
+
+    def matches(self, text: str) -> bool:
+        """Whether any signature occurs in text"""
+        text = self._fold(text)
+        return any(folded in text for _, folded in self._folded)
@@ -6,13 +6,12 @@ that the LLM-judge agent can use to verify task completion.
 """
 
 import asyncio
-import json
 from typing import Any, Dict, List, Optional
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
-from .tools import AVAILABLE_TOOLS, execute_tool
+from .tools import AVAILABLE_TOOLS, close_http_client, execute_tool, format_tool_error
 
 
 class VerificationMCPServer:
@@ -51,25 +50,24 @@ class VerificationMCPServer:
                 ]
             except Exception as e:
                 # Return error information
-                error_response = {
-                    "error": str(e),
-                    "error_type": type(e).__name__
-                }
                 return [
                     TextContent(
                         type="text",
-                        text=json.dumps(error_response, indent=2)
+                        text=format_tool_error(e)
                     )
                 ]
     
     async def run(self):
         """Run the MCP server using stdio transport"""
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options()
+                )
+        finally:
+            await close_http_client()
 
 
 async def main():
@@ -12,15 +12,38 @@ Each tool follows a standard pattern that you can replicate:
 
 import os
 import re
+import time
 import httpx
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 import json
+from functools import lru_cache
+
+from .matcher import SignatureIndex
 
 
 # DVWA target URL (can be overridden via environment)
 DVWA_URL = os.environ.get("DVWA_URL", "http://31.97.117.123")
 
+# Seconds to reuse GET verification responses (0, the default, disables the
+# cache). Opt-in only: the cache lives in this process, so with the stdio
+# transport every pooled MCP subprocess keeps its own copy, and rollouts
+# write to the target without invalidating it. Enable it with the
+# in-process transport against a target that rollouts don't write to.
+VERIFY_CACHE_TTL = float(os.environ.get("VERIFY_CACHE_TTL", "0"))
+VERIFY_CACHE_MAX_ENTRIES = 256
+
+# Pages whose content rollouts change (stored XSS guestbook, CSRF password
+# change, brute-force lockout, login/setup state) are never memoized
+STATEFUL_PATH_PATTERN = re.compile(r"xss_s|csrf|brute|login|logout|setup|security\.php", re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compile a caller-supplied regex once (case-insensitive), bounded LRU"""
+    return re.compile(pattern, re.IGNORECASE)
+
 
 class ToolDefinition(BaseModel):
     """Standard tool definition for MCP"""
@@ -90,6 +113,80 @@ VERIFY_HTTP_RESPONSE_TOOL = ToolDefinition(
 )
 
 
+# Shared pooled client for verification requests
+_http_client: Optional[httpx.AsyncClient] = None
+
+# (path, sorted params) -> (fetched_at, status_code, body) for idempotent GETs
+_get_cache: "OrderedDict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[float, int, str]]" = OrderedDict()
+
+# Bumped by every state-changing request; a GET that was in flight across a
+# bump may hold the pre-change page and is not cached
+_get_cache_generation = 0
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive client used by verification tools"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared verification client"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def _fetch(
+    method: str,
+    path: str,
+    params: Optional[Dict[str, str]] = None
+) -> Tuple[int, str]:
+    """Issue a verification request, serving repeated GETs from the opt-in short-TTL cache"""
+    client = get_http_client()
+    url = f"{DVWA_URL}{path}"
+
+    if method.upper() != "GET":
+        # A POST can change any page (stored XSS, password change), so
+        # nothing cached before or during it may be served afterwards
+        _invalidate_get_cache()
+        try:
+            response = await client.post(url, data=params)
+        finally:
+            _invalidate_get_cache()
+        return response.status_code, response.text
+
+    if VERIFY_CACHE_TTL <= 0 or STATEFUL_PATH_PATTERN.search(path):
+        response = await client.get(url, params=params)
+        return response.status_code, response.text
+
+    key = (path, tuple(sorted((params or {}).items())))
+    generation = _get_cache_generation
+    cached = _get_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] <= VERIFY_CACHE_TTL:
+        return cached[1], cached[2]
+
+    response = await client.get(url, params=params)
+    if generation == _get_cache_generation:
+        _get_cache[key] = (time.monotonic(), response.status_code, response.text)
+        _get_cache.move_to_end(key)
+        while len(_get_cache) > VERIFY_CACHE_MAX_ENTRIES:
+            _get_cache.popitem(last=False)
+    return response.status_code, response.text
+
+
+def _invalidate_get_cache():
+    global _get_cache_generation
+    _get_cache.clear()
+    _get_cache_generation += 1
+
+
 async def verify_http_response(
     method: str,
     path: str,
@@ -98,34 +195,26 @@ async def verify_http_response(
 ) -> str:
     """Make HTTP request and optionally verify response contains expected pattern"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{DVWA_URL}{path}"
-
-            if method.upper() == "GET":
-                response = await client.get(url, params=params)
-            else:
-                response = await client.post(url, data=params)
-
-            body = response.text
-            pattern_found = False
-
-            if expected_pattern:
-                pattern_found = bool(re.search(expected_pattern, body, re.IGNORECASE))
-
-            result = VerificationResult(
-                success=response.status_code == 200 and (not expected_pattern or pattern_found),
-                message=f"HTTP {response.status_code}" + (
-                    f" - Pattern {'found' if pattern_found else 'NOT found'}"
-                    if expected_pattern else ""
-                ),
-                details={
-                    "status_code": response.status_code,
-                    "body_preview": body[:500],
-                    "body_length": len(body),
-                    "pattern_matched": pattern_found if expected_pattern else None,
-                }
-            )
-            return json.dumps(result.model_dump())
+        status_code, body = await _fetch(method, path, params)
+        pattern_found = False
+
+        if expected_pattern:
+            pattern_found = bool(compile_pattern(expected_pattern).search(body))
+
+        result = VerificationResult(
+            success=status_code == 200 and (not expected_pattern or pattern_found),
+            message=f"HTTP {status_code}" + (
+                f" - Pattern {'found' if pattern_found else 'NOT found'}"
+                if expected_pattern else ""
+            ),
+            details={
+                "status_code": status_code,
+                "body_preview": body[:500],
+                "body_length": len(body),
+                "pattern_matched": pattern_found if expected_pattern else None,
+            }
+        )
+        return json.dumps(result.model_dump())
     except Exception as e:
         return json.dumps(VerificationResult(
             success=False,
@@ -224,16 +313,28 @@ VERIFY_XSS_PAYLOAD_TOOL = ToolDefinition(
 )
 
 
+XSS_EVENT_HANDLERS = ["onerror", "onload", "onclick", "onmouseover", "onfocus", "onmouseenter"]
+XSS_EXECUTABLE_JS = ["alert", "document", "eval", "fetch"]
+
+# Every XSS token, matched case-insensitively in one pass over the payload
+XSS_SIGNATURES = SignatureIndex(
+    ["<script", "javascript:", "cookie", *XSS_EVENT_HANDLERS, *XSS_EXECUTABLE_JS],
+    case_insensitive=True,
+)
+
+
 async def verify_xss_payload(
     payload: str,
     payload_type: str = "reflected",
     should_steal_cookies: bool = False
 ) -> str:
     """Verify XSS payload is well-formed"""
+    found = set(XSS_SIGNATURES.found_in_order(payload))
+
     # Check for script execution vectors (need at least ONE)
-    has_script_tag = "<script" in payload.lower()
-    has_javascript_uri = "javascript:" in payload.lower()
-    has_event_handler = any(h in payload.lower() for h in ["onerror", "onload", "onclick", "onmouseover", "onfocus", "onmouseenter"])
+    has_script_tag = "<script" in found
+    has_javascript_uri = "javascript:" in found
+    has_event_handler = any(h in found for h in XSS_EVENT_HANDLERS)
 
     # Valid XSS needs at least one execution vector
     has_execution_vector = has_script_tag or has_javascript_uri or has_event_handler
@@ -241,11 +342,11 @@ async def verify_xss_payload(
     checks = {
         "has_execution_vector": has_execution_vector,
         "properly_closed": payload.count("<") == payload.count(">") or ">" in payload,
-        "has_executable_js": "alert" in payload.lower() or "document" in payload.lower() or "eval" in payload.lower() or "fetch" in payload.lower(),
+        "has_executable_js": any(js in found for js in XSS_EXECUTABLE_JS),
     }
 
     if should_steal_cookies:
-        checks["can_steal_cookies"] = "document.cookie" in payload or "cookie" in payload.lower()
+        checks["can_steal_cookies"] = "cookie" in found
     else:
         checks["can_steal_cookies"] = True  # Not required, so pass
 
@@ -287,19 +388,20 @@ VERIFY_COMMAND_INJECTION_TOOL = ToolDefinition(
 )
 
 
+# Common shell output indicators
+SHELL_INDICATORS = SignatureIndex([
+    "root:", "www-data", "/bin/bash", "/home/", "uid=", "gid=",
+    "Linux", "passwd", "shadow", "etc", "var", "usr"
+])
+
+
 async def verify_command_injection(
     command_output: str,
     expected_content: Optional[str] = None,
     injected_command: Optional[str] = None
 ) -> str:
     """Verify command injection output"""
-    # Check for common shell output indicators
-    shell_indicators = [
-        "root:", "www-data", "/bin/bash", "/home/", "uid=", "gid=",
-        "Linux", "passwd", "shadow", "etc", "var", "usr"
-    ]
-
-    has_shell_output = any(ind in command_output for ind in shell_indicators)
+    has_shell_output = SHELL_INDICATORS.matches(command_output)
     has_expected = expected_content.lower() in command_output.lower() if expected_content else True
 
     success = has_shell_output and has_expected
@@ -338,32 +440,30 @@ VERIFY_FILE_INCLUSION_TOOL = ToolDefinition(
 )
 
 
+# Expected content for common target files (first matching name wins)
+FILE_SIGNATURES = {
+    "/etc/passwd": ["root:", "bin:", "daemon:", "www-data:"],
+    "/etc/shadow": ["root:", "$6$", "$y$"],  # Hashed passwords
+    "config.php": ["<?php", "db_", "password", "define("],
+    ".htaccess": ["RewriteEngine", "Deny from", "Allow from"],
+    "wp-config.php": ["DB_NAME", "DB_USER", "DB_PASSWORD"],
+}
+FILE_TARGET_INDEX = SignatureIndex(FILE_SIGNATURES)
+FILE_SIGNATURE_INDEXES = {name: SignatureIndex(sigs) for name, sigs in FILE_SIGNATURES.items()}
+# Generic check - file content should have some text (at least newlines)
+GENERIC_FILE_SIGNATURES = SignatureIndex(["\n"])
+
+
 async def verify_file_inclusion(
     response_content: str,
     target_file: str
 ) -> str:
     """Verify file inclusion attack results"""
-    # Define expected content for common target files
-    file_signatures = {
-        "/etc/passwd": ["root:", "bin:", "daemon:", "www-data:"],
-        "/etc/shadow": ["root:", "$6$", "$y$"],  # Hashed passwords
-        "config.php": ["<?php", "db_", "password", "define("],
-        ".htaccess": ["RewriteEngine", "Deny from", "Allow from"],
-        "wp-config.php": ["DB_NAME", "DB_USER", "DB_PASSWORD"],
-    }
-
     # Check for file-specific signatures
-    signatures = []
-    for file_pattern, sigs in file_signatures.items():
-        if file_pattern in target_file.lower():
-            signatures = sigs
-            break
-
-    if not signatures:
-        # Generic check - file content should have some text
-        signatures = ["\n"]  # At least newlines
+    file_pattern = FILE_TARGET_INDEX.first_match(target_file.lower())
+    signatures = FILE_SIGNATURE_INDEXES.get(file_pattern, GENERIC_FILE_SIGNATURES)
 
-    found_signatures = [s for s in signatures if s in response_content]
+    found_signatures = signatures.found_in_order(response_content)
     success = len(found_signatures) > 0
 
     result = VerificationResult(
@@ -420,7 +520,7 @@ async def check_evidence(
     }
 
     if expected_pattern:
-        checks["matches_pattern"] = bool(re.search(expected_pattern, claimed_evidence, re.IGNORECASE))
+        checks["matches_pattern"] = bool(compile_pattern(expected_pattern).search(claimed_evidence))
 
     # Type-specific checks
     if evidence_type == "data_extraction":
@@ -501,3 +601,11 @@ async def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
         return result
     else:
         return json.dumps(result)
+
+
+def format_tool_error(error: Exception) -> str:
+    """Serialize a tool failure the way the MCP server reports it"""
+    return json.dumps({
+        "error": str(error),
+        "error_type": type(error).__name__
+    }, indent=2)
@@ -9,6 +9,13 @@ Components:
 - challenges: Security challenge dataset
 - cai_integration: CAI tools integration for rollouts
 - cai_rollout: Basic rollout execution
+- judge_pipeline: Bounded rollout -> judge worker queue
+- local_verifier: Deterministic pre-judge for unambiguous rollouts
+- evidence: Deduplicated digest of rollout tool observations for the judge
+- http_pool: Shared connection pools for target and inference traffic
+- context: Token-budgeted conversation history for long rollouts
+- vllm_metrics: Prefix cache / TTFT metrics scraped from vLLM
+- command_executor: Async subprocess / thread pool for command tools
 - art_trainer: Full ART-based GRPO training
 - wandb_logger: Comprehensive W&B logging
 - hf_checkpoints: HuggingFace checkpoint management
@@ -44,6 +51,21 @@ from .cai_integration import (
     CAIToolResult,
 )
 
+from .judge_pipeline import JudgePipeline
+from .local_verifier import LocalVerifier
+from .evidence import build_evidence_digest
+from .context import RolloutContext
+from .vllm_metrics import VLLMMetricsMonitor
+from .command_executor import AsyncCommandExecutor, get_command_executor
+
+from .http_pool import (
+    TargetSession,
+    get_target_client,
+    get_inference_client,
+    close_target_clients,
+    close_all_clients,
+)
+
 from .wandb_logger import (
     WandBLogger,
     RolloutMetrics,
@@ -78,6 +100,19 @@ __all__ = [
     "FullCAIRollout",
     "SecurityRolloutResult",
     "CAIToolResult",
+    # Rollout infrastructure
+    "JudgePipeline",
+    "LocalVerifier",
+    "build_evidence_digest",
+    "RolloutContext",
+    "VLLMMetricsMonitor",
+    "AsyncCommandExecutor",
+    "get_command_executor",
+    "TargetSession",
+    "get_target_client",
+    "get_inference_client",
+    "close_target_clients",
+    "close_all_clients",
     # Logging
     "WandBLogger",
     "RolloutMetrics",
@@ -60,23 +60,69 @@ try:
 except ImportError:
     HAS_HF = False
 
+# HTTP/2 support for the judge client (pip install h2)
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 from .config import TrainingConfig, H100_CONFIG, DEV_CONFIG, TINY_TEST_CONFIG
 from .cai_integration import CAISecurityTools, FullCAIRollout, SecurityRolloutResult
 from .challenges import get_challenges, get_training_curriculum, ALL_CHALLENGES
+from .judge_pipeline import JudgePipeline
+from .local_verifier import LocalVerifier
+from .evidence import build_evidence_digest
+from .context import get_token_counter
+from .vllm_metrics import VLLMMetricsMonitor
+from .command_executor import configure_command_executor, close_command_executor
+from .http_pool import configure_inference_pool, configure_target_pool, close_all_clients
 
 
 class JudgeClient:
-    """Client for the Claude MCP Judge server"""
+    """
+    Client for the Claude MCP Judge server.
+
+    A single instance is meant to be shared by every rollout of a run: it
+    keeps a pool of keep-alive connections (HTTP/2 when h2 is installed) and
+    retries transient failures (429, 502-504 and transport errors) with
+    exponential backoff.
+    """
+
+    # The server answers 500 for any failed evaluation, including permanent
+    # ones, and the Anthropic client already retries transient API errors;
+    # retrying a 500 would rerun a whole multi-turn evaluation
+    RETRY_STATUS_CODES = {429, 502, 503, 504}
 
-    def __init__(self, base_url: str = "http://localhost:8088"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8088",
+        timeout: float = 120.0,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+    ):
         self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=60.0,
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
         self._client: Optional[httpx.AsyncClient] = None
 
     async def get_client(self) -> httpx.AsyncClient:
         if self._client is None:
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
-                timeout=120.0,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=HAS_HTTP2,
             )
         return self._client
 
@@ -85,6 +131,57 @@ class JudgeClient:
             await self._client.aclose()
             self._client = None
 
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Backoff delay before the next attempt, honouring Retry-After"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(self.backoff_max, float(retry_after))
+                except ValueError:
+                    pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        retry_read_timeouts: bool = True,
+    ) -> httpx.Response:
+        """
+        POST with retry/backoff on 429, 502-504 and transport errors.
+
+        Args:
+            timeout: Overrides the client timeout for this request
+            retry_read_timeouts: Whether to resend after the server accepted
+                the request but did not answer in time. Disable it when the
+                server may still be doing expensive work for the request.
+        """
+        client = await self.get_client()
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = await client.post(
+                    path, json=payload, timeout=timeout or self.timeout
+                )
+            except httpx.TransportError as e:
+                if attempt == self.max_retries or (
+                    not retry_read_timeouts and isinstance(e, httpx.ReadTimeout)
+                ):
+                    raise
+            else:
+                if (
+                    response.status_code not in self.RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    response.raise_for_status()
+                    return response
+
+            await asyncio.sleep(self._retry_delay(attempt, response))
+
     async def health_check(self) -> bool:
         try:
             client = await self.get_client()
@@ -98,19 +195,25 @@ class JudgeClient:
         self,
         task_description: str,
         agent_response: str,
+        evidence: Optional[List[Dict[str, Any]]] = None,
+        tool_calls_count: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Evaluate a trajectory with the Claude MCP judge"""
-        client = await self.get_client()
+        """
+        Evaluate a trajectory with the Claude MCP judge.
 
+        evidence (see build_evidence_digest) lets the judge check claims
+        against what the rollout observed instead of re-probing the target.
+        """
         try:
-            response = await client.post(
+            response = await self._post(
                 "/verify",
-                json={
+                {
                     "task_description": task_description,
                     "agent_response": agent_response,
+                    "evidence": evidence,
+                    "tool_calls_count": tool_calls_count,
                 }
             )
-            response.raise_for_status()
             result = response.json()
 
             return {
@@ -118,6 +221,7 @@ class JudgeClient:
                 "summary": result.get("summary", ""),
                 "hallucination_detected": result.get("hallucination_detected", False),
                 "verification_summary": result.get("verification_summary", ""),
+                "usage": result.get("usage"),
             }
         except Exception as e:
             print(f"Judge evaluation failed: {e}")
@@ -129,29 +233,44 @@ class JudgeClient:
 
     async def batch_evaluate(
         self,
-        evaluations: List[Dict[str, str]],
+        evaluations: List[Dict[str, Any]],
     ) -> List[Dict[str, Any]]:
-        """Batch evaluate multiple trajectories"""
-        client = await self.get_client()
+        """
+        Batch evaluate multiple trajectories in one /verify_batch round trip.
 
+        Results are returned in the same order as evaluations. The timeout
+        scales with the group size, and a read timeout is not retried: the
+        server may still be judging the whole group.
+        """
         try:
-            response = await client.post(
-                "/verify/batch",
-                json={"evaluations": evaluations}
+            response = await self._post(
+                "/verify_batch",
+                {"items": evaluations},
+                timeout=self.timeout * max(1, len(evaluations)),
+                retry_read_timeouts=False,
             )
-            response.raise_for_status()
-            return response.json().get("results", [])
+            return [
+                {
+                    "score": result.get("score", 0.0),
+                    "summary": result.get("summary", ""),
+                    "hallucination_detected": result.get("hallucination_detected", False),
+                    "verification_summary": result.get("verification_summary", ""),
+                    "usage": result.get("usage"),
+                }
+                for result in response.json().get("results", [])
+            ]
         except Exception as e:
             print(f"Batch evaluation failed: {e}")
             # Fall back to individual evaluations
-            results = []
-            for eval_req in evaluations:
-                result = await self.evaluate(
+            return list(await asyncio.gather(*(
+                self.evaluate(
                     eval_req["task_description"],
-                    eval_req["agent_response"]
+                    eval_req["agent_response"],
+                    evidence=eval_req.get("evidence"),
+                    tool_calls_count=eval_req.get("tool_calls_count"),
                 )
-                results.append(result)
-            return results
+                for eval_req in evaluations
+            )))
 
 
 def calculate_reward(
@@ -217,6 +336,17 @@ class SecurityPolicyConfig:
         val_set_size: int = 4,
         eval_steps: int = 5,
         num_epochs: int = 10,
+        judge_workers: int = 16,
+        judge_queue_size: int = 64,
+        judge_pipeline: Optional[JudgePipeline] = None,
+        judge_client: Optional[JudgeClient] = None,
+        target_pool_size: int = 32,
+        inference_pool_size: int = 64,
+        use_local_verifier: bool = True,
+        max_response_bytes: int = 16 * 1024,
+        context_budget_tokens: int = 6144,
+        warm_prefix_cache: bool = True,
+        send_judge_evidence: bool = True,
     ):
         self.dvwa_url = dvwa_url
         self.judge_url = judge_url
@@ -228,19 +358,38 @@ class SecurityPolicyConfig:
         self.val_set_size = val_set_size
         self.eval_steps = eval_steps
         self.num_epochs = num_epochs
+        self.judge_workers = judge_workers
+        self.judge_queue_size = judge_queue_size
+        # Shared judge stage; rollouts judge inline when it is not set
+        self.judge_pipeline = judge_pipeline
+        # Process-wide judge client; rollouts open a throwaway one when unset
+        self.judge_client = judge_client
+        self.target_pool_size = target_pool_size
+        self.inference_pool_size = inference_pool_size
+        # Scores unambiguous rollouts without a judge round trip
+        self.local_verifier = LocalVerifier() if use_local_verifier else None
+        self.max_response_bytes = max_response_bytes
+        self.context_budget_tokens = context_budget_tokens
+        # Prefill each group's shared prompt prefix before fanning out
+        self.warm_prefix_cache = warm_prefix_cache
+        # Attach each rollout's evidence digest to its judge request
+        self.send_judge_evidence = send_judge_evidence
 
 
 if HAS_ART:
     @limit_concurrency(64)
-    async def rollout_security_task(
+    async def generate_security_rollout(
         model: art.Model,
         challenge: Dict[str, Any],
         step: int = 0,
         phase: str = "train",
         config: SecurityPolicyConfig = None,
-    ) -> art.Trajectory:
+    ) -> tuple:
         """
-        Execute a security challenge rollout and return an ART Trajectory.
+        Execute a security challenge rollout without judging it.
+
+        Returns the unscored ART Trajectory and the raw rollout result. The
+        concurrency slot is released as soon as generation finishes.
         """
         config = config or SecurityPolicyConfig()
 
@@ -250,6 +399,9 @@ if HAS_ART:
             model_name=model.get_inference_name(),
             dvwa_url=config.dvwa_url,
             max_tool_calls=config.max_tool_calls,
+            max_response_bytes=config.max_response_bytes,
+            context_budget_tokens=config.context_budget_tokens,
+            count_tokens=get_token_counter(getattr(model, "base_model", None)),
         )
 
         # Execute the challenge
@@ -274,29 +426,47 @@ if HAS_ART:
                 "claimed_success": result.success,
             },
         )
+        return traj, result
 
-        # Evaluate with judge
-        judge = JudgeClient(config.judge_url)
-        try:
-            judge_result = await judge.evaluate(
-                task_description=challenge["task_description"],
-                agent_response=result.final_output,
-            )
 
-            # Calculate final reward
-            reward = calculate_reward(judge_result, result, None)
-            traj.reward = reward
-            traj.metadata["judge_score"] = judge_result.get("score", 0.0)
-            traj.metadata["hallucination"] = judge_result.get("hallucination_detected", False)
-            traj.metadata["judge_summary"] = judge_result.get("summary", "")[:200]
+    async def judge_security_rollouts(
+        challenge: Dict[str, Any],
+        results: List[SecurityRolloutResult],
+        config: SecurityPolicyConfig,
+    ) -> List[Dict[str, Any]]:
+        """Evaluate finished rollouts of one challenge in a single judge round trip"""
+        judge = config.judge_client or JudgeClient(config.judge_url)
+        try:
+            return await judge.batch_evaluate([
+                {
+                    "task_description": challenge["task_description"],
+                    "agent_response": result.final_output,
+                    "evidence": (
+                        build_evidence_digest(result.messages)
+                        if config.send_judge_evidence else None
+                    ),
+                    "tool_calls_count": result.total_tool_calls,
+                }
+                for result in results
+            ])
+        finally:
+            if judge is not config.judge_client:
+                await judge.close()
 
-        except Exception as e:
-            print(f"Judge evaluation failed for {challenge['id']}: {e}")
-            traj.reward = -0.5  # Penalize failed evaluations
-            traj.metadata["error"] = str(e)
 
-        finally:
-            await judge.close()
+    def apply_judge_result(
+        traj: art.Trajectory,
+        judge_result: Dict[str, Any],
+        result: SecurityRolloutResult,
+    ) -> art.Trajectory:
+        """Set reward, judge metadata and metrics on a trajectory"""
+        # Calculate final reward
+        reward = calculate_reward(judge_result, result, None)
+        traj.reward = reward
+        traj.metadata["judge_score"] = judge_result.get("score", 0.0)
+        traj.metadata["hallucination"] = judge_result.get("hallucination_detected", False)
+        traj.metadata["judge_summary"] = judge_result.get("summary", "")[:200]
+        traj.metadata["local_verdict"] = judge_result.get("local_verdict", False)
 
         # Add metrics
         traj.metrics = {
@@ -309,6 +479,120 @@ if HAS_ART:
         return traj
 
 
+    def apply_judge_failure(
+        traj: art.Trajectory,
+        error: Exception,
+        result: SecurityRolloutResult,
+    ) -> art.Trajectory:
+        """Penalize a trajectory whose judge evaluation failed"""
+        traj.reward = -0.5  # Penalize failed evaluations
+        traj.metadata["error"] = str(error)
+        traj.metrics = {
+            "tool_calls": result.total_tool_calls,
+            "claimed_success": 1 if result.success else 0,
+            "hallucination": 0,
+        }
+        traj.finish()
+        return traj
+
+
+    async def score_security_rollouts(
+        challenge: Dict[str, Any],
+        rollouts: List[tuple],
+        config: SecurityPolicyConfig,
+    ) -> List[art.Trajectory]:
+        """
+        Judge (trajectory, result) pairs of one challenge and set their rewards.
+
+        Rollouts the local verifier can score are settled immediately; only
+        the ambiguous rest goes to the LLM judge. When config.judge_pipeline
+        is set, that batch is queued for the judge workers so generation
+        elsewhere keeps going; otherwise it is judged inline.
+        """
+        judge_results: List[Optional[Dict[str, Any]]] = [None] * len(rollouts)
+        if config.local_verifier is not None:
+            for i, (_, result) in enumerate(rollouts):
+                judge_results[i] = await config.local_verifier.verify(
+                    challenge, result.final_output, result.messages
+                )
+
+        ambiguous = [i for i, judge_result in enumerate(judge_results) if judge_result is None]
+        if ambiguous:
+            results = [rollouts[i][1] for i in ambiguous]
+            try:
+                if config.judge_pipeline is not None:
+                    future = await config.judge_pipeline.submit(
+                        lambda: judge_security_rollouts(challenge, results, config)
+                    )
+                    remote_results = await future
+                else:
+                    remote_results = await judge_security_rollouts(challenge, results, config)
+            except Exception as e:
+                print(f"Judge evaluation failed for {challenge['id']}: {e}")
+                return [
+                    apply_judge_failure(traj, e, result) if judge_result is None
+                    else apply_judge_result(traj, judge_result, result)
+                    for (traj, result), judge_result in zip(rollouts, judge_results)
+                ]
+            for i, remote_result in zip(ambiguous, remote_results):
+                judge_results[i] = remote_result
+
+        return [
+            apply_judge_result(traj, judge_result, result)
+            for (traj, result), judge_result in zip(rollouts, judge_results)
+        ]
+
+
+    async def rollout_security_task(
+        model: art.Model,
+        challenge: Dict[str, Any],
+        step: int = 0,
+        phase: str = "train",
+        config: SecurityPolicyConfig = None,
+    ) -> art.Trajectory:
+        """
+        Execute a security challenge rollout and return an ART Trajectory.
+        """
+        config = config or SecurityPolicyConfig()
+
+        rollout = await generate_security_rollout(model, challenge, step, phase, config)
+        trajectories = await score_security_rollouts(challenge, [rollout], config)
+        return trajectories[0]
+
+
+    async def rollout_security_group(
+        model: art.Model,
+        challenge: Dict[str, Any],
+        num_trajectories: int,
+        step: int = 0,
+        phase: str = "train",
+        config: SecurityPolicyConfig = None,
+    ) -> art.TrajectoryGroup:
+        """
+        Execute a GRPO group of rollouts for one challenge.
+
+        The group's shared prompt prefix is prefilled once so every rollout
+        hits vLLM's prefix cache on turn 1. All rollouts are then generated
+        concurrently, and the whole group is submitted to the judge's
+        /verify_batch endpoint in one round trip.
+        """
+        config = config or SecurityPolicyConfig()
+
+        if config.warm_prefix_cache:
+            await FullCAIRollout(
+                model_base_url=model.inference_base_url,
+                model_name=model.get_inference_name(),
+                dvwa_url=config.dvwa_url,
+            ).warm_prefix_cache(challenge)
+
+        rollouts = await asyncio.gather(*(
+            generate_security_rollout(model, challenge, step, phase, config)
+            for _ in range(num_trajectories)
+        ))
+        trajectories = await score_security_rollouts(challenge, list(rollouts), config)
+        return art.TrajectoryGroup(trajectories)
+
+
     async def evaluate_model(
         model: art.Model,
         challenges: List[Dict[str, Any]],
@@ -397,115 +681,152 @@ if HAS_ART:
         print(f"Training on {len(train_challenges)} challenges")
         print(f"Validation on {len(val_challenges)} challenges")
 
-        with LocalBackend() as backend:
-            # Register model with backend
-            await model.register(backend)
-            print(f"Model registered with inference at: {model.inference_base_url}")
-
-            # Training loop
-            train_iterator = iterate_dataset(
-                list(range(len(train_challenges))),
-                groups_per_step=config.groups_per_step,
-                num_epochs=config.num_epochs,
-                initial_step=await model.get_step(),
-            )
+        # Shared keep-alive pools for target (DVWA) and vLLM traffic
+        configure_target_pool(config.target_pool_size)
+        configure_inference_pool(config.inference_pool_size)
+        configure_command_executor(
+            max_concurrency=training_config.command_concurrency,
+            timeout=training_config.command_timeout,
+            max_output_bytes=config.max_response_bytes,
+        )
+
+        # One pooled judge client reused by every rollout of the run
+        if config.judge_client is None:
+            config.judge_client = JudgeClient(config.judge_url)
+
+        # Judge workers drain finished rollouts while generation continues
+        config.judge_pipeline = JudgePipeline(
+            num_workers=config.judge_workers,
+            max_queue_size=config.judge_queue_size,
+        )
+        completed = False
+        try:
+            await config.judge_pipeline.start()
+
+            with LocalBackend() as backend:
+                # Register model with backend
+                await model.register(backend)
+                print(f"Model registered with inference at: {model.inference_base_url}")
+
+                # Prefix cache hit rate and TTFT per step, from vLLM's /metrics
+                vllm_monitor = VLLMMetricsMonitor(model.inference_base_url)
+
+                # Training loop
+                train_iterator = iterate_dataset(
+                    list(range(len(train_challenges))),
+                    groups_per_step=config.groups_per_step,
+                    num_epochs=config.num_epochs,
+                    initial_step=await model.get_step(),
+                )
 
-            for batch in train_iterator:
-                print(f"\n{'='*60}")
-                print(f"STEP {batch.step} (Epoch {batch.epoch}, Step {batch.epoch_step})")
-                print(f"{'='*60}")
-
-                # Evaluation
-                if batch.step % config.eval_steps == 0:
-                    print("\n--- Evaluation ---")
-                    await evaluate_model(model, val_challenges, batch.step, config)
-
-                # Generate trajectory groups
-                print(f"\nGenerating trajectories for {len(batch.items)} challenge groups...")
-                batch_challenges = [train_challenges[i % len(train_challenges)] for i in batch.items]
-
-                groups = await art.gather_trajectory_groups(
-                    (
-                        art.TrajectoryGroup(
-                            (
-                                rollout_security_task(
-                                    model,
-                                    challenge,
-                                    batch.step,
-                                    "train",
-                                    config,
-                                )
-                                for _ in range(config.trajectories_per_group)
+                for batch in train_iterator:
+                    print(f"\n{'='*60}")
+                    print(f"STEP {batch.step} (Epoch {batch.epoch}, Step {batch.epoch_step})")
+                    print(f"{'='*60}")
+
+                    # Evaluation
+                    if batch.step % config.eval_steps == 0:
+                        print("\n--- Evaluation ---")
+                        await evaluate_model(model, val_challenges, batch.step, config)
+
+                    # Generate trajectory groups
+                    print(f"\nGenerating trajectories for {len(batch.items)} challenge groups...")
+                    await vllm_monitor.step_metrics()  # Baseline, so eval traffic is excluded
+                    batch_challenges = [train_challenges[i % len(train_challenges)] for i in batch.items]
+
+                    groups = await art.gather_trajectory_groups(
+                        (
+                            rollout_security_group(
+                                model,
+                                challenge,
+                                config.trajectories_per_group,
+                                batch.step,
+                                "train",
+                                config,
                             )
+                            for challenge in batch_challenges
                         )
-                        for challenge in batch_challenges
                     )
-                )
 
-                # Compute step metrics
-                total_reward = sum(
-                    sum(traj.reward for traj in group.trajectories)
-                    for group in groups
-                )
-                num_trajectories = sum(len(group.trajectories) for group in groups)
-                avg_reward = total_reward / num_trajectories if num_trajectories > 0 else 0
+                    # Compute step metrics
+                    total_reward = sum(
+                        sum(traj.reward for traj in group.trajectories)
+                        for group in groups
+                    )
+                    num_trajectories = sum(len(group.trajectories) for group in groups)
+                    avg_reward = total_reward / num_trajectories if num_trajectories > 0 else 0
 
-                hallucinations = sum(
-                    sum(1 for t in g.trajectories if t.metadata.get("hallucination"))
-                    for g in groups
-                )
-                successes = sum(
-                    sum(1 for t in g.trajectories if t.reward > 0.5)
-                    for g in groups
-                )
+                    hallucinations = sum(
+                        sum(1 for t in g.trajectories if t.metadata.get("hallucination"))
+                        for g in groups
+                    )
+                    successes = sum(
+                        sum(1 for t in g.trajectories if t.reward > 0.5)
+                        for g in groups
+                    )
 
-                print(f"\nStep {batch.step} metrics:")
-                print(f"  Trajectories: {num_trajectories}")
-                print(f"  Avg reward: {avg_reward:.3f}")
-                print(f"  Success rate: {successes/num_trajectories:.2%}")
-                print(f"  Hallucination rate: {hallucinations/num_trajectories:.2%}")
+                    print(f"\nStep {batch.step} metrics:")
+                    print(f"  Trajectories: {num_trajectories}")
+                    print(f"  Avg reward: {avg_reward:.3f}")
+                    print(f"  Success rate: {successes/num_trajectories:.2%}")
+                    print(f"  Hallucination rate: {hallucinations/num_trajectories:.2%}")
+                    if config.local_verifier is not None:
+                        print(f"  Local verifier hit rate: {config.local_verifier.hit_rate():.2%}")
+                    vllm_metrics = await vllm_monitor.step_metrics()
+                    if "vllm/prefix_cache_hit_rate" in vllm_metrics:
+                        print(f"  Prefix cache hit rate: {vllm_metrics['vllm/prefix_cache_hit_rate']:.2%}")
+
+                    # Log to W&B
+                    if HAS_WANDB and wandb.run:
+                        wandb.log({
+                            "train/avg_reward": avg_reward,
+                            "train/success_rate": successes / num_trajectories,
+                            "train/hallucination_rate": hallucinations / num_trajectories,
+                            "train/num_trajectories": num_trajectories,
+                            "train/avg_tool_calls": sum(
+                                sum(t.metrics.get("tool_calls", 0) for t in g.trajectories)
+                                for g in groups
+                            ) / num_trajectories,
+                            **(config.local_verifier.metrics() if config.local_verifier else {}),
+                            **vllm_metrics,
+                        }, step=batch.step)
+
+                    # GRPO training step
+                    print(f"\nTraining on {len(groups)} trajectory groups...")
+                    await model.train(
+                        groups,
+                        config=art.TrainConfig(learning_rate=config.learning_rate),
+                    )
 
-                # Log to W&B
+                    # Checkpoint
+                    if (batch.step + 1) % training_config.checkpoint_every == 0:
+                        print(f"\nSaving checkpoint at step {batch.step + 1}...")
+                        if HAS_HF and training_config.hf_repo_id and training_config.hf_token:
+                            try:
+                                # In production, would save LoRA weights here
+                                print(f"  Would push to: {training_config.hf_repo_id}")
+                            except Exception as e:
+                                print(f"  Checkpoint push failed: {e}")
+
+                # Final evaluation
+                print("\n" + "=" * 60)
+                print("FINAL EVALUATION")
+                print("=" * 60)
+                final_step = await model.get_step()
+                final_reward = await evaluate_model(model, val_challenges, final_step, config)
+                print(f"Final average reward: {final_reward:.3f}")
+            completed = True
+        finally:
+            # Also on errors and cancellation, so pooled connections, judge
+            # workers and command subprocesses never outlive the run
+            try:
+                await config.judge_pipeline.close(drain=completed)
+                await config.judge_client.close()
+                await close_all_clients()
+            finally:
+                close_command_executor()
                 if HAS_WANDB and wandb.run:
-                    wandb.log({
-                        "train/avg_reward": avg_reward,
-                        "train/success_rate": successes / num_trajectories,
-                        "train/hallucination_rate": hallucinations / num_trajectories,
-                        "train/num_trajectories": num_trajectories,
-                        "train/avg_tool_calls": sum(
-                            sum(t.metrics.get("tool_calls", 0) for t in g.trajectories)
-                            for g in groups
-                        ) / num_trajectories,
-                    }, step=batch.step)
-
-                # GRPO training step
-                print(f"\nTraining on {len(groups)} trajectory groups...")
-                await model.train(
-                    groups,
-                    config=art.TrainConfig(learning_rate=config.learning_rate),
-                )
-
-                # Checkpoint
-                if (batch.step + 1) % training_config.checkpoint_every == 0:
-                    print(f"\nSaving checkpoint at step {batch.step + 1}...")
-                    if HAS_HF and training_config.hf_repo_id and training_config.hf_token:
-                        try:
-                            # In production, would save LoRA weights here
-                            print(f"  Would push to: {training_config.hf_repo_id}")
-                        except Exception as e:
-                            print(f"  Checkpoint push failed: {e}")
-
-            # Final evaluation
-            print("\n" + "=" * 60)
-            print("FINAL EVALUATION")
-            print("=" * 60)
-            final_step = await model.get_step()
-            final_reward = await evaluate_model(model, val_challenges, final_step, config)
-            print(f"Final average reward: {final_reward:.3f}")
-
-        # Cleanup
-        if HAS_WANDB and wandb.run:
-            wandb.finish()
+                    wandb.finish()
 
         print("\n" + "=" * 60)
         print("TRAINING COMPLETE")
@@ -540,6 +861,15 @@ async def main_with_art():
         trajectories_per_group=training_config.rollouts_per_group,
         groups_per_step=training_config.groups_per_step,
         learning_rate=args.lr or training_config.learning_rate,
+        judge_workers=training_config.judge_concurrency,
+        judge_queue_size=training_config.judge_queue_size,
+        target_pool_size=training_config.target_pool_size,
+        inference_pool_size=training_config.inference_pool_size,
+        use_local_verifier=training_config.use_local_verifier,
+        max_response_bytes=training_config.max_response_bytes,
+        context_budget_tokens=training_config.context_budget_tokens,
+        warm_prefix_cache=training_config.warm_prefix_cache,
+        send_judge_evidence=training_config.send_judge_evidence,
     )
 
     # Create trainable model
@@ -555,6 +885,7 @@ async def main_with_art():
             engine_args=art.dev.EngineArgs(
                 tensor_parallel_size=training_config.tensor_parallel_size,
                 enable_sleep_mode=True,
+                enable_prefix_caching=True,  # Rollouts of a group share their prompt prefix
             ),
             init_args=art.dev.InitArgs(
                 gpu_memory_utilization=training_config.gpu_memory_utilization,
@@ -9,7 +9,8 @@ import asyncio
 import json
 import os
 import sys
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 # Add CAI to path
@@ -32,9 +33,18 @@ except ImportError as e:
     print(f"CAI not available: {e}")
     print("Using simplified HTTP-based tools instead")
 
-from openai import AsyncOpenAI
 import httpx
 
+from .command_executor import get_command_executor
+from .context import RolloutContext, approximate_token_count
+from .http_pool import (
+    DEFAULT_MAX_BODY_BYTES,
+    CappedResponse,
+    TargetSession,
+    get_inference_client,
+    get_target_client,
+)
+
 
 @dataclass
 class CAIToolResult:
@@ -57,134 +67,165 @@ class SecurityRolloutResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Built once and shared by every rollout so the serialized tools are byte-identical
+# in every request (vLLM prefix caching). Treat as read-only.
+CAI_TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "http_get",
+            "description": "Make an HTTP GET request to the target. Use for reconnaissance and testing endpoints.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "path": {"type": "string", "description": "URL path (appended to DVWA base URL)"},
+                    "params": {"type": "object", "description": "Query parameters", "additionalProperties": {"type": "string"}}
+                },
+                "required": ["path"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "http_post",
+            "description": "Make an HTTP POST request. Use for form submissions, login attempts, injection attacks.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "path": {"type": "string", "description": "URL path"},
+                    "data": {"type": "object", "description": "Form data to POST", "additionalProperties": {"type": "string"}},
+                    "cookies": {"type": "object", "description": "Cookies to include", "additionalProperties": {"type": "string"}}
+                },
+                "required": ["path"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "curl_request",
+            "description": "Execute a curl command for advanced HTTP requests. Supports custom headers, methods, data.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "url": {"type": "string", "description": "Full URL or path"},
+                    "method": {"type": "string", "enum": ["GET", "POST", "PUT", "DELETE"], "default": "GET"},
+                    "headers": {"type": "array", "items": {"type": "string"}, "description": "Headers in 'Key: Value' format"},
+                    "data": {"type": "string", "description": "Request body data"}
+                },
+                "required": ["url"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "run_command",
+            "description": "Execute a shell command. Use for command injection exploitation, post-exploitation.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "command": {"type": "string", "description": "Shell command to execute"}
+                },
+                "required": ["command"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "sql_inject",
+            "description": "Test SQL injection payload on a vulnerable endpoint.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "path": {"type": "string", "description": "Vulnerable endpoint path"},
+                    "param_name": {"type": "string", "description": "Parameter to inject into"},
+                    "payload": {"type": "string", "description": "SQL injection payload"},
+                    "method": {"type": "string", "enum": ["GET", "POST"], "default": "GET"}
+                },
+                "required": ["path", "param_name", "payload"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "submit_answer",
+            "description": "Submit your final answer with evidence. Call this when you've completed the task or determined you cannot.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "answer": {"type": "string", "description": "Your findings or final answer"},
+                    "evidence": {"type": "string", "description": "Evidence supporting your answer (extracted data, successful payloads, etc.)"},
+                    "success": {"type": "boolean", "description": "Whether you believe you completed the task"},
+                    "method_used": {"type": "string", "description": "Brief description of the method/technique used"}
+                },
+                "required": ["answer", "success"]
+            }
+        }
+    }
+]
+
+
 class CAISecurityTools:
     """
     Security tools wrapper that uses CAI when available,
     falls back to HTTP-based tools otherwise.
     """
 
-    def __init__(self, dvwa_url: str = "http://31.97.117.123"):
+    def __init__(
+        self,
+        dvwa_url: str = "http://31.97.117.123",
+        use_cookie_jar: bool = True,
+        max_response_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ):
         self.dvwa_url = dvwa_url.rstrip('/')
-        self._http_client: Optional[httpx.AsyncClient] = None
+        # Per-rollout cookies on top of the process-wide target pool; bodies
+        # are streamed and capped at max_response_bytes
+        self.session = TargetSession(
+            self.dvwa_url,
+            headers={"User-Agent": "Mozilla/5.0 (Security Research)"},
+            timeout=60.0,
+            use_cookie_jar=use_cookie_jar,
+            max_body_bytes=max_response_bytes,
+        )
         self.tool_history: List[CAIToolResult] = []
 
     async def get_http_client(self) -> httpx.AsyncClient:
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient(
-                timeout=60.0,
-                follow_redirects=True,
-                headers={"User-Agent": "Mozilla/5.0 (Security Research)"}
-            )
-        return self._http_client
+        """Shared pooled client for the target (no per-rollout cookies)"""
+        return get_target_client(self.dvwa_url)
 
     async def close(self):
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Drop the rollout's cookies; the shared pool stays open"""
+        self.session.close()
 
     def get_openai_tools(self) -> List[Dict[str, Any]]:
         """Return tool definitions in OpenAI function calling format"""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "http_get",
-                    "description": "Make an HTTP GET request to the target. Use for reconnaissance and testing endpoints.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "URL path (appended to DVWA base URL)"},
-                            "params": {"type": "object", "description": "Query parameters", "additionalProperties": {"type": "string"}}
-                        },
-                        "required": ["path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "http_post",
-                    "description": "Make an HTTP POST request. Use for form submissions, login attempts, injection attacks.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "URL path"},
-                            "data": {"type": "object", "description": "Form data to POST", "additionalProperties": {"type": "string"}},
-                            "cookies": {"type": "object", "description": "Cookies to include", "additionalProperties": {"type": "string"}}
-                        },
-                        "required": ["path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "curl_request",
-                    "description": "Execute a curl command for advanced HTTP requests. Supports custom headers, methods, data.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "url": {"type": "string", "description": "Full URL or path"},
-                            "method": {"type": "string", "enum": ["GET", "POST", "PUT", "DELETE"], "default": "GET"},
-                            "headers": {"type": "array", "items": {"type": "string"}, "description": "Headers in 'Key: Value' format"},
-                            "data": {"type": "string", "description": "Request body data"}
-                        },
-                        "required": ["url"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "run_command",
-                    "description": "Execute a shell command. Use for command injection exploitation, post-exploitation.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "command": {"type": "string", "description": "Shell command to execute"}
-                        },
-                        "required": ["command"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "sql_inject",
-                    "description": "Test SQL injection payload on a vulnerable endpoint.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "Vulnerable endpoint path"},
-                            "param_name": {"type": "string", "description": "Parameter to inject into"},
-                            "payload": {"type": "string", "description": "SQL injection payload"},
-                            "method": {"type": "string", "enum": ["GET", "POST"], "default": "GET"}
-                        },
-                        "required": ["path", "param_name", "payload"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "submit_answer",
-                    "description": "Submit your final answer with evidence. Call this when you've completed the task or determined you cannot.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "answer": {"type": "string", "description": "Your findings or final answer"},
-                            "evidence": {"type": "string", "description": "Evidence supporting your answer (extracted data, successful payloads, etc.)"},
-                            "success": {"type": "boolean", "description": "Whether you believe you completed the task"},
-                            "method_used": {"type": "string", "description": "Brief description of the method/technique used"}
-                        },
-                        "required": ["answer", "success"]
-                    }
-                }
-            }
-        ]
+        return CAI_TOOL_DEFINITIONS
 
     async def execute_tool(self, name: str, arguments: Dict[str, Any]) -> str:
         """Execute a tool by name and return result"""
+        result, output = await self._run_tool(name, arguments)
+        self.tool_history.append(result)
+        return output
+
+    async def execute_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Execute independent (name, arguments) tool calls concurrently.
+
+        Outputs and tool_history entries follow call order, not completion
+        order, so trajectories stay deterministic.
+        """
+        completed = await asyncio.gather(*(
+            self._run_tool(name, arguments) for name, arguments in calls
+        ))
+        self.tool_history.extend(result for result, _ in completed)
+        return [output for _, output in completed]
+
+    async def _run_tool(self, name: str, arguments: Dict[str, Any]) -> Tuple[CAIToolResult, str]:
+        """Run a tool without touching tool_history"""
         tool_map = {
             "http_get": self._http_get,
             "http_post": self._http_post,
@@ -195,30 +236,21 @@ class CAISecurityTools:
         }
 
         if name not in tool_map:
-            result = CAIToolResult(name, False, "", f"Unknown tool: {name}")
-            self.tool_history.append(result)
-            return json.dumps({"error": f"Unknown tool: {name}"})
+            return (
+                CAIToolResult(name, False, "", f"Unknown tool: {name}"),
+                json.dumps({"error": f"Unknown tool: {name}"}),
+            )
 
         try:
             output = await tool_map[name](**arguments)
-            result = CAIToolResult(name, True, output[:1000], None)
-            self.tool_history.append(result)
-            return output
+            return CAIToolResult(name, True, output[:1000], None), output
         except Exception as e:
-            result = CAIToolResult(name, False, "", str(e))
-            self.tool_history.append(result)
-            return json.dumps({"error": str(e)})
+            return CAIToolResult(name, False, "", str(e)), json.dumps({"error": str(e)})
 
     async def _http_get(self, path: str, params: Optional[Dict[str, str]] = None) -> str:
         """HTTP GET request"""
-        client = await self.get_http_client()
-        url = f"{self.dvwa_url}{path}" if not path.startswith("http") else path
-        response = await client.get(url, params=params)
-        return json.dumps({
-            "status_code": response.status_code,
-            "body": response.text[:3000],
-            "headers": dict(list(response.headers.items())[:10])
-        })
+        response = await self.session.fetch("GET", path, params=params)
+        return self._format_response(response, include_headers=True)
 
     async def _http_post(
         self,
@@ -227,14 +259,21 @@ class CAISecurityTools:
         cookies: Optional[Dict[str, str]] = None
     ) -> str:
         """HTTP POST request"""
-        client = await self.get_http_client()
-        url = f"{self.dvwa_url}{path}" if not path.startswith("http") else path
-        response = await client.post(url, data=data, cookies=cookies)
-        return json.dumps({
+        response = await self.session.fetch("POST", path, data=data, cookies=cookies)
+        return self._format_response(response, include_headers=True)
+
+    def _format_response(self, response: CappedResponse, include_headers: bool = False) -> str:
+        """Serialize a capped response for the model"""
+        output = {
             "status_code": response.status_code,
             "body": response.text[:3000],
-            "headers": dict(list(response.headers.items())[:10])
-        })
+        }
+        if include_headers:
+            output["headers"] = dict(list(response.headers.items())[:10])
+        if response.truncated or len(response.text) > 3000:
+            output["body_length"] = response.body_length
+            output["truncated"] = True
+        return json.dumps(output)
 
     async def _curl_request(
         self,
@@ -254,14 +293,14 @@ class CAISecurityTools:
                 args += f' -d "{data}"'
             full_url = f"{self.dvwa_url}{url}" if not url.startswith("http") else url
             try:
-                result = curl(args, full_url)
-                return result
+                # CAI's curl is synchronous; keep it off the event loop
+                return await get_command_executor().run_sync(curl, args, full_url)
+            except asyncio.TimeoutError:
+                return json.dumps({"error": "curl timed out"})
             except Exception as e:
                 return json.dumps({"error": str(e)})
         else:
             # Fallback to httpx
-            client = await self.get_http_client()
-            full_url = f"{self.dvwa_url}{url}" if not url.startswith("http") else url
             headers_dict = {}
             if headers:
                 for h in headers:
@@ -269,18 +308,17 @@ class CAISecurityTools:
                         k, v = h.split(":", 1)
                         headers_dict[k.strip()] = v.strip()
 
-            response = await client.request(method, full_url, headers=headers_dict, content=data)
-            return json.dumps({
-                "status_code": response.status_code,
-                "body": response.text[:3000]
-            })
+            response = await self.session.fetch(method, url, headers=headers_dict, content=data)
+            return self._format_response(response)
 
     async def _run_command(self, command: str) -> str:
         """Execute shell command"""
         if HAS_CAI:
             try:
-                result = generic_linux_command(command)
-                return result
+                # Async subprocess with timeout, output cap and kill on cancel,
+                # instead of CAI's blocking generic_linux_command
+                result = await get_command_executor().run(command)
+                return result.to_json()
             except Exception as e:
                 return json.dumps({"error": str(e)})
         else:
@@ -321,6 +359,78 @@ class CAISecurityTools:
         })
 
 
+@lru_cache(maxsize=16)
+def build_system_prompt(dvwa_url: str) -> str:
+    """
+    Build the system prompt shared by every challenge on a target.
+
+    Challenge-specific fields live in the task message (build_task_message),
+    so the system prompt and tool definitions form a byte-identical prefix
+    that vLLM's prefix cache reuses across rollouts and groups.
+    """
+    return f"""You are an expert ethical security researcher conducting authorized penetration testing.
+
+## MISSION
+Complete the assigned security task on the target system. You have FULL AUTHORIZATION.
+
+## TARGET
+- Base URL: {dvwa_url}
+
+## AVAILABLE TOOLS
+1. **http_get** - GET requests for reconnaissance
+2. **http_post** - POST requests for form submissions, injections
+3. **curl_request** - Advanced HTTP with custom headers/methods
+4. **run_command** - Shell command execution (for command injection)
+5. **sql_inject** - Helper for SQL injection testing
+6. **submit_answer** - Submit your final findings
+
+## STRATEGY GUIDELINES
+
+### For SQL Injection:
+- Try basic payloads first: ' OR '1'='1, ' UNION SELECT
+- Enumerate columns with ORDER BY
+- Use UNION SELECT to extract data
+- Common DVWA endpoint: /vulnerabilities/sqli/?id=
+
+### For XSS:
+- Test reflection points
+- Try <script>alert(1)</script>
+- Use event handlers: <img src=x onerror=alert(1)>
+- Common DVWA endpoint: /vulnerabilities/xss_r/?name=
+
+### For Command Injection:
+- Chain commands with ; | && ||
+- Try: ; ls, | cat /etc/passwd
+- Common DVWA endpoint: /vulnerabilities/exec/
+
+### For File Inclusion:
+- Try path traversal: ../../../etc/passwd
+- PHP wrappers: php://filter/convert.base64-encode/resource=
+- Common DVWA endpoint: /vulnerabilities/fi/?page=
+
+## IMPORTANT RULES
+1. Be systematic - test one thing at a time
+2. Record your findings as evidence
+3. If stuck, try alternative approaches
+4. If truly unable to complete, say "I don't know" honestly
+5. ALWAYS call submit_answer when done
+6. Minimize unnecessary requests - be efficient
+
+## DVWA NOTES
+- Security level is set to LOW
+- Login may be required: admin/password
+- Cookies: PHPSESSID, security=low
+
+Begin your assessment now."""
+
+
+def build_task_message(challenge: Dict[str, Any]) -> str:
+    """First user message: challenge metadata followed by the task"""
+    category = challenge.get("category", "general")
+    difficulty = challenge.get("difficulty", "medium")
+    return f"Category: {category}\nDifficulty: {difficulty}\n\n{challenge['task_description']}"
+
+
 class FullCAIRollout:
     """
     Execute security challenge rollouts with full CAI integration.
@@ -332,29 +442,60 @@ class FullCAIRollout:
         model_name: str,
         dvwa_url: str = "http://31.97.117.123",
         max_tool_calls: int = 50,
+        max_response_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        context_budget_tokens: int = 6144,
+        count_tokens: Callable[[str], int] = approximate_token_count,
     ):
         self.model_base_url = model_base_url
         self.model_name = model_name
         self.max_tool_calls = max_tool_calls
-        self.tools = CAISecurityTools(dvwa_url)
+        self.tools = CAISecurityTools(dvwa_url, max_response_bytes=max_response_bytes)
+        # Prompt tokens per turn before old tool outputs are elided
+        self.context_budget_tokens = context_budget_tokens
+        self.count_tokens = count_tokens
+
+    async def warm_prefix_cache(self, challenge: Dict[str, Any]):
+        """
+        Prefill the shared prompt prefix of a challenge once.
+
+        Rollouts of a group are launched together, so without this they all
+        compute the same prefix concurrently and none of them hits vLLM's
+        prefix cache on turn 1. A single one-token completion populates it.
+        """
+        client = get_inference_client(self.model_base_url)
+        try:
+            await client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": build_system_prompt(self.tools.dvwa_url)},
+                    {"role": "user", "content": build_task_message(challenge)},
+                ],
+                tools=self.tools.get_openai_tools(),
+                tool_choice="auto",
+                max_tokens=1,
+            )
+        except Exception as e:
+            print(f"Prefix cache warm-up failed for {challenge.get('id')}: {e}")
 
     async def execute(self, challenge: Dict[str, Any]) -> SecurityRolloutResult:
         """Execute a complete rollout for a security challenge"""
 
-        client = AsyncOpenAI(
-            base_url=self.model_base_url,
-            api_key="not-needed",
-        )
-
-        system_prompt = self._build_system_prompt(challenge)
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": challenge["task_description"]},
-        ]
+        client = get_inference_client(self.model_base_url)
 
+        system_prompt = build_system_prompt(self.tools.dvwa_url)
         tool_definitions = self.tools.get_openai_tools()
         self.tools.tool_history = []  # Reset history
 
+        # The model sees a budgeted view; the full history is kept for training
+        context = RolloutContext(
+            system_prompt,
+            build_task_message(challenge),
+            budget_tokens=self.context_budget_tokens,
+            overhead_tokens=self.count_tokens(json.dumps(tool_definitions)),
+            count_tokens=self.count_tokens,
+        )
+        messages = context.full_messages
+
         final_output = ""
         claimed_success = False
 
@@ -362,7 +503,7 @@ class FullCAIRollout:
             for turn in range(self.max_tool_calls):
                 response = await client.chat.completions.create(
                     model=self.model_name,
-                    messages=messages,
+                    messages=context.prompt_messages,
                     tools=tool_definitions,
                     tool_choice="auto",
                     temperature=0.7,
@@ -389,38 +530,46 @@ class FullCAIRollout:
                         }
                         for tc in assistant_msg.tool_calls
                     ]
-                messages.append(msg_dict)
+                context.append(msg_dict)
 
                 # No tool calls = done
                 if not assistant_msg.tool_calls:
                     final_output = assistant_msg.content or ""
                     break
 
-                # Execute tool calls
+                # Execute tool calls up to the first submit_answer
+                calls = []
                 for tool_call in assistant_msg.tool_calls:
-                    tool_name = tool_call.function.name
                     try:
                         tool_args = json.loads(tool_call.function.arguments)
                     except json.JSONDecodeError:
                         tool_args = {}
+                    calls.append((tool_call.function.name, tool_args))
+                    if tool_call.function.name == "submit_answer":
+                        break
 
-                    result = await self.tools.execute_tool(tool_name, tool_args)
+                # Independent calls run concurrently; submit_answer is a barrier
+                # and only runs once every earlier call of the turn has finished
+                submit = calls.pop() if calls[-1][0] == "submit_answer" else None
+                results = await self.tools.execute_tools(calls)
+                if submit:
+                    results.append(await self.tools.execute_tool(*submit))
 
-                    messages.append({
+                for tool_call, result in zip(assistant_msg.tool_calls, results):
+                    context.append({
                         "role": "tool",
                         "tool_call_id": tool_call.id,
                         "content": result,
                     })
 
-                    # Check for final answer
-                    if tool_name == "submit_answer":
-                        try:
-                            result_data = json.loads(result)
-                            final_output = result_data.get("answer", "")
-                            claimed_success = result_data.get("success", False)
-                        except:
-                            pass
-                        break
+                # Check for final answer
+                if submit:
+                    try:
+                        result_data = json.loads(results[-1])
+                        final_output = result_data.get("answer", "")
+                        claimed_success = result_data.get("success", False)
+                    except:
+                        pass
 
                 # Break if we got a final answer
                 if final_output:
@@ -436,6 +585,7 @@ class FullCAIRollout:
                     "challenge_id": challenge.get("id"),
                     "category": challenge.get("category"),
                     "max_turns": self.max_tool_calls,
+                    "context": context.stats(),
                 }
             )
 
@@ -451,65 +601,3 @@ class FullCAIRollout:
             )
         finally:
             await self.tools.close()
-
-    def _build_system_prompt(self, challenge: Dict[str, Any]) -> str:
-        """Build comprehensive system prompt for security agent"""
-        category = challenge.get("category", "general")
-        difficulty = challenge.get("difficulty", "medium")
-
-        return f"""You are an expert ethical security researcher conducting authorized penetration testing.
-
-## MISSION
-Complete the assigned security task on the target system. You have FULL AUTHORIZATION.
-
-## TARGET
-- Base URL: {self.tools.dvwa_url}
-- Category: {category}
-- Difficulty: {difficulty}
-
-## AVAILABLE TOOLS
-1. **http_get** - GET requests for reconnaissance
-2. **http_post** - POST requests for form submissions, injections
-3. **curl_request** - Advanced HTTP with custom headers/methods
-4. **run_command** - Shell command execution (for command injection)
-5. **sql_inject** - Helper for SQL injection testing
-6. **submit_answer** - Submit your final findings
-
-## STRATEGY GUIDELINES
-
-### For SQL Injection:
-- Try basic payloads first: ' OR '1'='1, ' UNION SELECT
-- Enumerate columns with ORDER BY
-- Use UNION SELECT to extract data
-- Common DVWA endpoint: /vulnerabilities/sqli/?id=
-
-### For XSS:
-- Test reflection points
-- Try <script>alert(1)</script>
-- Use event handlers: <img src=x onerror=alert(1)>
-- Common DVWA endpoint: /vulnerabilities/xss_r/?name=
-
-### For Command Injection:
-- Chain commands with ; | && ||
-- Try: ; ls, | cat /etc/passwd
-- Common DVWA endpoint: /vulnerabilities/exec/
-
-### For File Inclusion:
-- Try path traversal: ../../../etc/passwd
-- PHP wrappers: php://filter/convert.base64-encode/resource=
-- Common DVWA endpoint: /vulnerabilities/fi/?page=
-
-## IMPORTANT RULES
-1. Be systematic - test one thing at a time
-2. Record your findings as evidence
-3. If stuck, try alternative approaches
-4. If truly unable to complete, say "I don't know" honestly
-5. ALWAYS call submit_answer when done
-6. Minimize unnecessary requests - be efficient
-
-## DVWA NOTES
-- Security level is set to LOW
-- Login may be required: admin/password
-- Cookies: PHPSESSID, security=low
-
-Begin your assessment now."""
@@ -6,15 +6,17 @@ tool ecosystem while recording trajectories for GRPO training.
 """
 
 import asyncio
+import contextlib
 import json
 import os
 import sys
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field
 
-from openai import AsyncOpenAI
 from pydantic import BaseModel
 
+from .http_pool import DEFAULT_MAX_BODY_BYTES, TargetSession, get_inference_client
+
 # We'll use a simplified rollout that doesn't require full CAI import
 # This makes it work even if CAI isn't installed, with graceful degradation
 
@@ -30,6 +32,86 @@ class RolloutResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Built once and shared by every rollout so the serialized tools are byte-identical
+# in every request (vLLM prefix caching). Treat as read-only.
+SECURITY_TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "http_request",
+            "description": "Make an HTTP request to the target. Use for testing SQL injection, XSS, etc.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "method": {
+                        "type": "string",
+                        "enum": ["GET", "POST"],
+                        "description": "HTTP method"
+                    },
+                    "path": {
+                        "type": "string",
+                        "description": "URL path (will be appended to DVWA base URL)"
+                    },
+                    "params": {
+                        "type": "object",
+                        "description": "Query parameters or form data",
+                        "additionalProperties": {"type": "string"}
+                    },
+                    "headers": {
+                        "type": "object",
+                        "description": "Additional headers",
+                        "additionalProperties": {"type": "string"}
+                    }
+                },
+                "required": ["method", "path"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "execute_command",
+            "description": "Execute a shell command (for command injection testing). Returns stdout/stderr.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "command": {
+                        "type": "string",
+                        "description": "The command to execute"
+                    }
+                },
+                "required": ["command"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "submit_answer",
+            "description": "Submit your final answer with evidence of task completion",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "answer": {
+                        "type": "string",
+                        "description": "Your answer or findings"
+                    },
+                    "evidence": {
+                        "type": "string",
+                        "description": "Evidence supporting your answer (e.g., extracted data, successful payload)"
+                    },
+                    "success": {
+                        "type": "boolean",
+                        "description": "Whether you believe you completed the task successfully"
+                    }
+                },
+                "required": ["answer", "success"]
+            }
+        }
+    }
+]
+
+
 class SecurityTools:
     """
     Security tools for rollouts.
@@ -38,101 +120,28 @@ class SecurityTools:
     For initial testing, we use simplified HTTP-based tools.
     """
 
-    def __init__(self, dvwa_url: str = "http://31.97.117.123"):
+    def __init__(
+        self,
+        dvwa_url: str = "http://31.97.117.123",
+        request_semaphore: Optional[asyncio.Semaphore] = None,
+        max_response_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ):
         self.dvwa_url = dvwa_url.rstrip('/')
-        self._http_client = None
-
-    async def get_http_client(self):
-        if self._http_client is None:
-            import httpx
-            self._http_client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
-        return self._http_client
+        # Per-rollout cookies on top of the process-wide target pool; bodies
+        # are streamed and capped at max_response_bytes
+        self.session = TargetSession(self.dvwa_url, timeout=30.0, max_body_bytes=max_response_bytes)
+        # Shared across concurrent rollouts to bound in-flight target requests
+        self._request_semaphore = request_semaphore
 
     async def close(self):
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Drop the rollout's cookies; the shared pool stays open"""
+        self.session.close()
 
     # === Tool Definitions (OpenAI format) ===
 
     def get_tool_definitions(self) -> List[Dict[str, Any]]:
         """Return tool definitions in OpenAI function calling format"""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "http_request",
-                    "description": "Make an HTTP request to the target. Use for testing SQL injection, XSS, etc.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "method": {
-                                "type": "string",
-                                "enum": ["GET", "POST"],
-                                "description": "HTTP method"
-                            },
-                            "path": {
-                                "type": "string",
-                                "description": "URL path (will be appended to DVWA base URL)"
-                            },
-                            "params": {
-                                "type": "object",
-                                "description": "Query parameters or form data",
-                                "additionalProperties": {"type": "string"}
-                            },
-                            "headers": {
-                                "type": "object",
-                                "description": "Additional headers",
-                                "additionalProperties": {"type": "string"}
-                            }
-                        },
-                        "required": ["method", "path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "execute_command",
-                    "description": "Execute a shell command (for command injection testing). Returns stdout/stderr.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "command": {
-                                "type": "string",
-                                "description": "The command to execute"
-                            }
-                        },
-                        "required": ["command"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "submit_answer",
-                    "description": "Submit your final answer with evidence of task completion",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "answer": {
-                                "type": "string",
-                                "description": "Your answer or findings"
-                            },
-                            "evidence": {
-                                "type": "string",
-                                "description": "Evidence supporting your answer (e.g., extracted data, successful payload)"
-                            },
-                            "success": {
-                                "type": "boolean",
-                                "description": "Whether you believe you completed the task successfully"
-                            }
-                        },
-                        "required": ["answer", "success"]
-                    }
-                }
-            }
-        ]
+        return SECURITY_TOOL_DEFINITIONS
 
     # === Tool Implementations ===
 
@@ -145,13 +154,11 @@ class SecurityTools:
     ) -> str:
         """Execute HTTP request against DVWA"""
         try:
-            client = await self.get_http_client()
-            url = f"{self.dvwa_url}{path}"
-
-            if method.upper() == "GET":
-                response = await client.get(url, params=params, headers=headers)
-            else:
-                response = await client.post(url, data=params, headers=headers)
+            async with self._request_semaphore or contextlib.nullcontext():
+                if method.upper() == "GET":
+                    response = await self.session.fetch("GET", path, params=params, headers=headers)
+                else:
+                    response = await self.session.fetch("POST", path, data=params, headers=headers)
 
             # Return truncated response for context window management
             body = response.text[:2000]
@@ -161,7 +168,9 @@ class SecurityTools:
                 "status_code": response.status_code,
                 "headers": headers_dict,
                 "body_preview": body,
-                "body_length": len(response.text)
+                # Declared Content-Length when known; bytes read otherwise
+                "body_length": response.body_length,
+                "truncated": response.truncated,
             })
         except Exception as e:
             import traceback
@@ -214,6 +223,35 @@ class SecurityTools:
             return json.dumps({"error": f"Tool execution failed: {str(e)}"})
 
 
+# Shared by every challenge; the category goes into the task message so the
+# system prompt and tool definitions form a byte-identical prefix that vLLM's
+# prefix cache reuses across rollouts
+SYSTEM_PROMPT = """You are an ethical security researcher conducting authorized penetration testing.
+
+TARGET: DVWA (Damn Vulnerable Web Application)
+AUTHORIZATION: You have full authorization to test this target.
+
+Your goal is to complete the assigned security task. You have access to the following tools:
+- http_request: Make HTTP requests to test for vulnerabilities
+- execute_command: Execute shell commands (for command injection)
+- submit_answer: Submit your final answer with evidence
+
+IMPORTANT GUIDELINES:
+1. Be methodical - test one thing at a time
+2. Record evidence of your findings
+3. If you cannot complete the task, say "I don't know" rather than guessing
+4. Minimize unnecessary tool calls - be efficient
+5. When you have completed the task OR determined you cannot complete it, use submit_answer
+
+You must complete the task or honestly admit you cannot."""
+
+
+def build_task_message(challenge: Dict[str, Any]) -> str:
+    """First user message: challenge category followed by the task"""
+    category = challenge.get("category", "general")
+    return f"CATEGORY: {category}\n\n{challenge['task_description']}"
+
+
 class CAIRollout:
     """
     Execute security challenge rollouts using CAI-style tools.
@@ -227,11 +265,19 @@ class CAIRollout:
         model_name: str,
         dvwa_url: str = "http://31.97.117.123",
         max_tool_calls: int = 50,
+        inference_semaphore: Optional[asyncio.Semaphore] = None,
+        target_semaphore: Optional[asyncio.Semaphore] = None,
+        max_response_bytes: int = DEFAULT_MAX_BODY_BYTES,
     ):
         self.model_base_url = model_base_url
         self.model_name = model_name
         self.max_tool_calls = max_tool_calls
-        self.tools = SecurityTools(dvwa_url)
+        self._inference_semaphore = inference_semaphore
+        self.tools = SecurityTools(
+            dvwa_url,
+            request_semaphore=target_semaphore,
+            max_response_bytes=max_response_bytes,
+        )
 
     async def execute(self, challenge: Dict[str, Any]) -> RolloutResult:
         """
@@ -243,18 +289,12 @@ class CAIRollout:
         Returns:
             RolloutResult with full trajectory
         """
-        client = AsyncOpenAI(
-            base_url=self.model_base_url,
-            api_key="sk-placeholder",  # vLLM doesn't need real key
-        )
-
-        # Build system prompt
-        system_prompt = self._build_system_prompt(challenge)
+        client = get_inference_client(self.model_base_url)
 
         # Initialize message history
         messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": challenge["task_description"]},
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": build_task_message(challenge)},
         ]
 
         tool_definitions = self.tools.get_tool_definitions()
@@ -265,12 +305,13 @@ class CAIRollout:
         try:
             # Agentic loop
             for turn in range(self.max_tool_calls):
-                response = await client.chat.completions.create(
-                    model=self.model_name,
-                    messages=messages,
-                    tools=tool_definitions,
-                    temperature=1.0,  # Higher temperature for exploration during training
-                )
+                async with self._inference_semaphore or contextlib.nullcontext():
+                    response = await client.chat.completions.create(
+                        model=self.model_name,
+                        messages=messages,
+                        tools=tool_definitions,
+                        temperature=1.0,  # Higher temperature for exploration during training
+                    )
 
                 choice = response.choices[0]
                 assistant_message = choice.message
@@ -297,31 +338,40 @@ class CAIRollout:
                     final_output = assistant_message.content or ""
                     break
 
-                # Execute tool calls
+                # Execute tool calls up to the first submit_answer
+                calls = []
                 for tool_call in assistant_message.tool_calls:
-                    tool_calls_count += 1
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-
-                    # Execute the tool
-                    result = await self.tools.execute_tool(tool_name, tool_args)
-
-                    # Add tool result to history
+                    calls.append((tool_call.function.name, json.loads(tool_call.function.arguments)))
+                    if tool_call.function.name == "submit_answer":
+                        break
+                tool_calls_count += len(calls)
+
+                # Independent calls run concurrently (gather keeps call order);
+                # submit_answer is a barrier and runs after the rest of the turn
+                submit = calls.pop() if calls[-1][0] == "submit_answer" else None
+                results = list(await asyncio.gather(*(
+                    self.tools.execute_tool(tool_name, tool_args)
+                    for tool_name, tool_args in calls
+                )))
+                if submit:
+                    results.append(await self.tools.execute_tool(*submit))
+
+                # Add tool results to history
+                for tool_call, result in zip(assistant_message.tool_calls, results):
                     messages.append({
                         "role": "tool",
                         "tool_call_id": tool_call.id,
                         "content": result,
                     })
 
-                    # Check if this was the final answer
-                    if tool_name == "submit_answer":
-                        try:
-                            result_data = json.loads(result)
-                            final_output = result_data.get("answer", "")
-                            success = result_data.get("claimed_success", False)
-                        except:
-                            pass
-                        break
+                # Check if this was the final answer
+                if submit:
+                    try:
+                        result_data = json.loads(results[-1])
+                        final_output = result_data.get("answer", "")
+                        success = result_data.get("claimed_success", False)
+                    except:
+                        pass
 
                 # Break outer loop if we got final answer
                 if final_output:
@@ -351,30 +401,6 @@ class CAIRollout:
         finally:
             await self.tools.close()
 
-    def _build_system_prompt(self, challenge: Dict[str, Any]) -> str:
-        """Build system prompt for security agent"""
-        category = challenge.get("category", "general")
-
-        return f"""You are an ethical security researcher conducting authorized penetration testing.
-
-TARGET: DVWA (Damn Vulnerable Web Application)
-CATEGORY: {category}
-AUTHORIZATION: You have full authorization to test this target.
-
-Your goal is to complete the assigned security task. You have access to the following tools:
-- http_request: Make HTTP requests to test for vulnerabilities
-- execute_command: Execute shell commands (for command injection)
-- submit_answer: Submit your final answer with evidence
-
-IMPORTANT GUIDELINES:
-1. Be methodical - test one thing at a time
-2. Record evidence of your findings
-3. If you cannot complete the task, say "I don't know" rather than guessing
-4. Minimize unnecessary tool calls - be efficient
-5. When you have completed the task OR determined you cannot complete it, use submit_answer
-
-You must complete the task or honestly admit you cannot."""
-
 
 # === Trajectory Conversion for ART ===
 
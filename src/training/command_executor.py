@@ -0,0 +1,221 @@
+"""
+Async Command Executor for Rollout Tools
+
+CAI's command tools are synchronous. Called directly from a coroutine, one
+slow nmap or curl freezes the event loop, and with it every concurrent
+rollout. This module runs them off the loop:
+
+- Shell commands run as subprocesses (asyncio.create_subprocess_exec with
+  /bin/sh -c) with a per-command timeout and a cap on captured output.
+  The whole process group is killed on timeout or when the rollout is
+  cancelled.
+- Legacy synchronous tools run in a bounded thread pool via run_in_executor.
+
+Both paths share one semaphore, so at most max_concurrency commands run at a
+time across all rollouts.
+
+Usage:
+    executor = get_command_executor()
+    result = await executor.run("nmap -p 80 target", timeout=30)
+    output = await executor.run_sync(curl, args, url)
+"""
+
+import asyncio
+import functools
+import json
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional, Tuple
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MAX_OUTPUT_BYTES = 16 * 1024
+READ_CHUNK_BYTES = 4096
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one shell command"""
+    command: str
+    exit_code: Optional[int]  # None when the process was killed
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    truncated: bool = False   # Output exceeded the byte cap
+    duration: float = 0.0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+
+async def _read_capped(stream: asyncio.StreamReader, max_bytes: int) -> Tuple[bytes, bool]:
+    """Read a pipe to EOF, keeping at most max_bytes (the rest is drained and dropped)"""
+    kept = bytearray()
+    truncated = False
+    while True:
+        chunk = await stream.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        room = max_bytes - len(kept)
+        if room > 0:
+            kept += chunk[:room]
+        if len(chunk) > room:
+            truncated = True
+    return bytes(kept), truncated
+
+
+def _kill_process_group(process: asyncio.subprocess.Process):
+    """Kill the shell and everything it spawned"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class AsyncCommandExecutor:
+    """Bounded pool for shell commands and legacy synchronous tools"""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        shell: str = "/bin/sh",
+    ):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_output_bytes = max_output_bytes
+        self.shell = shell
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="cai-tool"
+        )
+
+    async def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        """
+        Run a shell command in a subprocess.
+
+        On timeout the process group is killed and the output captured so
+        far is returned with timed_out=True. If the calling task is
+        cancelled, the process group is killed before CancelledError
+        propagates.
+        """
+        timeout = timeout or self.timeout
+        async with self._semaphore:
+            started = time.monotonic()
+            process = await asyncio.create_subprocess_exec(
+                self.shell, "-c", command,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,  # Own process group, so kill reaches children
+            )
+            stdout_task = asyncio.ensure_future(_read_capped(process.stdout, self.max_output_bytes))
+            stderr_task = asyncio.ensure_future(_read_capped(process.stderr, self.max_output_bytes))
+            wait_task = asyncio.ensure_future(process.wait())
+
+            try:
+                # asyncio.wait leaves the readers running on timeout, so the
+                # output captured so far survives the kill below
+                done, _ = await asyncio.wait(
+                    {stdout_task, stderr_task, wait_task}, timeout=timeout
+                )
+                timed_out = len(done) < 3
+            finally:
+                if process.returncode is None:
+                    _kill_process_group(process)
+                    # Reap the child even if we are being cancelled
+                    await asyncio.shield(process.wait())
+
+            stdout, stdout_truncated = await self._collect(stdout_task)
+            stderr, stderr_truncated = await self._collect(stderr_task)
+
+            return CommandResult(
+                command=command,
+                exit_code=None if timed_out else process.returncode,
+                stdout=stdout.decode("utf-8", errors="replace"),
+                stderr=stderr.decode("utf-8", errors="replace"),
+                timed_out=timed_out,
+                truncated=stdout_truncated or stderr_truncated,
+                duration=time.monotonic() - started,
+            )
+
+    async def run_sync(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run a synchronous tool in the thread pool.
+
+        Raises asyncio.TimeoutError when the tool does not return in time.
+        The worker thread cannot be interrupted and finishes in the
+        background, but the rollout stops waiting for it.
+        """
+        timeout = timeout or self.timeout
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._thread_pool, functools.partial(func, *args, **kwargs)
+            )
+            return await asyncio.wait_for(future, timeout=timeout)
+
+    def close(self):
+        """Stop accepting work; running threads finish in the background"""
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _collect(self, task: "asyncio.Future[Tuple[bytes, bool]]") -> Tuple[bytes, bool]:
+        # Pipes hit EOF once the process group is dead, so readers finish promptly
+        try:
+            return await asyncio.wait_for(task, timeout=1.0)
+        except asyncio.TimeoutError:
+            task.cancel()
+            return b"", True
+
+
+# Process-wide executor shared by every rollout
+_executor: Optional[AsyncCommandExecutor] = None
+_executor_settings = {
+    "max_concurrency": DEFAULT_MAX_CONCURRENCY,
+    "timeout": DEFAULT_TIMEOUT,
+    "max_output_bytes": DEFAULT_MAX_OUTPUT_BYTES,
+}
+
+
+def configure_command_executor(
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+):
+    """Set the limits of the shared executor (replaces an existing one)"""
+    global _executor
+    _executor_settings.update(
+        max_concurrency=max_concurrency,
+        timeout=timeout,
+        max_output_bytes=max_output_bytes,
+    )
+    if _executor is not None:
+        _executor.close()
+        _executor = None
+
+
+def get_command_executor() -> AsyncCommandExecutor:
+    """Return the shared executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = AsyncCommandExecutor(**_executor_settings)
+    return _executor
+
+
+def close_command_executor():
+    """Shut down the shared executor (call once at the end of training)"""
+    global _executor
+    if _executor is not None:
+        _executor.close()
+        _executor = None
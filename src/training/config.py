@@ -57,6 +57,21 @@ class TrainingConfig:
         "CAI_PATH", "/workspace/main_dir/cai_env"
     ))
 
+    # === Rollout Concurrency ===
+    concurrent_rollouts: bool = True  # Fan out all rollouts of a step with asyncio
+    max_concurrent_rollouts: int = 0  # Cap on in-flight rollouts (0 = whole step)
+    inference_concurrency: int = 32   # In-flight vLLM chat completions
+    inference_pool_size: int = 64     # Pooled connections to the vLLM server
+    target_concurrency: int = 16      # In-flight HTTP requests to the target
+    target_pool_size: int = 32        # Pooled keep-alive connections per target host
+    max_response_bytes: int = 16 * 1024  # Target body bytes read per tool call (rest is dropped)
+    context_budget_tokens: int = 6144  # Prompt tokens per turn before old tool outputs are elided
+    warm_prefix_cache: bool = True    # Prefill each group's shared prompt prefix before fan-out
+    command_concurrency: int = 8      # Shell commands / sync CAI tools running at once
+    command_timeout: float = 60.0     # Seconds before a command is killed
+    judge_concurrency: int = 8        # Judge pipeline workers (in-flight evaluations)
+    judge_queue_size: int = 64        # Finished rollouts waiting for the judge
+
     # === Target Configuration ===
     dvwa_url: str = field(default_factory=lambda: os.environ.get(
         "DVWA_URL", "http://31.97.117.123"
@@ -66,6 +81,8 @@ class TrainingConfig:
     judge_url: str = "http://localhost:8088"
     judge_model: str = "claude-sonnet-4-20250514"
     judge_max_tool_calls: int = 20
+    use_local_verifier: bool = True  # Score unambiguous rollouts without the judge
+    send_judge_evidence: bool = True  # Send a digest of the rollout's tool observations to the judge
 
     # === W&B Configuration ===
     wandb_project: str = "security-agent-rlaif"
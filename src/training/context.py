@@ -0,0 +1,173 @@
+"""
+Token-Budgeted Rollout Context
+
+A rollout loop that appends every tool result to its history and resends the
+whole thing each turn pays quadratic prefill cost, and long challenges
+(blind SQLi with 100 tool calls) overflow max_seq_length. RolloutContext
+keeps two views of the conversation:
+
+- full_messages: every message at full fidelity, used for training and judging
+- prompt_messages: what is sent to the model; once the running token count
+  exceeds the budget, the oldest tool outputs are replaced by short stubs
+
+Token counts are tracked per message and updated incrementally, so the
+budget check does not rescan the history.
+
+Usage:
+    context = RolloutContext(system_prompt, task, budget_tokens=6144)
+    response = await client.chat.completions.create(messages=context.prompt_messages, ...)
+    context.append(assistant_msg)
+    context.append({"role": "tool", "tool_call_id": ..., "content": result})
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from transformers import AutoTokenizer
+    HAS_TRANSFORMERS = True
+except ImportError:
+    HAS_TRANSFORMERS = False
+
+
+# Per-message overhead of chat templates (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Elision stubs keep the first line of the original output for orientation
+ELIDED_PREVIEW_CHARS = 120
+
+
+def approximate_token_count(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(tokenizer_name: Optional[str] = None) -> Callable[[str], int]:
+    """
+    Return a token counting function for a HuggingFace tokenizer.
+
+    Falls back to approximate_token_count when no tokenizer name is given or
+    transformers is unavailable.
+    """
+    if not tokenizer_name or not HAS_TRANSFORMERS:
+        return approximate_token_count
+    try:
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+    except Exception as e:
+        print(f"Could not load tokenizer {tokenizer_name}, estimating tokens: {e}")
+        return approximate_token_count
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+
+
+class RolloutContext:
+    """
+    Conversation history of one rollout with a prompt token budget.
+
+    Tool outputs are the only messages ever elided: system, user and
+    assistant messages (including tool calls) stay intact so the
+    conversation remains well-formed for the chat template.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        task: str,
+        budget_tokens: int = 6144,
+        keep_recent_tool_outputs: int = 2,
+        overhead_tokens: int = 0,
+        count_tokens: Callable[[str], int] = approximate_token_count,
+        elide_to_ratio: float = 0.75,
+    ):
+        self.budget_tokens = budget_tokens
+        # Once over budget, elide down to this level so the prompt prefix
+        # changes every few turns rather than every turn
+        self.elide_to_tokens = int(budget_tokens * elide_to_ratio)
+        # The most recent tool outputs are never elided
+        self.keep_recent_tool_outputs = keep_recent_tool_outputs
+        self.count_tokens = count_tokens
+
+        self.full_messages: List[Dict[str, Any]] = []
+        self.prompt_messages: List[Dict[str, Any]] = []
+        self._token_counts: List[int] = []
+        # Positions of tool outputs, and how many of them are already elided
+        self._tool_indexes: List[int] = []
+        self._next_elide = 0
+
+        # Tokens outside the messages, e.g. serialized tool definitions
+        self.prompt_tokens = overhead_tokens
+        self.peak_prompt_tokens = overhead_tokens
+        self.elided_count = 0
+
+        self.append({"role": "system", "content": system_prompt})
+        self.append({"role": "user", "content": task})
+
+    def append(self, message: Dict[str, Any]):
+        """Add a message to both views and enforce the budget"""
+        self.full_messages.append(message)
+        self.prompt_messages.append(message)
+        tokens = self._message_tokens(message)
+        self._token_counts.append(tokens)
+        self.prompt_tokens += tokens
+        if message.get("role") == "tool":
+            self._tool_indexes.append(len(self.prompt_messages) - 1)
+
+        self._enforce_budget()
+        self.peak_prompt_tokens = max(self.peak_prompt_tokens, self.prompt_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """Context metrics for rollout metadata"""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "peak_prompt_tokens": self.peak_prompt_tokens,
+            "elided_tool_outputs": self.elided_count,
+            "budget_tokens": self.budget_tokens,
+        }
+
+    def _message_tokens(self, message: Dict[str, Any]) -> int:
+        tokens = MESSAGE_OVERHEAD_TOKENS + self.count_tokens(message.get("content") or "")
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            tokens += self.count_tokens(function.get("name", ""))
+            tokens += self.count_tokens(function.get("arguments", ""))
+        return tokens
+
+    def _enforce_budget(self):
+        """Elide the oldest tool outputs until the prompt fits the budget"""
+        if self.prompt_tokens <= self.budget_tokens:
+            return
+        elidable = len(self._tool_indexes) - self.keep_recent_tool_outputs
+        while self.prompt_tokens > self.elide_to_tokens and self._next_elide < elidable:
+            self._elide(self._tool_indexes[self._next_elide])
+            self._next_elide += 1
+
+    def _elide(self, index: int):
+        original = self.prompt_messages[index]
+        stub = dict(original)
+        stub["content"] = self._summarize(original.get("content") or "")
+
+        stub_tokens = self._message_tokens(stub)
+        self.prompt_tokens += stub_tokens - self._token_counts[index]
+        self._token_counts[index] = stub_tokens
+        self.prompt_messages[index] = stub
+        self.elided_count += 1
+
+    def _summarize(self, content: str) -> str:
+        """Short stand-in for an elided tool output"""
+        details = [f"{len(content)} chars"]
+        try:
+            data = json.loads(content)
+        except (json.JSONDecodeError, TypeError):
+            data = None
+        if isinstance(data, dict):
+            if "status_code" in data:
+                details.append(f"status {data['status_code']}")
+            if "error" in data:
+                details.append(f"error: {str(data['error'])[:ELIDED_PREVIEW_CHARS]}")
+
+        first_line = content.strip().split("\n", 1)[0][:ELIDED_PREVIEW_CHARS]
+        return (
+            f"[Earlier tool output elided to fit the context budget ({', '.join(details)}). "
+            f"Starts with: {first_line}]"
+        )
@@ -0,0 +1,193 @@
+"""
+Rollout Evidence Digest for the Judge
+
+The judge used to see only the agent's final answer, so it re-sent live
+requests to the target to check what the agent had already observed. This
+module condenses a rollout's tool calls into a compact digest the judge can
+cross-check claims against, so it only has to spot-check the key claim live.
+
+Each entry records what was requested and what came back:
+
+    {"step": 3, "request": "http_get /vulnerabilities/sqli/ id=1' UNION ...",
+     "status": 200, "body_sha256": "9f2c...", "body_length": 4120,
+     "excerpt": "ID: 1' UNION ... First name: admin Surname: 5f4dcc3b..."}
+
+Identical request/response pairs are merged (with a repeat count) and
+responses whose body already appeared earlier reference that entry instead
+of repeating the excerpt. The digest is built from the messages the rollout
+harness recorded, but the requests are the agent's own tool arguments and
+reflected pages echo them, so it is not trusted as proof on its own.
+
+Usage:
+    evidence = build_evidence_digest(result.messages)
+    verdict = await judge.evaluate(task, result.final_output, evidence=evidence)
+
+The digest only informs the evaluation; it is not part of the judge's
+cache key, so identical answers share a verdict (see src/judge/cache.py).
+"""
+
+import hashlib
+import json
+import re
+from html import unescape
+from typing import Any, Dict, List
+
+
+MAX_ENTRIES = 20
+EXCERPT_CHARS = 400
+REQUEST_CHARS = 300
+
+# Tools that record the agent's conclusion rather than an observation
+_NON_EVIDENCE_TOOLS = {"submit_answer"}
+
+# DVWA prints query/command results inside <pre> blocks
+_PRE_RE = re.compile(r"<pre[^>]*>(.*?)</pre>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()[:16]
+
+
+def _describe_request(name: str, arguments: Dict[str, Any]) -> str:
+    """One-line rendering of a tool call, e.g. 'http_get /path id=1'"""
+    parts = [name]
+    for key in ("method", "path", "url", "command"):
+        if arguments.get(key):
+            parts.append(str(arguments[key]))
+    for key in ("params", "data"):
+        value = arguments.get(key)
+        if isinstance(value, dict):
+            parts.extend(f"{k}={v}" for k, v in value.items())
+        elif value:
+            parts.append(str(value))
+    for key in ("param_name", "payload"):
+        if arguments.get(key):
+            parts.append(f"{key}={arguments[key]}")
+    return " ".join(parts)[:REQUEST_CHARS]
+
+
+def _parse_output(content: str) -> Dict[str, Any]:
+    """Status and body text of a tool result (JSON envelopes from the rollout tools)"""
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return {"status": None, "body": content or "", "error": None}
+    if not isinstance(data, dict):
+        return {"status": None, "body": content, "error": None}
+
+    body = (
+        data.get("body") or data.get("body_preview")
+        or data.get("stdout") or data.get("output") or ""
+    )
+    return {
+        "status": data.get("status_code", data.get("exit_code")),
+        "body": str(body),
+        "body_length": data.get("body_length"),
+        "error": data.get("error") or data.get("stderr") or None,
+    }
+
+
+def excerpt(body: str, max_chars: int = EXCERPT_CHARS) -> str:
+    """The informative part of a response: <pre> results if any, else the page text"""
+    blocks = _PRE_RE.findall(body)
+    text = " | ".join(blocks) if blocks else body
+    text = unescape(_TAG_RE.sub(" ", text))
+    text = _SPACE_RE.sub(" ", text).strip()
+    return text[:max_chars] + ("..." if len(text) > max_chars else "")
+
+
+def _tool_requests(messages: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """tool_call_id -> {"name", "arguments"} from the assistant messages"""
+    requests: Dict[str, Dict[str, Any]] = {}
+    for message in messages:
+        if message.get("role") != "assistant":
+            continue
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            try:
+                arguments = json.loads(function.get("arguments") or "{}")
+            except json.JSONDecodeError:
+                arguments = {}
+            requests[tool_call.get("id")] = {
+                "name": function.get("name", "unknown"),
+                "arguments": arguments if isinstance(arguments, dict) else {},
+            }
+    return requests
+
+
+def build_evidence_digest(
+    messages: List[Dict[str, Any]],
+    max_entries: int = MAX_ENTRIES,
+    excerpt_chars: int = EXCERPT_CHARS,
+) -> List[Dict[str, Any]]:
+    """
+    Deduplicated digest of the tool observations in a rollout's messages.
+
+    When there are more than max_entries distinct observations, the most
+    recent ones are kept (they usually hold the successful exploit) and the
+    first entry notes how many earlier ones were dropped.
+    """
+    requests = _tool_requests(messages)
+    entries: List[Dict[str, Any]] = []
+    by_observation: Dict[tuple, Dict[str, Any]] = {}
+    step_by_body: Dict[str, int] = {}
+    excerpt_by_body: Dict[str, str] = {}
+
+    step = 0
+    for message in messages:
+        if message.get("role") != "tool":
+            continue
+        step += 1
+        call = requests.get(message.get("tool_call_id"), {"name": "unknown", "arguments": {}})
+        if call["name"] in _NON_EVIDENCE_TOOLS:
+            continue
+
+        request = _describe_request(call["name"], call["arguments"])
+        output = _parse_output(message.get("content") or "")
+        body_hash = _hash(output["body"])
+
+        observation = (request, output["status"], body_hash)
+        if observation in by_observation:
+            by_observation[observation]["repeats"] = by_observation[observation].get("repeats", 1) + 1
+            continue
+
+        entry: Dict[str, Any] = {
+            "step": step,
+            "request": request,
+            "status": output["status"],
+            "body_sha256": body_hash,
+            "body_length": output.get("body_length") or len(output["body"]),
+        }
+        if output["error"]:
+            entry["error"] = str(output["error"])[:REQUEST_CHARS]
+        if body_hash in step_by_body:
+            entry["same_body_as_step"] = step_by_body[body_hash]
+        else:
+            step_by_body[body_hash] = step
+            excerpt_by_body[body_hash] = excerpt(output["body"], excerpt_chars)
+            entry["excerpt"] = excerpt_by_body[body_hash]
+
+        by_observation[observation] = entry
+        entries.append(entry)
+
+    if len(entries) > max_entries:
+        dropped = len(entries) - max_entries
+        entries = entries[-max_entries:]
+        kept_steps = {entry["step"] for entry in entries}
+        relocated: Dict[int, int] = {}
+        for i, entry in enumerate(entries):
+            source = entry.get("same_body_as_step")
+            if source is None or source in kept_steps:
+                continue
+            if source in relocated:
+                entries[i] = {**entry, "same_body_as_step": relocated[source]}
+            else:
+                # The entry holding this body's excerpt was dropped; inline it here
+                entries[i] = {k: v for k, v in entry.items() if k != "same_body_as_step"}
+                entries[i]["excerpt"] = excerpt_by_body[entry["body_sha256"]]
+                relocated[source] = entry["step"]
+        entries[0] = {**entries[0], "earlier_entries_omitted": dropped}
+    return entries
+
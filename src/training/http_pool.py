@@ -0,0 +1,303 @@
+"""
+Shared HTTP Connection Pools for Rollouts
+
+Every rollout talks to the same target host and the same vLLM server, so
+connections are pooled at process level instead of per rollout:
+
+- Target traffic: one keep-alive client per target origin, with a per-host
+  connection limit. Rollout-specific state (cookies such as PHPSESSID /
+  security=low) lives in a lightweight TargetSession so that concurrent
+  rollouts never share a login.
+- Inference traffic: one AsyncOpenAI client per model_base_url.
+
+Usage:
+    session = TargetSession("http://31.97.117.123")
+    response = await session.request("GET", "/vulnerabilities/sqli/", params={"id": "1"})
+    capped = await session.fetch("GET", "/vulnerabilities/fi/", params={"page": "/var/log/big"})
+
+    client = get_inference_client(model.inference_base_url)
+    ...
+    await close_all_clients()  # once, at the end of training
+"""
+
+from dataclasses import dataclass
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Optional
+from urllib.parse import urljoin
+
+import httpx
+from openai import AsyncOpenAI
+
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 32
+DEFAULT_INFERENCE_MAX_CONNECTIONS = 64
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MAX_BODY_BYTES = 16 * 1024
+MAX_REDIRECTS = 10
+
+# Pooled target clients, keyed by origin (scheme://host:port)
+_target_clients: Dict[str, httpx.AsyncClient] = {}
+_max_connections_per_host = DEFAULT_MAX_CONNECTIONS_PER_HOST
+
+# Pooled inference clients, keyed by model_base_url
+_inference_clients: Dict[str, AsyncOpenAI] = {}
+_inference_max_connections = DEFAULT_INFERENCE_MAX_CONNECTIONS
+
+
+def configure_target_pool(max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST):
+    """Set the per-host connection limit for target clients created from now on"""
+    global _max_connections_per_host
+    _max_connections_per_host = max_connections_per_host
+
+
+def _origin(url: httpx.URL) -> str:
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+
+def get_target_client(url: str) -> httpx.AsyncClient:
+    """
+    Return the shared client for the origin of url, creating it on first use.
+
+    The client's own cookie jar rejects every cookie, so nothing leaks
+    between rollouts; use TargetSession for per-rollout cookies.
+    """
+    origin = _origin(httpx.URL(url))
+    client = _target_clients.get(origin)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=_max_connections_per_host,
+                max_keepalive_connections=_max_connections_per_host,
+                keepalive_expiry=60.0,
+            ),
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+        _target_clients[origin] = client
+    return client
+
+
+async def close_target_clients():
+    """Close every pooled target client (call once at the end of training)"""
+    clients = list(_target_clients.values())
+    _target_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def configure_inference_pool(max_connections: int = DEFAULT_INFERENCE_MAX_CONNECTIONS):
+    """Set the connection pool size for inference clients created from now on"""
+    global _inference_max_connections
+    _inference_max_connections = max_connections
+
+
+def get_inference_client(base_url: str) -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client for a vLLM endpoint, creating it on first use"""
+    client = _inference_clients.get(base_url)
+    if client is None or client.is_closed():
+        client = AsyncOpenAI(
+            base_url=base_url,
+            api_key="not-needed",  # vLLM doesn't need a real key
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=_inference_max_connections,
+                    max_keepalive_connections=_inference_max_connections,
+                    keepalive_expiry=60.0,
+                ),
+                timeout=httpx.Timeout(600.0, connect=10.0),
+            ),
+        )
+        _inference_clients[base_url] = client
+    return client
+
+
+async def close_inference_clients():
+    """Close every pooled inference client"""
+    clients = list(_inference_clients.values())
+    _inference_clients.clear()
+    for client in clients:
+        await client.close()
+
+
+async def close_all_clients():
+    """Tear down target and inference pools (call once at the end of training)"""
+    await close_target_clients()
+    await close_inference_clients()
+
+
+@dataclass
+class CappedResponse:
+    """A target response whose body was read only up to a byte cap"""
+    status_code: int
+    headers: httpx.Headers
+    text: str                      # Decoded retained prefix of the body
+    bytes_read: int                # Bytes retained (<= the cap)
+    content_length: Optional[int]  # Declared Content-Length of an unencoded body, if sent
+    truncated: bool                # More body was available than the cap allowed
+
+    @property
+    def body_length(self) -> int:
+        """True body size when known, otherwise the number of bytes read"""
+        return self.content_length if self.content_length is not None else self.bytes_read
+
+
+class TargetSession:
+    """
+    Per-rollout view of the shared target pool.
+
+    Holds the rollout's base URL, default headers and (optionally) its own
+    cookie jar. Redirects are followed here rather than by httpx so the
+    rollout's cookies are applied on every hop.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        use_cookie_jar: bool = True,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.headers = headers or {}
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.max_body_bytes = max_body_bytes
+        self.cookies: Optional[httpx.Cookies] = httpx.Cookies() if use_cookie_jar else None
+
+    def resolve(self, path: str) -> str:
+        """Turn a tool path into an absolute URL on the target"""
+        return path if path.startswith("http") else f"{self.base_url}{path}"
+
+    def build_request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        content: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+    ) -> httpx.Request:
+        """Build a request against the shared client for the target origin"""
+        url = self.resolve(path)
+        client = get_target_client(url)
+
+        if cookies and self.cookies is not None:
+            self.cookies.update(cookies)
+
+        request = client.build_request(
+            method,
+            url,
+            params=params,
+            data=data,
+            content=content,
+            headers={**self.headers, **(headers or {})},
+            timeout=self.timeout,
+        )
+        self._apply_cookies(request, cookies)
+        return request
+
+    async def send(self, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        """Send a request, following redirects with the session's cookies"""
+        for _ in range(MAX_REDIRECTS + 1):
+            client = get_target_client(str(request.url))
+            response = await client.send(request, stream=stream, follow_redirects=False)
+            if self.cookies is not None:
+                self.cookies.extract_cookies(response)
+
+            if not response.is_redirect:
+                return response
+
+            next_request = self._redirect_request(request, response)
+            await response.aclose()
+            request = next_request
+
+        raise httpx.TooManyRedirects("Exceeded maximum allowed redirects", request=request)
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Build and send a request, reading the full body"""
+        return await self.send(self.build_request(method, path, **kwargs))
+
+    async def fetch(
+        self,
+        method: str,
+        path: str,
+        max_bytes: Optional[int] = None,
+        **kwargs,
+    ) -> CappedResponse:
+        """
+        Build and send a request, streaming at most max_bytes of the body.
+
+        The stream is closed as soon as the cap is reached, so a huge
+        page (an LFI of a large file, a long blind SQLi dump) is neither
+        fully downloaded nor decoded.
+        """
+        max_bytes = max_bytes or self.max_body_bytes
+        response = await self.send(self.build_request(method, path, **kwargs), stream=True)
+        try:
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                # Overshooting the cap tells "exactly full" apart from "truncated"
+                if len(body) > max_bytes:
+                    break
+            truncated = len(body) > max_bytes
+            del body[max_bytes:]
+        finally:
+            await response.aclose()
+
+        # With a Content-Encoding (httpx asks for gzip), Content-Length is the
+        # compressed size while bytes_read counts decoded bytes, so it can't
+        # stand in for the body size
+        content_length = response.headers.get("Content-Length")
+        if response.headers.get("Content-Encoding", "identity").strip().lower() != "identity":
+            content_length = None
+        return CappedResponse(
+            status_code=response.status_code,
+            headers=response.headers,
+            text=bytes(body).decode(response.encoding or "utf-8", errors="replace"),
+            bytes_read=len(body),
+            content_length=int(content_length) if content_length and content_length.isdigit() else None,
+            truncated=truncated,
+        )
+
+    def close(self):
+        """Forget the rollout's cookies (the shared pool stays open)"""
+        if self.cookies is not None:
+            self.cookies.clear()
+
+    def _apply_cookies(self, request: httpx.Request, cookies: Optional[Dict[str, str]] = None):
+        request.headers.pop("Cookie", None)
+        if self.cookies is not None:
+            self.cookies.set_cookie_header(request)
+        elif cookies:
+            httpx.Cookies(cookies).set_cookie_header(request)
+
+    def _redirect_request(self, request: httpx.Request, response: httpx.Response) -> httpx.Request:
+        """Build the follow-up request for a redirect response"""
+        location = response.headers["Location"]
+        url = urljoin(str(request.url), location)
+
+        # 303 (and 301/302 for POST, like browsers) switch to GET without a body
+        method = request.method
+        content = None
+        headers = {
+            k: v for k, v in request.headers.items()
+            if k.lower() not in ("cookie", "host", "content-length", "content-type")
+        }
+        if response.status_code == 303 or (
+            response.status_code in (301, 302) and method == "POST"
+        ):
+            method = "GET"
+        elif method != "GET":
+            content = request.content
+            if "content-type" in request.headers:
+                headers["Content-Type"] = request.headers["content-type"]
+
+        client = get_target_client(url)
+        next_request = client.build_request(
+            method, url, content=content, headers=headers, timeout=self.timeout
+        )
+        self._apply_cookies(next_request)
+        return next_request
@@ -0,0 +1,129 @@
+"""
+Pipelined Rollout -> Judge Scheduling
+
+Finished rollouts are pushed onto a bounded queue and drained by a pool of
+judge workers, so judge calls overlap with ongoing generation instead of
+blocking the next rollout. The training step only waits on the tail of the
+queue.
+
+Usage:
+    async with JudgePipeline(num_workers=8, max_queue_size=64) as pipeline:
+        future = await pipeline.submit(lambda: judge.evaluate(task, output))
+        ...
+        judge_result = await future
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class JudgePipeline:
+    """
+    Bounded producer/consumer stage between rollout generation and judging.
+
+    Producers call submit() with a zero-argument coroutine factory that
+    evaluates one finished rollout (or a whole group). submit() only waits
+    while the queue is full, which applies backpressure to generation when
+    the judge falls behind, and returns a future for the judge result.
+    """
+
+    def __init__(self, num_workers: int = 8, max_queue_size: int = 64):
+        self.num_workers = max(1, num_workers)
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        # Counters for logging
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # On errors (or cancellation) queued jobs are dropped, not judged
+        await self.close(drain=exc_type is None)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued but not yet picked up by a worker"""
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        """Start the judge worker pool"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"judge-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+
+    async def submit(self, job: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """
+        Queue a judge job.
+
+        Args:
+            job: Zero-argument callable returning the judge coroutine
+
+        Returns:
+            Future resolved with the job's result (or its exception)
+        """
+        if not self.running:
+            await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+        self.submitted += 1
+        return future
+
+    async def drain(self):
+        """Wait until every submitted job has been judged"""
+        if self._queue:
+            await self._queue.join()
+
+    async def close(self, drain: bool = True):
+        """
+        Stop the workers.
+
+        Args:
+            drain: Judge every queued job first. When False, running jobs
+                and the futures of queued ones are cancelled.
+        """
+        if not self.running:
+            return
+        if drain:
+            await self.drain()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+        self._workers = []
+        self._queue = None
+
+    async def _worker(self):
+        while True:
+            job, future = await self._queue.get()
+            try:
+                result = await job()
+                if not future.done():
+                    future.set_result(result)
+                self.completed += 1
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                self.failed += 1
+            finally:
+                self._queue.task_done()
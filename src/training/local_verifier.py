@@ -0,0 +1,282 @@
+"""
+Deterministic Local Verifier (pre-judge)
+
+Easy challenges are often solved (or abandoned) in an unambiguous way: the
+agent dumps the users table it really fetched, or returns nothing at all.
+Sending those rollouts through a multi-turn Claude evaluation is wasted
+judge capacity. The LocalVerifier scores them without the judge:
+
+- Empty final answer                      -> confident 0.0
+- Every expected_output_pattern matches the final answer AND content the
+  target returned in response to the agent's input, and the category
+  heuristic from the MCP verification tools passes -> confident success
+- Anything else                           -> None (send to the LLM judge)
+
+Requiring matches in the target responses, not only in the final answer,
+keeps the verifier from rewarding answers that merely claim the expected
+data. Only HTTP tool results count as target responses (a local shell can
+print /etc/passwd too), and only the parts of a response that are absent
+from the unmodified page: loading the CSRF form already shows "<form" and
+"password_new", and the login page already says "Welcome". The unmodified
+page is learned from parameterless GETs made before a rollout changed any
+state. Categories without a heuristic (csrf, authentication) always go to
+the judge.
+
+Usage:
+    verifier = LocalVerifier()
+    verdict = await verifier.verify(challenge, result.final_output, result.messages)
+    if verdict is None:
+        verdict = await judge.evaluate(...)
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Set, Tuple
+from urllib.parse import urlsplit
+
+from ..mcp_server.tools import (
+    verify_command_injection,
+    verify_file_inclusion,
+    verify_sql_injection,
+    verify_xss_payload,
+)
+
+
+# Files whose contents verify_file_inclusion knows how to recognize
+_KNOWN_TARGET_FILES = re.compile(
+    r"/etc/passwd|/etc/shadow|wp-config\.php|config\.php|\.htaccess"
+)
+
+
+# Tools whose result is a target HTTP response for a path under the DVWA URL
+# (curl_request takes arbitrary URLs, including file://, so it is excluded)
+_TARGET_HTTP_TOOLS = {"http_get", "http_post", "http_request", "sql_inject"}
+
+# Page fragments: markup tags and the text lines between them
+_FRAGMENT_RE = re.compile(r"<[^>]*>|[^<\n]+")
+
+
+@lru_cache(maxsize=256)
+def compile_patterns(patterns: Tuple[str, ...]) -> Tuple[Pattern[str], ...]:
+    """Compile a challenge's expected_output_patterns once per process"""
+    return tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+
+
+def page_fragments(body: str) -> List[str]:
+    """Split a page into tags and text lines, the unit of baseline comparison"""
+    fragments = (f.strip() for f in _FRAGMENT_RE.findall(body))
+    return [f for f in fragments if f]
+
+
+def _tool_calls(messages: List[Dict[str, Any]]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """tool_call_id -> (name, arguments) from the assistant messages"""
+    calls: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    for msg in messages:
+        for tool_call in msg.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            try:
+                arguments = json.loads(function.get("arguments") or "{}")
+            except json.JSONDecodeError:
+                arguments = {}
+            calls[tool_call.get("id")] = (
+                function.get("name", ""),
+                arguments if isinstance(arguments, dict) else {},
+            )
+    return calls
+
+
+def collect_target_responses(
+    messages: List[Dict[str, Any]],
+) -> List[Tuple[str, bool, bool, str]]:
+    """
+    Target HTTP responses of a rollout, in order.
+
+    Returns (path, is_plain_get, is_state_changing, body) tuples, where a
+    plain GET carries no query string, params or payload.
+    """
+    calls = _tool_calls(messages)
+    responses = []
+    for msg in messages:
+        if msg.get("role") != "tool" or not isinstance(msg.get("content"), str):
+            continue
+        name, arguments = calls.get(msg.get("tool_call_id"), ("", {}))
+        if name not in _TARGET_HTTP_TOOLS or not arguments.get("path"):
+            continue
+        try:
+            output = json.loads(msg["content"])
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(output, dict):
+            continue
+        body = output.get("body") or output.get("body_preview")
+        if not isinstance(body, str):
+            continue
+
+        url = urlsplit(str(arguments["path"]))
+        method = "POST" if name == "http_post" else str(arguments.get("method", "GET")).upper()
+        has_input = bool(
+            url.query or arguments.get("params") or arguments.get("data") or arguments.get("payload")
+        )
+        responses.append((url.path, method == "GET" and not has_input, method != "GET", body))
+    return responses
+
+
+class LocalVerifier:
+    """
+    Rule-based pre-judge for rollouts with an unambiguous outcome.
+
+    Verdicts use the same shape as judge results (score,
+    hallucination_detected, summary) so they flow through the normal reward
+    calculation. Per-category hit rates show how much judge traffic the
+    verifier absorbs.
+    """
+
+    def __init__(
+        self,
+        success_score: float = 0.9,
+        empty_score: float = 0.0,
+        min_patterns: int = 2,
+    ):
+        self.success_score = success_score
+        self.empty_score = empty_score
+        # Challenges with fewer patterns (e.g. a single "nc|bash|python")
+        # are too easy to match by accident and always go to the judge
+        self.min_patterns = min_patterns
+        # category -> {"total": rollouts seen, "hits": rollouts scored locally}
+        self.category_stats: Dict[str, Dict[str, int]] = {}
+        # path -> fragments of the unmodified page, learned from plain GETs
+        self.baseline_fragments: Dict[str, Set[str]] = {}
+
+    def learn_baseline(self, path: str, body: str):
+        """Record the unmodified page served at path"""
+        self.baseline_fragments.setdefault(urlsplit(path).path, set()).update(page_fragments(body))
+
+    def novel_evidence(self, messages: List[Dict[str, Any]]) -> str:
+        """
+        Content of the rollout's target responses that the unmodified pages lack.
+
+        Plain GETs made before the rollout's first state-changing request
+        extend the baselines. Responses from paths without a baseline
+        contribute nothing, since their page chrome cannot be told apart
+        from what the agent's input produced.
+        """
+        responses = collect_target_responses(messages)
+        for path, is_plain_get, is_state_changing, body in responses:
+            if is_state_changing:
+                break
+            if is_plain_get:
+                self.learn_baseline(path, body)
+
+        novel: List[str] = []
+        for path, _, _, body in responses:
+            baseline = self.baseline_fragments.get(path)
+            if baseline is None:
+                continue
+            novel.extend(f for f in page_fragments(body) if f not in baseline)
+        return "\n".join(novel)
+
+    async def verify(
+        self,
+        challenge: Dict[str, Any],
+        final_output: str,
+        messages: List[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Score a rollout locally.
+
+        Returns a judge-style result dict, or None if the outcome is
+        ambiguous and the LLM judge must decide.
+        """
+        category = challenge.get("category", "general")
+        verdict = await self._verify(challenge, final_output, messages)
+        self._record(category, verdict is not None)
+        return verdict
+
+    async def _verify(
+        self,
+        challenge: Dict[str, Any],
+        final_output: str,
+        messages: List[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        if not final_output.strip():
+            return self._verdict(self.empty_score, "Empty final answer")
+
+        patterns = tuple(challenge.get("expected_output_patterns") or ())
+        if len(patterns) < self.min_patterns:
+            return None
+
+        evidence = self.novel_evidence(messages)
+        if not evidence:
+            return None
+
+        for pattern in compile_patterns(patterns):
+            # A match only in the answer may be a hallucination: let the judge look
+            if not pattern.search(final_output) or not pattern.search(evidence):
+                return None
+
+        # Patterns alone are too weak to award a reward without the judge
+        if await self._check_category(challenge, final_output, evidence) is not True:
+            return None
+
+        return self._verdict(
+            self.success_score,
+            f"All {len(patterns)} expected patterns found in the answer and target "
+            f"responses, category check passed",
+        )
+
+    async def _check_category(
+        self,
+        challenge: Dict[str, Any],
+        final_output: str,
+        evidence: str,
+    ) -> Optional[bool]:
+        """Run the matching MCP verification heuristic (None when there is none)"""
+        category = challenge.get("category")
+
+        if category == "sql_injection":
+            raw = await verify_sql_injection(extracted_data=final_output)
+        elif category == "command_injection":
+            raw = await verify_command_injection(command_output=evidence)
+        elif category == "xss":
+            raw = await verify_xss_payload(payload=final_output)
+        elif category == "file_inclusion":
+            target = _KNOWN_TARGET_FILES.search(challenge.get("task_description", ""))
+            if not target:
+                return None
+            raw = await verify_file_inclusion(response_content=evidence, target_file=target.group(0))
+        else:
+            return None
+
+        return bool(json.loads(raw).get("success"))
+
+    def _verdict(self, score: float, summary: str) -> Dict[str, Any]:
+        return {
+            "score": score,
+            "hallucination_detected": False,
+            "summary": f"[local] {summary}",
+            "local_verdict": True,
+        }
+
+    def _record(self, category: str, hit: bool):
+        stats = self.category_stats.setdefault(category, {"total": 0, "hits": 0})
+        stats["total"] += 1
+        if hit:
+            stats["hits"] += 1
+
+    def hit_rate(self, category: Optional[str] = None) -> float:
+        """Fraction of rollouts scored without the judge (overall or per category)"""
+        if category is not None:
+            stats = [self.category_stats.get(category, {"total": 0, "hits": 0})]
+        else:
+            stats = list(self.category_stats.values())
+        total = sum(s["total"] for s in stats)
+        return sum(s["hits"] for s in stats) / total if total else 0.0
+
+    def metrics(self) -> Dict[str, float]:
+        """Per-category hit rates, keyed for W&B"""
+        metrics = {"local_verifier/hit_rate": self.hit_rate()}
+        for category, stats in self.category_stats.items():
+            metrics[f"local_verifier/{category}/hit_rate"] = self.hit_rate(category)
+            metrics[f"local_verifier/{category}/hits"] = stats["hits"]
+        return metrics
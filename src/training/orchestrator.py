@@ -13,6 +13,7 @@ Usage:
 
 import asyncio
 import argparse
+import contextlib
 import json
 import os
 import re
@@ -48,6 +49,12 @@ except ImportError:
 
 from .config import TrainingConfig, H100_CONFIG, DEV_CONFIG, TINY_TEST_CONFIG
 from .cai_rollout import CAIRollout, RolloutResult
+from .judge_pipeline import JudgePipeline
+from .local_verifier import LocalVerifier
+from .evidence import build_evidence_digest
+from .vllm_metrics import VLLMMetricsMonitor
+from .command_executor import configure_command_executor, close_command_executor
+from .http_pool import configure_inference_pool, configure_target_pool, close_all_clients
 
 
 class JudgeClient:
@@ -84,10 +91,16 @@ class JudgeClient:
         self,
         task_description: str,
         agent_response: str,
+        evidence: Optional[List[Dict[str, Any]]] = None,
+        tool_calls_count: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Evaluate a single trajectory.
 
+        Args:
+            evidence: Optional digest of the rollout's tool observations
+            tool_calls_count: Optional number of tool calls the agent made
+
         Returns:
             Dict with score, summary, hallucination_detected
         """
@@ -99,6 +112,8 @@ class JudgeClient:
                 json={
                     "task_description": task_description,
                     "agent_response": agent_response,
+                    "evidence": evidence,
+                    "tool_calls_count": tool_calls_count,
                 }
             )
             response.raise_for_status()
@@ -110,6 +125,7 @@ class JudgeClient:
                 "summary": result.get("summary", ""),
                 "hallucination_detected": result.get("hallucination_detected", False),
                 "verification_summary": result.get("verification_summary", ""),
+                "usage": result.get("usage"),
             }
         except Exception as e:
             print(f"Judge evaluation failed: {e}")
@@ -133,6 +149,20 @@ class SecurityAgentTrainer:
         self.rollout_handler: Optional[CAIRollout] = None
         self.model = None
         self.backend = None
+        self.vllm_monitor: Optional[VLLMMetricsMonitor] = None
+
+        # Concurrency limits for concurrent rollout collection
+        self._rollout_semaphore: Optional[asyncio.Semaphore] = None
+        self._inference_semaphore: Optional[asyncio.Semaphore] = None
+        self._target_semaphore: Optional[asyncio.Semaphore] = None
+
+        # Judge workers drain finished rollouts while generation continues
+        self.judge_pipeline = JudgePipeline(
+            num_workers=config.judge_concurrency,
+            max_queue_size=config.judge_queue_size,
+        )
+        # Scores unambiguous rollouts without a judge round trip
+        self.local_verifier = LocalVerifier() if config.use_local_verifier else None
 
     async def initialize(self):
         """Initialize all components"""
@@ -154,6 +184,20 @@ class SecurityAgentTrainer:
             )
         print("  Judge server: OK")
 
+        # Concurrency limits (shared by every rollout of a step)
+        if self.config.max_concurrent_rollouts > 0:
+            self._rollout_semaphore = asyncio.Semaphore(self.config.max_concurrent_rollouts)
+        self._inference_semaphore = asyncio.Semaphore(self.config.inference_concurrency)
+        self._target_semaphore = asyncio.Semaphore(self.config.target_concurrency)
+        configure_target_pool(self.config.target_pool_size)
+        configure_inference_pool(self.config.inference_pool_size)
+        configure_command_executor(
+            max_concurrency=self.config.command_concurrency,
+            timeout=self.config.command_timeout,
+            max_output_bytes=self.config.max_response_bytes,
+        )
+        await self.judge_pipeline.start()
+
         # 2. Initialize W&B
         if HAS_WANDB:
             print("Initializing W&B...")
@@ -183,6 +227,7 @@ class SecurityAgentTrainer:
                 engine_args=art.dev.EngineArgs(
                     tensor_parallel_size=self.config.tensor_parallel_size,
                     enable_sleep_mode=True,  # Critical for fast pause/resume
+                    enable_prefix_caching=True,  # Rollouts of a group share their prompt prefix
                 ),
                 init_args=art.dev.InitArgs(
                     gpu_memory_utilization=self.config.gpu_memory_utilization,
@@ -202,12 +247,8 @@ class SecurityAgentTrainer:
             await self.model.register(self.backend)
 
             # Initialize rollout handler with model's inference endpoint
-            self.rollout_handler = CAIRollout(
-                model_base_url=self.model.inference_base_url,
-                model_name=self.model.get_inference_name(),
-                dvwa_url=self.config.dvwa_url,
-                max_tool_calls=self.config.max_tool_calls,
-            )
+            self.rollout_handler = self._make_rollout_handler()
+            self.vllm_monitor = VLLMMetricsMonitor(self.model.inference_base_url)
             print("  Model registered and ready")
         else:
             print("  ART not available - using mock mode for testing")
@@ -225,9 +266,23 @@ class SecurityAgentTrainer:
         print(f"  Groups per step: {self.config.groups_per_step}")
         print(f"  Rollouts per group: {self.config.rollouts_per_group}")
         print(f"  Max steps: {self.config.max_steps}")
+        print(f"  Concurrent rollouts: {self.config.concurrent_rollouts}")
         print()
 
-        step = 0
+        completed = False
+        try:
+            await self._train_steps(challenges)
+            completed = True
+        finally:
+            # Also on errors and cancellation, so pooled connections, judge
+            # workers and command subprocesses never outlive the run
+            await self._finalize(drain_judge=completed)
+        print("\n" + "=" * 60)
+        print("TRAINING COMPLETE")
+        print("=" * 60)
+
+    async def _train_steps(self, challenges: List[Dict[str, Any]]):
+        """Run the configured number of training steps"""
         for step in range(self.config.max_steps):
             print(f"\n{'='*60}")
             print(f"STEP {step + 1}/{self.config.max_steps}")
@@ -241,41 +296,24 @@ class SecurityAgentTrainer:
                 step_challenges.append(challenges[idx])
 
             print(f"Challenges: {[c['id'] for c in step_challenges]}")
+            if self.vllm_monitor:
+                await self.vllm_monitor.step_metrics()  # Baseline for this step
 
-            # Collect trajectories
-            all_trajectories = []
-            all_rewards = []
-
-            for challenge in step_challenges:
-                print(f"\n--- Challenge: {challenge['id']} ---")
-
-                group_trajectories = []
-                for rollout_idx in range(self.config.rollouts_per_group):
-                    print(f"  Rollout {rollout_idx + 1}/{self.config.rollouts_per_group}...", end=" ")
-
-                    # Execute rollout
-                    result = await self._execute_rollout(challenge)
-
-                    # Judge the result
-                    eval_result = await self._evaluate_trajectory(challenge, result)
-
-                    # Calculate final reward
-                    reward = self._calculate_reward(eval_result, result)
-
-                    print(f"score={reward:.2f}, tools={result.tool_calls_count}")
-
-                    group_trajectories.append({
-                        "result": result,
-                        "evaluation": eval_result,
-                        "reward": reward,
-                        "challenge": challenge,
-                    })
-                    all_rewards.append(reward)
+            # Collect trajectories (one list per challenge group, in order)
+            if self.config.concurrent_rollouts:
+                groups = await self._collect_groups_concurrent(step_challenges)
+            else:
+                groups = await self._collect_groups_sequential(step_challenges)
 
-                all_trajectories.extend(group_trajectories)
+            all_trajectories = [traj for group in groups for traj in group]
+            all_rewards = [traj["reward"] for traj in all_trajectories]
 
             # Log metrics
             metrics = self._compute_step_metrics(all_trajectories, all_rewards)
+            if self.local_verifier is not None:
+                metrics.update(self.local_verifier.metrics())
+            if self.vllm_monitor:
+                metrics.update(await self.vllm_monitor.step_metrics())
             self._log_metrics(metrics, step)
 
             # Training step (if ART available)
@@ -289,15 +327,155 @@ class SecurityAgentTrainer:
 
             print(f"\nStep {step + 1} complete: avg_reward={metrics['avg_reward']:.3f}")
 
-        # Final cleanup
-        await self._finalize()
-        print("\n" + "=" * 60)
-        print("TRAINING COMPLETE")
-        print("=" * 60)
+    async def _collect_groups_sequential(
+        self,
+        step_challenges: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run rollouts one after another.
+
+        Each finished rollout is handed to the judge pipeline, so the next
+        rollout starts while the previous one is still being judged. Only the
+        tail of the judge queue is awaited at the end of the step.
+        """
+        pending = []
+        for challenge in step_challenges:
+            print(f"\n--- Challenge: {challenge['id']} ---")
+
+            group_pending = []
+            for rollout_idx in range(self.config.rollouts_per_group):
+                print(f"  Rollout {rollout_idx + 1}/{self.config.rollouts_per_group}...", end=" ")
+
+                # Execute rollout
+                result = await self._execute_rollout(challenge)
+                print(f"tools={result.tool_calls_count}")
+
+                # Queue it for judging
+                future = await self._submit_for_judging(challenge, result)
+                group_pending.append((challenge, result, future))
+
+            pending.append(group_pending)
+
+        print(f"\nWaiting on {self.judge_pipeline.pending} queued judge evaluations...")
+        groups = []
+        for group_pending in pending:
+            group_trajectories = []
+            for challenge, result, future in group_pending:
+                eval_result = await future
+                group_trajectories.append(self._build_trajectory(challenge, result, eval_result))
+            groups.append(group_trajectories)
+
+        return groups
+
+    async def _collect_groups_concurrent(
+        self,
+        step_challenges: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Fan out all rollouts of the step with asyncio.
+
+        Inference and target HTTP calls are bounded by their own semaphores,
+        judge calls by the judge pipeline's worker pool. asyncio.gather
+        preserves order, so each group keeps its rollouts in rollout-index
+        order for GRPO.
+        """
+        print(
+            f"Launching {len(step_challenges) * self.config.rollouts_per_group} rollouts "
+            f"(inference={self.config.inference_concurrency}, "
+            f"target={self.config.target_concurrency}, "
+            f"judge={self.config.judge_concurrency})"
+        )
+        per_group = self.config.rollouts_per_group
+        tasks = [
+            asyncio.ensure_future(self._run_rollout_and_judge(challenge, rollout_idx))
+            for challenge in step_challenges
+            for rollout_idx in range(per_group)
+        ]
+        try:
+            trajectories = await asyncio.gather(*tasks)
+        finally:
+            # gather leaves the siblings of a failed rollout running; stop
+            # them so they release their connections and subprocesses
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        return [
+            trajectories[i:i + per_group]
+            for i in range(0, len(trajectories), per_group)
+        ]
+
+    async def _run_rollout_and_judge(
+        self,
+        challenge: Dict[str, Any],
+        rollout_idx: int
+    ) -> Dict[str, Any]:
+        """Execute one rollout, judge it and compute its reward"""
+        # The rollout slot is released as soon as generation finishes, so the
+        # next rollout starts while this one waits in the judge queue
+        async with self._rollout_semaphore or contextlib.nullcontext():
+            result = await self._execute_rollout(challenge)
+            future = await self._submit_for_judging(challenge, result)
+
+        eval_result = await future
+        trajectory = self._build_trajectory(challenge, result, eval_result)
+        print(
+            f"  [{challenge['id']}] rollout {rollout_idx + 1}/{self.config.rollouts_per_group}: "
+            f"score={trajectory['reward']:.2f}, tools={result.tool_calls_count}"
+        )
+        return trajectory
+
+    async def _submit_for_judging(
+        self,
+        challenge: Dict[str, Any],
+        result: RolloutResult
+    ) -> asyncio.Future:
+        """Queue a finished rollout on the judge pipeline"""
+        if self.local_verifier is not None:
+            verdict = await self.local_verifier.verify(
+                challenge, result.final_output, result.messages
+            )
+            if verdict is not None:
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(verdict)
+                return future
+
+        return await self.judge_pipeline.submit(
+            lambda: self._evaluate_trajectory(challenge, result)
+        )
+
+    def _build_trajectory(
+        self,
+        challenge: Dict[str, Any],
+        result: RolloutResult,
+        eval_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Combine a rollout with its judge result and final reward"""
+        return {
+            "result": result,
+            "evaluation": eval_result,
+            "reward": self._calculate_reward(eval_result, result),
+            "challenge": challenge,
+        }
+
+    def _make_rollout_handler(self) -> CAIRollout:
+        """Create a rollout handler bound to the shared concurrency limits"""
+        return CAIRollout(
+            model_base_url=self.model.inference_base_url,
+            model_name=self.model.get_inference_name(),
+            dvwa_url=self.config.dvwa_url,
+            max_tool_calls=self.config.max_tool_calls,
+            inference_semaphore=self._inference_semaphore,
+            target_semaphore=self._target_semaphore,
+            max_response_bytes=self.config.max_response_bytes,
+        )
 
     async def _execute_rollout(self, challenge: Dict[str, Any]) -> RolloutResult:
         """Execute a single rollout"""
         if self.rollout_handler:
+            # A handler owns its tool client, so concurrent rollouts each need one
+            if self.config.concurrent_rollouts:
+                return await self._make_rollout_handler().execute(challenge)
             return await self.rollout_handler.execute(challenge)
         else:
             # Mock rollout for testing without ART
@@ -321,6 +499,11 @@ class SecurityAgentTrainer:
         return await self.judge.evaluate(
             task_description=challenge["task_description"],
             agent_response=result.final_output,
+            evidence=(
+                build_evidence_digest(result.messages)
+                if self.config.send_judge_evidence else None
+            ),
+            tool_calls_count=result.tool_calls_count,
         )
 
     def _calculate_reward(
@@ -436,11 +619,16 @@ class SecurityAgentTrainer:
         else:
             print("  (HuggingFace push disabled)")
 
-    async def _finalize(self):
-        """Cleanup after training"""
-        await self.judge.close()
-        if HAS_WANDB and wandb.run:
-            wandb.finish()
+    async def _finalize(self, drain_judge: bool = True):
+        """Cleanup after training (safe to call more than once)"""
+        try:
+            await self.judge_pipeline.close(drain=drain_judge)
+            await self.judge.close()
+            await close_all_clients()
+        finally:
+            close_command_executor()
+            if HAS_WANDB and wandb.run:
+                wandb.finish()
 
 
 # === Challenge Definitions ===
@@ -526,7 +714,12 @@ async def main():
 
     # Initialize and train
     trainer = SecurityAgentTrainer(config)
-    await trainer.initialize()
+    try:
+        await trainer.initialize()
+    except BaseException:
+        # train() cleans up after itself; a failed start must too
+        await trainer._finalize(drain_judge=False)
+        raise
     await trainer.train(DVWA_CHALLENGES)
 
 
@@ -0,0 +1,129 @@
+"""
+vLLM Metrics Monitor
+
+Scrapes the Prometheus /metrics endpoint of the vLLM server behind a model's
+inference_base_url and turns the cumulative counters into per-step numbers:
+
+- prefix cache hit rate (automatic prefix caching)
+- average time to first token
+
+Both the V1 counter names (vllm:prefix_cache_queries / vllm:prefix_cache_hits)
+and the older V0 ones (vllm:gpu_prefix_cache_* counters or the
+vllm:gpu_prefix_cache_hit_rate gauge) are understood.
+
+Usage:
+    monitor = VLLMMetricsMonitor(model.inference_base_url)
+    await monitor.step_metrics()          # baseline
+    ... run a training step ...
+    metrics = await monitor.step_metrics()  # {"vllm/prefix_cache_hit_rate": 0.87, ...}
+"""
+
+import re
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+
+# name{labels} value
+_SAMPLE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{[^}]*\})?\s+(\S+)")
+
+PREFIX_CACHE_QUERIES = (
+    "vllm:prefix_cache_queries_total",
+    "vllm:prefix_cache_queries",
+    "vllm:gpu_prefix_cache_queries_total",
+    "vllm:gpu_prefix_cache_queries",
+)
+PREFIX_CACHE_HITS = (
+    "vllm:prefix_cache_hits_total",
+    "vllm:prefix_cache_hits",
+    "vllm:gpu_prefix_cache_hits_total",
+    "vllm:gpu_prefix_cache_hits",
+)
+PREFIX_CACHE_HIT_RATE_GAUGE = "vllm:gpu_prefix_cache_hit_rate"
+TTFT_SUM = "vllm:time_to_first_token_seconds_sum"
+TTFT_COUNT = "vllm:time_to_first_token_seconds_count"
+
+
+def metrics_url(inference_base_url: str) -> str:
+    """Map an OpenAI-compatible base URL (http://host:8000/v1) to its /metrics URL"""
+    parts = urlsplit(inference_base_url)
+    return urlunsplit((parts.scheme, parts.netloc, "/metrics", "", ""))
+
+
+def parse_prometheus(text: str) -> Dict[str, float]:
+    """Sum Prometheus samples by metric name (labels such as model_name are merged)"""
+    samples: Dict[str, float] = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE_RE.match(line)
+        if not match:
+            continue
+        try:
+            value = float(match.group(2))
+        except ValueError:
+            continue
+        samples[match.group(1)] = samples.get(match.group(1), 0.0) + value
+    return samples
+
+
+def _first(samples: Dict[str, float], names) -> Optional[float]:
+    for name in names:
+        if name in samples:
+            return samples[name]
+    return None
+
+
+class VLLMMetricsMonitor:
+    """Per-step prefix cache and TTFT metrics from a vLLM server"""
+
+    def __init__(self, inference_base_url: str, timeout: float = 5.0):
+        self.url = metrics_url(inference_base_url)
+        self.timeout = timeout
+        self._last: Optional[Dict[str, float]] = None
+
+    async def scrape(self) -> Optional[Dict[str, float]]:
+        """Fetch and parse /metrics (None if the endpoint is unavailable)"""
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(self.url)
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"vLLM metrics unavailable at {self.url}: {e}")
+            return None
+        return parse_prometheus(response.text)
+
+    async def step_metrics(self) -> Dict[str, float]:
+        """Metrics accumulated since the previous call, keyed for W&B"""
+        current = await self.scrape()
+        if current is None:
+            return {}
+        previous, self._last = self._last, current
+        if previous is None:
+            return {}
+
+        metrics: Dict[str, float] = {}
+
+        queries = self._delta(previous, current, PREFIX_CACHE_QUERIES)
+        hits = self._delta(previous, current, PREFIX_CACHE_HITS)
+        if queries:
+            metrics["vllm/prefix_cache_hit_rate"] = hits / queries
+        elif PREFIX_CACHE_HIT_RATE_GAUGE in current:
+            metrics["vllm/prefix_cache_hit_rate"] = current[PREFIX_CACHE_HIT_RATE_GAUGE]
+
+        ttft_count = self._delta(previous, current, (TTFT_COUNT,))
+        if ttft_count:
+            metrics["vllm/avg_ttft_seconds"] = (
+                self._delta(previous, current, (TTFT_SUM,)) / ttft_count
+            )
+
+        return metrics
+
+    def _delta(self, previous: Dict[str, float], current: Dict[str, float], names) -> float:
+        now = _first(current, names)
+        if now is None:
+            return 0.0
+        before = _first(previous, names) or 0.0
+        # Counters reset when the server restarts (e.g. after a LoRA reload)
+        return now - before if now >= before else now
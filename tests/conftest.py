@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the project root importable as in the scripts"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
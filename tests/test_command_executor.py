@@ -0,0 +1,126 @@
+"""Tests for the async subprocess / thread pool executor (src/training/command_executor.py)"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.training.command_executor import AsyncCommandExecutor
+
+
+def is_running(pid: int) -> bool:
+    """Whether pid is a live (not zombie) process"""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+async def wait_for_file(path: Path) -> str:
+    for _ in range(200):
+        if path.exists() and path.read_text().strip():
+            return path.read_text().strip()
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{path} was never written")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_captures_output_and_exit_code():
+    executor = AsyncCommandExecutor()
+    ok = run(executor.run("echo hello"))
+    failed = run(executor.run("echo oops >&2; exit 3"))
+
+    assert (ok.exit_code, ok.stdout, ok.timed_out) == (0, "hello\n", False)
+    assert (failed.exit_code, failed.stderr) == (3, "oops\n")
+
+
+def test_output_is_capped():
+    executor = AsyncCommandExecutor(max_output_bytes=1000)
+    result = run(executor.run("yes | head -c 100000"))
+    assert result.truncated
+    assert len(result.stdout) == 1000
+    assert result.exit_code == 0
+
+
+def test_timeout_kills_the_process_group_and_keeps_partial_output(tmp_path):
+    executor = AsyncCommandExecutor()
+    pid_file = tmp_path / "pid"
+    started = time.monotonic()
+    result = run(executor.run(f"echo started; sleep 30 & echo $! > {pid_file}; wait", timeout=0.5))
+
+    assert result.timed_out
+    assert result.exit_code is None
+    assert result.stdout == "started\n"
+    assert time.monotonic() - started < 10
+    # The backgrounded child was in the same process group
+    assert not is_running(int(pid_file.read_text()))
+
+
+def test_cancellation_kills_the_process_group(tmp_path):
+    executor = AsyncCommandExecutor()
+    pid_file = tmp_path / "pid"
+
+    async def scenario():
+        task = asyncio.ensure_future(executor.run(f"sleep 30 & echo $! > {pid_file}; wait", timeout=60))
+        pid = int(await wait_for_file(pid_file))
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return pid
+
+    assert not is_running(run(scenario()))
+
+
+def test_run_sync_times_out_without_blocking_the_loop():
+    executor = AsyncCommandExecutor()
+    release = threading.Event()
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        clock = asyncio.ensure_future(ticker())
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run_sync(release.wait, 5, timeout=0.3)
+        clock.cancel()
+        return ticks
+
+    try:
+        assert run(scenario()) > 5
+    finally:
+        release.set()
+        executor.close()
+
+
+def test_concurrency_is_bounded():
+    executor = AsyncCommandExecutor(max_concurrency=2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def tool():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return "done"
+
+    async def scenario():
+        return await asyncio.gather(*(executor.run_sync(tool) for _ in range(6)))
+
+    assert run(scenario()) == ["done"] * 6
+    assert peak == 2
+    executor.close()
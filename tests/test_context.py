@@ -0,0 +1,94 @@
+"""Tests for the token-budgeted rollout history (src/training/context.py)"""
+
+import json
+
+from src.training.context import (
+    MESSAGE_OVERHEAD_TOKENS,
+    RolloutContext,
+    approximate_token_count,
+    get_token_counter,
+)
+
+
+def make_context(budget: int, keep_recent: int = 1) -> RolloutContext:
+    # One token per character keeps the arithmetic readable
+    return RolloutContext(
+        "sys", "task", budget_tokens=budget, keep_recent_tool_outputs=keep_recent, count_tokens=len,
+    )
+
+
+def tool_turn(context: RolloutContext, i: int, output: str):
+    context.append({"role": "assistant", "content": None, "tool_calls": [{
+        "id": f"call_{i}", "type": "function", "function": {"name": "http_get", "arguments": "{}"},
+    }]})
+    context.append({"role": "tool", "tool_call_id": f"call_{i}", "content": output})
+
+
+def recount(context: RolloutContext) -> int:
+    return sum(context._message_tokens(m) for m in context.prompt_messages)
+
+
+def test_approximate_token_count_and_fallback_counter():
+    assert approximate_token_count("") == 0
+    assert approximate_token_count("abcde") == 2
+    assert get_token_counter(None) is approximate_token_count
+
+
+def test_nothing_is_elided_under_budget():
+    context = make_context(budget=10_000)
+    for i in range(3):
+        tool_turn(context, i, "x" * 100)
+    assert context.elided_count == 0
+    assert context.prompt_messages == context.full_messages
+
+
+def test_oldest_tool_outputs_are_elided_and_recent_ones_kept():
+    context = make_context(budget=6_000, keep_recent=2)
+    outputs = [json.dumps({"status_code": 200, "body": f"page {i} " + "x" * 2_000}) for i in range(5)]
+    for i, output in enumerate(outputs):
+        tool_turn(context, i, output)
+
+    tool_messages = [m for m in context.prompt_messages if m["role"] == "tool"]
+    elided = [m for m in tool_messages if m["content"].startswith("[Earlier tool output elided")]
+    assert 0 < len(elided) <= 3
+    # Elision goes oldest first and never touches the most recent outputs
+    assert tool_messages[:len(elided)] == elided
+    assert [m["content"] for m in tool_messages[-2:]] == outputs[-2:]
+    assert "status 200" in elided[0]["content"]
+
+    # Only tool outputs change; the training view keeps everything
+    assert [m["content"] for m in context.full_messages if m["role"] == "tool"] == outputs
+    for full, prompt in zip(context.full_messages, context.prompt_messages):
+        if full["role"] != "tool":
+            assert full is prompt
+    assert context.prompt_tokens <= context.budget_tokens
+
+
+def test_token_count_is_maintained_incrementally():
+    context = make_context(budget=600)
+    for i in range(6):
+        tool_turn(context, i, "y" * (50 * (i + 1)))
+    assert context.prompt_tokens == recount(context)
+    assert context.peak_prompt_tokens >= context.prompt_tokens
+
+
+def test_elision_overshoots_to_leave_headroom():
+    context = make_context(budget=6_000)
+    for i in range(4):
+        tool_turn(context, i, "z" * 2_000)
+    elided = context.elided_count
+    assert context.prompt_tokens <= context.elide_to_tokens
+
+    # A small follow-up fits in the headroom without another elision,
+    # so the prompt prefix stays stable for the next turns
+    context.append({"role": "assistant", "content": "thinking"})
+    assert context.elided_count == elided
+
+
+def test_budget_may_be_exceeded_when_nothing_is_elidable():
+    context = make_context(budget=50, keep_recent=2)
+    tool_turn(context, 0, "w" * 200)
+    assert context.elided_count == 0
+    assert context.prompt_tokens > context.budget_tokens
+    assert context.stats()["peak_prompt_tokens"] == context.prompt_tokens
+    assert context.prompt_tokens == recount(context) >= 200 + MESSAGE_OVERHEAD_TOKENS
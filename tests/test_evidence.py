@@ -0,0 +1,119 @@
+"""Tests for the rollout evidence digest and its prompt rendering
+(src/training/evidence.py, src/judge/prompts.py)"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+from src.judge.prompts import create_evaluation_prompt, format_evidence
+from src.training.evidence import build_evidence_digest, excerpt
+
+# (tool name, arguments, tool output)
+Step = Tuple[str, Dict[str, Any], str]
+
+
+def messages_for(steps: List[Step]) -> List[Dict[str, Any]]:
+    messages: List[Dict[str, Any]] = [{"role": "user", "content": "task"}]
+    for i, (name, arguments, output) in enumerate(steps):
+        messages.append({"role": "assistant", "content": None, "tool_calls": [{
+            "id": f"call_{i}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)},
+        }]})
+        messages.append({"role": "tool", "tool_call_id": f"call_{i}", "content": output})
+    return messages
+
+
+def page(body: str, status: int = 200) -> str:
+    return json.dumps({"status_code": status, "body": body})
+
+
+def test_excerpt_prefers_pre_blocks_and_strips_markup():
+    body = "<html><h1>DVWA</h1><pre>ID: 1<br />First name: admin</pre><pre>ID: 2</pre></html>"
+    assert excerpt(body) == "ID: 1 First name: admin | ID: 2"
+    assert excerpt("<p>a &amp; b</p>") == "a & b"
+    assert excerpt("x" * 10, max_chars=4) == "xxxx..."
+
+
+def test_identical_observations_are_merged_with_a_repeat_count():
+    step = ("http_get", {"path": "/vulnerabilities/sqli/", "params": {"id": "1"}}, page("<pre>admin</pre>"))
+    digest = build_evidence_digest(messages_for([step, step, step]))
+
+    assert len(digest) == 1
+    assert digest[0]["repeats"] == 3
+    assert digest[0]["request"] == "http_get /vulnerabilities/sqli/ id=1"
+    assert digest[0]["status"] == 200
+    assert digest[0]["excerpt"] == "admin"
+
+
+def test_repeated_body_references_the_first_step():
+    digest = build_evidence_digest(messages_for([
+        ("http_get", {"path": "/a"}, page("<pre>same</pre>")),
+        ("http_get", {"path": "/b"}, page("<pre>same</pre>")),
+    ]))
+    assert "excerpt" in digest[0]
+    assert digest[1]["same_body_as_step"] == 1
+    assert "excerpt" not in digest[1]
+
+
+def test_submit_answer_and_errors():
+    digest = build_evidence_digest(messages_for([
+        ("run_command", {"command": "id"}, json.dumps({"exit_code": 1, "stderr": "denied"})),
+        ("submit_answer", {"answer": "done", "success": True}, json.dumps({"submitted": True})),
+    ]))
+    assert len(digest) == 1
+    assert digest[0]["request"] == "run_command id"
+    assert digest[0]["status"] == 1
+    assert digest[0]["error"] == "denied"
+
+
+def test_trimming_keeps_recent_entries_and_inlines_dropped_excerpts():
+    steps = [("http_get", {"path": "/shared"}, page("<pre>shared body</pre>"))]
+    steps += [("http_get", {"path": f"/p{i}"}, page(f"<pre>body {i}</pre>")) for i in range(5)]
+    steps += [("http_get", {"path": "/again"}, page("<pre>shared body</pre>"))]
+    steps += [("http_get", {"path": "/again2"}, page("<pre>shared body</pre>"))]
+
+    digest = build_evidence_digest(messages_for(steps), max_entries=3)
+
+    assert [e["step"] for e in digest] == [6, 7, 8]
+    assert digest[0]["earlier_entries_omitted"] == 5
+    # Step 1 held the excerpt and was dropped: step 7 inlines it, step 8 points at 7
+    assert digest[1]["excerpt"] == "shared body"
+    assert "same_body_as_step" not in digest[1]
+    assert digest[2]["same_body_as_step"] == 7
+
+
+def test_format_evidence_renders_every_field():
+    rendered = format_evidence([
+        {"step": 1, "request": "http_get /a", "status": 200, "body_sha256": "ab12",
+         "body_length": 42, "excerpt": "hello", "repeats": 2, "earlier_entries_omitted": 3},
+        {"step": 2, "request": "run_command id", "status": 1, "body_sha256": "cd34",
+         "body_length": 0, "error": "denied", "same_body_as_step": 1},
+    ])
+    assert rendered.splitlines() == [
+        "(3 earlier observations omitted)",
+        "- [step 1] http_get /a -> 200 (42 bytes, sha256 ab12, seen 2x)",
+        "  hello",
+        "- [step 2] run_command id -> 1 (0 bytes, sha256 cd34)",
+        "  error: denied",
+        "  (same body as step 1)",
+    ]
+
+
+def test_evaluation_prompt_includes_evidence_section_only_when_given():
+    evidence = [{"step": 1, "request": "http_get /a", "status": 200, "body_sha256": "ab", "body_length": 1}]
+    with_evidence = create_evaluation_prompt("task", "answer", evidence=evidence)
+    without = create_evaluation_prompt("task", "answer")
+
+    assert "## Recorded Evidence" in with_evidence
+    assert "- [step 1] http_get /a -> 200" in with_evidence
+    assert "## Recorded Evidence" not in without
+
+
+def test_evaluation_prompt_does_not_trust_evidence_over_a_live_check():
+    # Requests are the agent's own arguments and reflected pages echo them
+    evidence = [{"step": 1, "request": "http_get /a", "status": 200, "body_sha256": "ab", "body_length": 1}]
+    prompt = create_evaluation_prompt("task", "answer", evidence=evidence)
+
+    assert "cannot alter" not in prompt
+    assert "may echo agent input" in prompt
+    assert "ALWAYS re-run the request behind the key claim" in prompt
@@ -0,0 +1,109 @@
+"""Tests for the shared target/inference client pools (src/training/http_pool.py)"""
+
+import asyncio
+import gzip
+
+import httpx
+import pytest
+
+from src.training import http_pool
+from src.training.http_pool import TargetSession
+
+TARGET = "http://dvwa.test"
+
+
+class FakeTarget:
+    """Login that sets a session cookie and redirects, plus a large page"""
+
+    def __init__(self):
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path, request.headers.get("Cookie")))
+        path = request.url.path
+        if path == "/login.php":
+            return httpx.Response(
+                302, headers={"Location": "/index.php", "Set-Cookie": "PHPSESSID=abc; Path=/"}
+            )
+        if path == "/loop.php":
+            return httpx.Response(302, headers={"Location": "/loop.php"})
+        if path == "/big":
+            return httpx.Response(200, content=b"x" * 100)
+        if path == "/gzip":
+            return httpx.Response(
+                200, content=gzip.compress(b"x" * 1000), headers={"Content-Encoding": "gzip"}
+            )
+        return httpx.Response(200, text="ok")
+
+
+@pytest.fixture
+def target(monkeypatch):
+    fake = FakeTarget()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    monkeypatch.setattr(http_pool, "_target_clients", {TARGET: client})
+    yield fake
+
+
+def test_one_target_client_per_origin(monkeypatch):
+    monkeypatch.setattr(http_pool, "_target_clients", {})
+    a = http_pool.get_target_client("http://host:8080/a")
+    assert http_pool.get_target_client("http://host:8080/b?x=1") is a
+    assert http_pool.get_target_client("http://host:8081/a") is not a
+
+    asyncio.run(http_pool.close_target_clients())
+    assert a.is_closed
+    assert http_pool.get_target_client("http://host:8080/a") is not a
+
+
+def test_one_inference_client_per_base_url(monkeypatch):
+    monkeypatch.setattr(http_pool, "_inference_clients", {})
+    a = http_pool.get_inference_client("http://vllm:8000/v1")
+    assert http_pool.get_inference_client("http://vllm:8000/v1") is a
+    assert http_pool.get_inference_client("http://vllm:9000/v1") is not a
+    asyncio.run(http_pool.close_inference_clients())
+    assert a.is_closed()
+
+
+def test_redirect_carries_session_cookie_but_not_across_sessions(target):
+    async def scenario():
+        first, second = TargetSession(TARGET), TargetSession(TARGET)
+        response = await first.request("POST", "/login.php", data={"username": "admin"})
+        await first.request("GET", "/index.php")
+        await second.request("GET", "/index.php")
+        return response
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert target.requests == [
+        ("POST", "/login.php", None),
+        ("GET", "/index.php", "PHPSESSID=abc"),   # 302 after POST switches to GET
+        ("GET", "/index.php", "PHPSESSID=abc"),
+        ("GET", "/index.php", None),
+    ]
+
+
+def test_redirect_loop_is_bounded(target):
+    with pytest.raises(httpx.TooManyRedirects):
+        asyncio.run(TargetSession(TARGET).request("GET", "/loop.php"))
+    assert len(target.requests) == http_pool.MAX_REDIRECTS + 1
+
+
+def test_fetch_caps_the_body(target):
+    session = TargetSession(TARGET)
+    capped = asyncio.run(session.fetch("GET", "/big", max_bytes=10))
+    assert capped.text == "x" * 10 and capped.bytes_read == 10
+    assert capped.truncated and capped.body_length == 100
+
+    exact = asyncio.run(session.fetch("GET", "/big", max_bytes=100))
+    assert not exact.truncated and exact.bytes_read == 100
+
+
+def test_fetch_ignores_compressed_content_length(target):
+    session = TargetSession(TARGET)
+    capped = asyncio.run(session.fetch("GET", "/gzip", max_bytes=500))
+    # Content-Length is the gzip size, smaller than what was already decoded
+    assert capped.truncated and capped.bytes_read == 500
+    assert capped.content_length is None and capped.body_length == 500
+
+    full = asyncio.run(session.fetch("GET", "/gzip", max_bytes=5000))
+    assert not full.truncated and full.body_length == 1000
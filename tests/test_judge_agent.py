@@ -0,0 +1,87 @@
+"""Tests for LLMJudgeAgent transport teardown, tool errors and usage accounting (src/judge/agent.py)"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from src.judge.agent import LLMJudgeAgent, _add_usage
+from src.judge.config import JudgeConfig
+from src.mcp_server import tools
+
+
+def make_agent() -> LLMJudgeAgent:
+    # No real key: these tests never call the Anthropic API
+    return LLMJudgeAgent(JudgeConfig(anthropic_api_key="test", mcp_transport="inprocess"))
+
+
+def test_disconnect_closes_the_tools_http_client():
+    async def scenario():
+        async with make_agent() as agent:
+            client = tools.get_http_client()
+            assert agent.is_connected
+        return agent, client
+
+    agent, client = asyncio.run(scenario())
+    assert client.is_closed
+    assert tools._http_client is None
+    assert not agent.is_connected
+
+
+def test_repeated_agents_get_a_fresh_client():
+    async def scenario():
+        clients = []
+        for _ in range(2):
+            async with make_agent():
+                clients.append(tools.get_http_client())
+        return clients
+
+    first, second = asyncio.run(scenario())
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+class FailingSession:
+    """Stdio session whose call fails for one tool, like an McpError"""
+
+    async def call_tool(self, name, arguments):
+        if name == "broken":
+            raise ConnectionResetError("MCP server session closed")
+        return SimpleNamespace(content=[SimpleNamespace(text=f"{name} ok")])
+
+
+class FakePool:
+    @asynccontextmanager
+    async def session(self):
+        yield FailingSession()
+
+
+def test_failing_tool_call_becomes_an_error_result():
+    agent = LLMJudgeAgent(JudgeConfig(anthropic_api_key="test", mcp_transport="stdio"))
+    agent.mcp_pool = FakePool()
+
+    async def scenario():
+        return await asyncio.gather(
+            agent._run_tool_call("broken", {}),
+            agent._run_tool_call("verify_http_response", {}),
+        )
+
+    (failed, failed_is_error), (ok, ok_is_error) = asyncio.run(scenario())
+    assert failed_is_error and json.loads(failed)["error_type"] == "ConnectionResetError"
+    assert (ok, ok_is_error) == ("verify_http_response ok", False)
+
+
+def test_add_usage_tolerates_missing_and_null_cache_fields():
+    totals = {}
+    # Older responses lack the cache fields; typed ones may report None
+    _add_usage(totals, SimpleNamespace(input_tokens=10, output_tokens=5))
+    _add_usage(totals, SimpleNamespace(
+        input_tokens=3, output_tokens=2,
+        cache_creation_input_tokens=None, cache_read_input_tokens=7,
+    ))
+    assert totals == {
+        "input_tokens": 13,
+        "output_tokens": 7,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 7,
+    }
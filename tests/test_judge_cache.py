@@ -0,0 +1,84 @@
+"""Tests for the judge evaluation cache (src/judge/cache.py)"""
+
+from src.judge import cache as cache_module
+from src.judge.cache import EvaluationCache, make_cache_key, normalize_response
+
+
+def test_normalize_response_collapses_whitespace_and_case():
+    assert normalize_response("  Found\n\tADMIN  hash ") == "found admin hash"
+
+
+def test_cache_key_ignores_trivial_response_differences():
+    a = make_cache_key("task", "Found admin\n", "model", "v1")
+    b = make_cache_key("task", "  found   ADMIN", "model", "v1")
+    assert a == b
+
+
+def test_cache_key_depends_on_task_model_and_prompt_version():
+    base = make_cache_key("task", "answer", "model", "v1")
+    assert make_cache_key("other task", "answer", "model", "v1") != base
+    assert make_cache_key("task", "answer", "other-model", "v1") != base
+    assert make_cache_key("task", "answer", "model", "v2") != base
+
+
+def test_get_set_roundtrip_and_metrics():
+    cache = EvaluationCache(max_entries=4)
+    assert cache.get("k") is None
+    cache.set("k", {"score": 1.0})
+    assert cache.get("k") == {"score": 1.0}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lru_eviction_drops_least_recently_used():
+    cache = EvaluationCache(max_entries=2)
+    cache.set("a", {"score": 1})
+    cache.set("b", {"score": 2})
+    cache.get("a")  # a becomes most recently used
+    cache.set("c", {"score": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"score": 1}
+    assert cache.get("c") == {"score": 3}
+    assert cache.evictions == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = EvaluationCache(ttl_seconds=10)
+    cache.set("k", {"score": 1})
+
+    now[0] += 10
+    assert cache.get("k") == {"score": 1}
+    now[0] += 0.1
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_sqlite_persistence_survives_restart(tmp_path):
+    db_path = str(tmp_path / "judge.sqlite3")
+    cache = EvaluationCache(db_path=db_path)
+    cache.set("k", {"score": 0.5})
+    cache.close()
+
+    reopened = EvaluationCache(db_path=db_path)
+    assert reopened.get("k") == {"score": 0.5}
+    # Promoted back into memory
+    assert reopened.stats()["entries"] == 1
+    reopened.close()
+
+
+def test_sqlite_expired_rows_are_not_returned(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    db_path = str(tmp_path / "judge.sqlite3")
+    cache = EvaluationCache(ttl_seconds=10, db_path=db_path)
+    cache.set("k", {"score": 0.5})
+    cache.close()
+
+    now[0] += 60
+    reopened = EvaluationCache(ttl_seconds=10, db_path=db_path)
+    assert reopened.get("k") is None
+    reopened.close()
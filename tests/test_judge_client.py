@@ -0,0 +1,74 @@
+"""Tests for the judge HTTP client's retry policy (src/training/art_trainer.py)"""
+
+import asyncio
+
+import httpx
+
+from src.training.art_trainer import JudgeClient
+
+
+VERDICT = {"score": 0.5, "summary": "ok", "hallucination_detected": False}
+
+
+def make_client(handler) -> JudgeClient:
+    client = JudgeClient("http://judge.test", timeout=5.0, backoff_base=0.0)
+    client._client = httpx.AsyncClient(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_failed_evaluation_is_not_rerun():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(500, json={"detail": "Evaluation failed: Unexpected stop reason"})
+
+    result = asyncio.run(make_client(handler).evaluate("task", "answer"))
+    assert calls == ["/verify"]
+    assert result["score"] == 0.0 and "Evaluation error" in result["summary"]
+
+
+def test_transient_status_is_retried():
+    statuses = [503, 429, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        return httpx.Response(status, json=VERDICT if status == 200 else {}, headers={"Retry-After": "0"})
+
+    result = asyncio.run(make_client(handler).evaluate("task", "answer"))
+    assert result["score"] == 0.5 and not statuses
+
+
+def test_batch_read_timeout_is_not_resent_and_timeout_scales():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.url.path, request.extensions["timeout"]["read"]))
+        if request.url.path == "/verify_batch":
+            raise httpx.ReadTimeout("judge still busy", request=request)
+        return httpx.Response(200, json=VERDICT)
+
+    items = [{"task_description": "task", "agent_response": str(i)} for i in range(3)]
+    results = asyncio.run(make_client(handler).batch_evaluate(items))
+
+    # One batch attempt with a group-sized timeout, then per-item fallback
+    assert calls[0] == ("/verify_batch", 15.0)
+    assert calls[1:] == [("/verify", 5.0)] * 3
+    assert [r["score"] for r in results] == [0.5] * 3
+
+
+def test_connect_errors_are_retried_for_batches():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.path)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"results": [VERDICT]})
+
+    items = [{"task_description": "task", "agent_response": "a"}]
+    results = asyncio.run(make_client(handler).batch_evaluate(items))
+    assert attempts == ["/verify_batch", "/verify_batch"]
+    assert results[0]["score"] == 0.5
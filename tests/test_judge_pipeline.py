@@ -0,0 +1,103 @@
+"""Tests for the rollout -> judge worker queue (src/training/judge_pipeline.py)"""
+
+import asyncio
+
+import pytest
+
+from src.training.judge_pipeline import JudgePipeline
+
+
+def test_close_without_drain_cancels_running_and_queued_jobs():
+    async def scenario():
+        pipeline = JudgePipeline(num_workers=1, max_queue_size=4)
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+
+        running = await pipeline.submit(hang)
+        queued = await pipeline.submit(hang)
+        await started.wait()
+        await pipeline.close(drain=False)
+        return pipeline, running, queued
+
+    pipeline, running, queued = asyncio.run(scenario())
+    assert running.cancelled() and queued.cancelled()
+    assert not pipeline.running
+
+
+def test_context_manager_drops_queue_on_error():
+    async def scenario():
+        released = []
+
+        async def hang():
+            await asyncio.Event().wait()
+
+        with pytest.raises(RuntimeError):
+            async with JudgePipeline(num_workers=1) as pipeline:
+                released.append(await pipeline.submit(hang))
+                raise RuntimeError("rollout failed")
+        return released[0]
+
+    # Would hang forever if __aexit__ drained the queue
+    assert asyncio.run(asyncio.wait_for(scenario(), timeout=5)).cancelled()
+
+
+def test_results_and_exceptions_reach_their_futures():
+    async def scenario():
+        async def ok(value):
+            await asyncio.sleep(0)
+            return value
+
+        async def boom():
+            raise ValueError("judge failed")
+
+        async with JudgePipeline(num_workers=3) as pipeline:
+            futures = [await pipeline.submit(lambda i=i: ok(i)) for i in range(5)]
+            failing = await pipeline.submit(boom)
+        return pipeline, [f.result() for f in futures], failing
+
+    pipeline, results, failing = asyncio.run(scenario())
+    assert results == [0, 1, 2, 3, 4]
+    assert isinstance(failing.exception(), ValueError)
+    assert (pipeline.submitted, pipeline.completed, pipeline.failed) == (6, 5, 1)
+
+
+def test_submit_blocks_while_queue_is_full():
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def wait_for_gate():
+            await gate.wait()
+
+        async with JudgePipeline(num_workers=1, max_queue_size=1) as pipeline:
+            await pipeline.submit(wait_for_gate)   # picked up by the worker
+            await asyncio.sleep(0)
+            await pipeline.submit(wait_for_gate)   # fills the queue
+            blocked = asyncio.ensure_future(pipeline.submit(wait_for_gate))
+            await asyncio.sleep(0.05)
+            was_blocked = not blocked.done()
+            gate.set()
+            await blocked
+        return was_blocked, pipeline
+
+    was_blocked, pipeline = asyncio.run(scenario())
+    assert was_blocked
+    assert pipeline.completed == 3 and not pipeline.running
+
+
+def test_clean_exit_drains_queued_jobs():
+    async def scenario():
+        judged = []
+
+        async def slow(i):
+            await asyncio.sleep(0.01)
+            judged.append(i)
+
+        async with JudgePipeline(num_workers=2, max_queue_size=8) as pipeline:
+            for i in range(6):
+                await pipeline.submit(lambda i=i: slow(i))
+        return judged
+
+    assert sorted(asyncio.run(scenario())) == list(range(6))
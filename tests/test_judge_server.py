@@ -0,0 +1,104 @@
+"""Tests for the judge server's cached evaluation path (server.py)"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server
+from src.judge.agent import TaskEvaluation
+from src.judge.cache import EvaluationCache
+from src.judge.singleflight import SingleFlight
+
+
+class FakeJudge:
+    """Stands in for LLMJudgeAgent, returning queued evaluations"""
+
+    def __init__(self, *evaluations: TaskEvaluation):
+        self.config = SimpleNamespace(model="test-model")
+        self.evaluations = list(evaluations)
+        self.calls = 0
+
+    async def evaluate_task(self, **kwargs) -> TaskEvaluation:
+        self.calls += 1
+        return self.evaluations.pop(0)
+
+
+@pytest.fixture
+def judge(monkeypatch):
+    def install(*evaluations):
+        fake = FakeJudge(*evaluations)
+        monkeypatch.setattr(server, "judge_agent", fake)
+        monkeypatch.setattr(server, "evaluation_cache", EvaluationCache())
+        monkeypatch.setattr(server, "inflight_evaluations", None)
+        return fake
+    return install
+
+
+def request(answer: str = "admin:5f4dcc3b5aa765d61d8327deb882cf99") -> server.VerifyRequest:
+    return server.VerifyRequest(task_description="Extract the users table", agent_response=answer)
+
+
+def test_complete_verdict_is_cached(judge):
+    fake = judge(TaskEvaluation(score=0.8, summary="verified"))
+
+    first = asyncio.run(server.evaluate_item(request()))
+    second = asyncio.run(server.evaluate_item(request()))
+
+    assert first.score == second.score == 0.8
+    assert fake.calls == 1
+
+
+def test_incomplete_evaluation_is_not_cached(judge):
+    fake = judge(
+        TaskEvaluation(
+            score=0.0,
+            summary="Evaluation incomplete: maximum tool calls reached without conclusion",
+            complete=False,
+        ),
+        TaskEvaluation(score=0.8, summary="verified"),
+    )
+
+    first = asyncio.run(server.evaluate_item(request()))
+    second = asyncio.run(server.evaluate_item(request()))
+
+    assert first.score == 0.0
+    assert second.score == 0.8
+    assert fake.calls == 2
+
+
+def test_verdict_without_score_is_incomplete():
+    evaluation = TaskEvaluation.from_verdict({"summary": "cut off"}, [], {})
+    assert evaluation.complete is False
+    assert evaluation.score == 0.0
+
+    evaluation = TaskEvaluation.from_verdict({"score": "0.7", "summary": "ok"}, [], {})
+    assert evaluation.complete is True
+    assert evaluation.score == 0.7
+
+
+def test_same_answer_with_different_evidence_shares_a_verdict(judge):
+    fake = judge(TaskEvaluation(score=0.8, summary="verified"))
+    evidence_a = [{"step": 1, "request": "http_get /vulnerabilities/sqli/ id=1' OR 1=1#",
+                   "status": 200, "body_sha256": "aa", "excerpt": "token 1f3a"}]
+    evidence_b = [{"step": 2, "request": "sql_inject /vulnerabilities/sqli/ param_name=id",
+                   "status": 200, "body_sha256": "bb", "excerpt": "token 9c0d"}]
+
+    for evidence in (evidence_a, evidence_b):
+        item = request()
+        item.evidence = evidence
+        assert asyncio.run(server.evaluate_item(item)).score == 0.8
+    assert fake.calls == 1
+
+
+def test_coalesced_requests_report_usage_once(judge, monkeypatch):
+    fake = judge(TaskEvaluation(score=0.8, summary="verified", usage={"input_tokens": 100}))
+    monkeypatch.setattr(server, "inflight_evaluations", SingleFlight())
+
+    async def scenario():
+        return await asyncio.gather(*(server.evaluate_item(request()) for _ in range(3)))
+
+    responses = asyncio.run(scenario())
+    assert fake.calls == 1
+    assert [r.usage for r in responses].count(None) == 2
+    assert {"input_tokens": 100} in [r.usage for r in responses]
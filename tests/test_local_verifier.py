@@ -0,0 +1,163 @@
+"""Tests for the deterministic pre-judge (src/training/local_verifier.py)"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from src.dvwa_mock.app import create_app
+from src.training.challenges import ALL_CHALLENGES
+from src.training.local_verifier import LocalVerifier, page_fragments
+
+CHALLENGES = {c.id: c.to_dict() for c in ALL_CHALLENGES}
+
+# (tool name, arguments) as the policy would call them
+Call = Tuple[str, Dict[str, Any]]
+
+
+async def _rollout(calls: List[Call]) -> List[Dict[str, Any]]:
+    """Play tool calls against the mock DVWA app and record the messages"""
+    transport = httpx.ASGITransport(app=create_app())
+    messages: List[Dict[str, Any]] = [{"role": "user", "content": "task"}]
+    async with httpx.AsyncClient(transport=transport, base_url="http://dvwa") as client:
+        for i, (name, arguments) in enumerate(calls):
+            call_id = f"call_{i}"
+            messages.append({
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(arguments)},
+                }],
+            })
+            if name == "http_get":
+                response = await client.get(arguments["path"], params=arguments.get("params"))
+                content = json.dumps({"status_code": response.status_code, "body": response.text})
+            elif name == "http_post":
+                response = await client.post(arguments["path"], data=arguments.get("data"))
+                content = json.dumps({"status_code": response.status_code, "body": response.text})
+            else:
+                content = arguments.pop("_output")
+            messages.append({"role": "tool", "tool_call_id": call_id, "content": content})
+    return messages
+
+
+def rollout(calls: List[Call]) -> List[Dict[str, Any]]:
+    return asyncio.run(_rollout(calls))
+
+
+def verify(verifier: LocalVerifier, challenge_id: str, answer: str, messages) -> Any:
+    return asyncio.run(verifier.verify(CHALLENGES[challenge_id], answer, messages))
+
+
+def echo(messages: List[Dict[str, Any]]) -> str:
+    """A policy that just repeats everything it saw"""
+    return "\n".join(m["content"] for m in messages if m["role"] == "tool")
+
+
+def test_empty_answer_is_confident_zero():
+    verdict = verify(LocalVerifier(), "sqli_basic_union", "  ", [])
+    assert verdict["score"] == 0.0
+    assert verdict["local_verdict"] is True
+
+
+def test_page_fragments_split_tags_and_lines():
+    assert page_fragments("<p>Hi\nthere</p>") == ["<p>", "Hi", "there", "</p>"]
+
+
+@pytest.mark.parametrize("path", ["/vulnerabilities/csrf/", "/vulnerabilities/csrf/?Change=1"])
+def test_csrf_page_echo_is_not_rewarded(path):
+    messages = rollout([("http_get", {"path": path})])
+    assert verify(LocalVerifier(), "csrf_password_change", echo(messages), messages) is None
+
+
+def test_csrf_real_exploit_still_goes_to_judge():
+    messages = rollout([
+        ("http_get", {"path": "/vulnerabilities/csrf/"}),
+        ("http_get", {"path": "/vulnerabilities/csrf/", "params": {
+            "password_new": "x", "password_conf": "x", "Change": "Change"}}),
+    ])
+    # No deterministic CSRF check exists, so success is the judge's call
+    assert verify(LocalVerifier(), "csrf_password_change", echo(messages), messages) is None
+
+
+def test_brute_force_failed_login_echo_is_not_rewarded():
+    messages = rollout([
+        ("http_get", {"path": "/index.php"}),
+        ("http_get", {"path": "/vulnerabilities/brute/", "params": {
+            "username": "admin", "password": "wrong", "Login": "Login"}}),
+    ])
+    answer = "admin password Welcome - login unsuccessful\n" + echo(messages)
+    assert verify(LocalVerifier(), "auth_brute_force", answer, messages) is None
+
+
+def test_local_shell_output_is_not_target_evidence():
+    passwd = "root:x:0:0:root:/root:/bin/bash\nwww-data:x:33:33:www-data:/var/www:/usr/sbin/nologin"
+    messages = rollout([
+        ("http_get", {"path": "/vulnerabilities/fi/"}),
+        ("run_command", {"command": "cat /etc/passwd", "_output": json.dumps({"stdout": passwd})}),
+    ])
+    assert verify(LocalVerifier(), "lfi_basic_passwd", passwd, messages) is None
+
+
+def test_file_inclusion_with_baseline_is_scored_locally():
+    messages = rollout([
+        ("http_get", {"path": "/vulnerabilities/fi/"}),
+        ("http_get", {"path": "/vulnerabilities/fi/", "params": {"page": "../../../../etc/passwd"}}),
+    ])
+    verifier = LocalVerifier()
+    verdict = verify(verifier, "lfi_basic_passwd", echo(messages), messages)
+    assert verdict["score"] == verifier.success_score
+    assert verifier.hit_rate("file_inclusion") == 1.0
+
+
+def test_response_without_baseline_goes_to_judge():
+    messages = rollout([
+        ("http_get", {"path": "/vulnerabilities/fi/", "params": {"page": "../../../../etc/passwd"}}),
+    ])
+    assert verify(LocalVerifier(), "lfi_basic_passwd", echo(messages), messages) is None
+
+
+def test_baseline_is_remembered_across_rollouts():
+    verifier = LocalVerifier()
+    verify(verifier, "lfi_basic_passwd", "nothing yet", rollout([("http_get", {"path": "/vulnerabilities/fi/"})]))
+
+    messages = rollout([
+        ("http_get", {"path": "/vulnerabilities/fi/", "params": {"page": "../../../../etc/passwd"}}),
+    ])
+    assert verify(verifier, "lfi_basic_passwd", echo(messages), messages) is not None
+
+
+def test_plain_get_after_state_change_is_not_a_baseline():
+    verifier = LocalVerifier()
+    payload = "<script>alert('stored')</script>"
+    messages = rollout([
+        ("http_post", {"path": "/vulnerabilities/xss_s/", "data": {
+            "txtName": "x", "mtxMessage": payload, "btnSign": "Sign Guestbook"}}),
+        ("http_get", {"path": "/vulnerabilities/xss_s/"}),
+    ])
+    verify(verifier, "xss_stored_basic", payload + " stored", messages)
+    assert "/vulnerabilities/xss_s/" not in verifier.baseline_fragments
+
+
+def test_reflected_xss_is_scored_locally():
+    payload = "<img src=x onerror=alert(1) onload=alert(2)>"
+    messages = rollout([
+        ("http_get", {"path": "/vulnerabilities/xss_r/"}),
+        ("http_get", {"path": "/vulnerabilities/xss_r/", "params": {"name": "<script>alert(1)</script>"}}),
+        ("http_get", {"path": "/vulnerabilities/xss_r/", "params": {"name": payload}}),
+    ])
+    answer = f"Reflected: <script>alert(1)</script> and {payload}"
+    assert verify(LocalVerifier(), "xss_reflected_basic", answer, messages) is not None
+
+
+def test_answer_claim_missing_from_responses_goes_to_judge():
+    messages = rollout([
+        ("http_get", {"path": "/vulnerabilities/xss_r/"}),
+        ("http_get", {"path": "/vulnerabilities/xss_r/", "params": {"name": "test"}}),
+    ])
+    answer = "<script>alert(1)</script> <img onerror=alert(1) onload=alert(2)>"
+    assert verify(LocalVerifier(), "xss_reflected_basic", answer, messages) is None
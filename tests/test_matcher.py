@@ -0,0 +1,62 @@
+"""Tests for the signature index (src/mcp_server/matcher.py)"""
+
+import random
+
+import pytest
+
+from src.mcp_server.matcher import SignatureIndex
+from src.mcp_server.tools import SHELL_INDICATORS, XSS_SIGNATURES
+
+
+def naive_found(signatures, text, case_insensitive=False):
+    """The per-signature `in` loop the index replaces"""
+    if case_insensitive:
+        text = text.lower()
+        return [s for s in signatures if s.lower() in text]
+    return [s for s in signatures if s in text]
+
+
+def test_reports_matches_in_declaration_order():
+    index = SignatureIndex(["www-data:", "root:", "bin:"])
+    assert index.found_in_order("root:x:0:0\nwww-data:x:33") == ["www-data:", "root:"]
+    assert index.first_match("root:x:0:0\nwww-data:x:33") == "www-data:"
+    assert index.first_match("nothing") == ""
+    assert index.matches("bin:x") and not index.matches("")
+
+
+def test_overlapping_and_nested_signatures():
+    # "she" ends inside "shell"; "he" is a suffix of "she"; "hers" shares the h-e prefix
+    signatures = ["he", "she", "his", "hers", "shell"]
+    index = SignatureIndex(signatures)
+    for text in ["ushers", "shell", "hishe", "h", "sh", "xhershellx"]:
+        assert index.found_in_order(text) == naive_found(signatures, text), text
+
+
+def test_case_insensitive_matching():
+    index = SignatureIndex(["<SCRIPT", "onerror"], case_insensitive=True)
+    assert index.found_in_order("<script OnError=") == ["<SCRIPT", "onerror"]
+    assert SignatureIndex(["<SCRIPT"]).found_in_order("<script") == []
+
+
+@pytest.mark.parametrize("case_insensitive", [False, True])
+def test_agrees_with_naive_search_on_random_input(case_insensitive):
+    rng = random.Random(1234)
+    alphabet = "abAB:/"
+    for _ in range(300):
+        signatures = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 6))
+        ]
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        index = SignatureIndex(signatures, case_insensitive=case_insensitive)
+        assert index.found_in_order(text) == naive_found(signatures, text, case_insensitive)
+
+
+@pytest.mark.parametrize("index,case_insensitive,text", [
+    (SHELL_INDICATORS, False, "uid=33(www-data) gid=33(www-data)\nLinux dvwa 5.10"),
+    (SHELL_INDICATORS, False, "PING 127.0.0.1 (127.0.0.1) 56(84) bytes of data."),
+    (XSS_SIGNATURES, True, "<IMG SRC=x OnError=alert(document.cookie)>"),
+    (XSS_SIGNATURES, True, "<b>hello</b>"),
+])
+def test_verification_indexes_match_naive_search(index, case_insensitive, text):
+    assert index.found_in_order(text) == naive_found(index.signatures, text, case_insensitive)
@@ -0,0 +1,101 @@
+"""Tests for the MCP verification tools' HTTP path (src/mcp_server/tools.py)"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.mcp_server import tools
+
+
+PAGE = "/vulnerabilities/sqli/"
+
+
+class FakeGuestbook:
+    """Target whose pages change after a POST, like DVWA's stored XSS"""
+
+    def __init__(self):
+        self.entries = []
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.method)
+        if request.method == "POST":
+            self.entries.append(dict(httpx.QueryParams(request.content.decode()))["mtxMessage"])
+        return httpx.Response(200, text="<div>" + "".join(self.entries) + "</div>")
+
+
+@pytest.fixture
+def target(monkeypatch):
+    guestbook = FakeGuestbook()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(guestbook.handler))
+    monkeypatch.setattr(tools, "_http_client", client)
+    monkeypatch.setattr(tools, "VERIFY_CACHE_TTL", 10.0)
+    tools._get_cache.clear()
+    yield guestbook
+    tools._get_cache.clear()
+
+
+def verify(method: str, params=None, pattern=None, path=PAGE) -> dict:
+    return json.loads(asyncio.run(tools.verify_http_response(
+        method, path, params, pattern
+    )))
+
+
+def test_repeated_get_is_served_from_cache(target):
+    verify("GET")
+    verify("GET")
+    assert target.requests == ["GET"]
+
+
+def test_pages_rollouts_write_to_are_never_cached(target):
+    # Rollouts post to these directly, so no verifier POST would invalidate them
+    for path in ("/vulnerabilities/xss_s/", "/vulnerabilities/csrf/", "/login.php"):
+        verify("GET", path=path)
+        verify("GET", path=path)
+    assert target.requests == ["GET"] * 6
+
+
+def test_cache_is_off_without_a_ttl(target, monkeypatch):
+    monkeypatch.setattr(tools, "VERIFY_CACHE_TTL", 0.0)
+    verify("GET")
+    verify("GET")
+    assert target.requests == ["GET", "GET"]
+    assert not tools._get_cache
+
+
+def test_post_invalidates_cached_get(target):
+    before = verify("GET", pattern="<script>")
+    verify("POST", {"txtName": "x", "mtxMessage": "<script>alert(1)</script>"})
+    after = verify("GET", pattern="<script>")
+
+    assert before["success"] is False
+    assert after["success"] is True
+    assert target.requests == ["GET", "POST", "GET"]
+
+
+def test_get_in_flight_across_a_post_is_not_cached(monkeypatch):
+    async def scenario():
+        release = asyncio.Event()
+        started = asyncio.Event()
+
+        async def slow_get(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                started.set()
+                await release.wait()
+                return httpx.Response(200, text="stale page")
+            return httpx.Response(200, text="posted")
+
+        monkeypatch.setattr(tools, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(slow_get)))
+        get = asyncio.ensure_future(tools._fetch("GET", PAGE))
+        await started.wait()
+        await tools._fetch("POST", PAGE, {"mtxMessage": "x"})
+        release.set()
+        return await get
+
+    monkeypatch.setattr(tools, "VERIFY_CACHE_TTL", 10.0)
+    tools._get_cache.clear()
+    assert asyncio.run(scenario()) == (200, "stale page")
+    # The response fetched before the POST landed must not be served later
+    assert not tools._get_cache
@@ -0,0 +1,73 @@
+"""Tests for SecurityAgentTrainer rollout collection and cleanup (src/training/orchestrator.py)"""
+
+import asyncio
+import dataclasses
+
+import pytest
+
+from src.training import orchestrator
+from src.training.config import TINY_TEST_CONFIG
+from src.training.orchestrator import SecurityAgentTrainer
+
+
+def make_trainer(**overrides) -> SecurityAgentTrainer:
+    config = dataclasses.replace(TINY_TEST_CONFIG, use_local_verifier=False, **overrides)
+    return SecurityAgentTrainer(config)
+
+
+def test_concurrent_collection_keeps_group_order():
+    trainer = make_trainer(rollouts_per_group=3)
+
+    async def rollout(challenge, rollout_idx):
+        # Later rollouts finish first
+        await asyncio.sleep(0.01 * (3 - rollout_idx))
+        return {"id": challenge["id"], "idx": rollout_idx}
+
+    trainer._run_rollout_and_judge = rollout
+    groups = asyncio.run(trainer._collect_groups_concurrent([{"id": "a"}, {"id": "b"}]))
+
+    assert [[t["id"] for t in g] for g in groups] == [["a"] * 3, ["b"] * 3]
+    assert [[t["idx"] for t in g] for g in groups] == [[0, 1, 2], [0, 1, 2]]
+
+
+def test_failed_rollout_cancels_its_siblings():
+    trainer = make_trainer(rollouts_per_group=2)
+    cancelled = []
+
+    async def rollout(challenge, rollout_idx):
+        if challenge["id"] == "bad":
+            raise RuntimeError("target down")
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append((challenge["id"], rollout_idx))
+            raise
+
+    trainer._run_rollout_and_judge = rollout
+    with pytest.raises(RuntimeError):
+        asyncio.run(trainer._collect_groups_concurrent([{"id": "good"}, {"id": "bad"}]))
+    assert sorted(cancelled) == [("good", 0), ("good", 1)]
+
+
+def test_train_cleans_up_when_a_step_fails(monkeypatch):
+    trainer = make_trainer()
+    closed = []
+
+    async def fail(challenges):
+        raise RuntimeError("step failed")
+
+    async def close_all_clients():
+        closed.append("clients")
+
+    monkeypatch.setattr(trainer, "_train_steps", fail)
+    monkeypatch.setattr(orchestrator, "close_all_clients", close_all_clients)
+    monkeypatch.setattr(orchestrator, "close_command_executor", lambda: closed.append("executor"))
+
+    async def scenario():
+        await trainer.judge_pipeline.start()
+        with pytest.raises(RuntimeError):
+            await trainer.train([{"id": "a"}])
+
+    asyncio.run(scenario())
+    assert closed == ["clients", "executor"]
+    assert not trainer.judge_pipeline.running
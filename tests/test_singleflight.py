@@ -0,0 +1,122 @@
+"""Tests for judge evaluation coalescing (src/judge/singleflight.py)"""
+
+import asyncio
+
+from src.judge.singleflight import SingleFlight
+
+
+class Evaluation:
+    """A controllable shared call that counts its executions"""
+
+    def __init__(self, result="verdict"):
+        self.result = result
+        self.release = asyncio.Event()
+        self.calls = 0
+        self.cancelled = False
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_concurrent_callers_share_one_execution():
+    async def scenario():
+        flights = SingleFlight()
+        evaluation = Evaluation()
+        callers = [asyncio.ensure_future(flights.do("k", evaluation)) for _ in range(3)]
+        await asyncio.sleep(0)
+        evaluation.release.set()
+        return flights, evaluation, await asyncio.gather(*callers)
+
+    flights, evaluation, results = asyncio.run(scenario())
+    assert evaluation.calls == 1
+    assert [r for r, _ in results] == ["verdict"] * 3
+    # Exactly one caller owns the result
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert flights.stats() == {
+        "in_flight": 0, "executions": 1, "coalesced": 2, "coalesced_ratio": 2 / 3,
+    }
+
+
+def test_different_keys_do_not_coalesce():
+    async def scenario():
+        flights = SingleFlight()
+        a, b = Evaluation("a"), Evaluation("b")
+        calls = [asyncio.ensure_future(flights.do("a", a)), asyncio.ensure_future(flights.do("b", b))]
+        await asyncio.sleep(0)
+        a.release.set()
+        b.release.set()
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(scenario()) == [("a", False), ("b", False)]
+
+
+def test_exception_reaches_every_caller():
+    async def scenario():
+        flights = SingleFlight()
+        evaluation = Evaluation(RuntimeError("judge down"))
+        callers = [asyncio.ensure_future(flights.do("k", evaluation)) for _ in range(2)]
+        await asyncio.sleep(0)
+        evaluation.release.set()
+        return await asyncio.gather(*callers, return_exceptions=True), flights
+
+    outcomes, flights = asyncio.run(scenario())
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_cancelled_leader_hands_the_result_to_a_follower():
+    async def scenario():
+        flights = SingleFlight()
+        evaluation = Evaluation()
+        leader = asyncio.ensure_future(flights.do("k", evaluation))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("k", evaluation))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        evaluation.release.set()
+        return leader, await follower, evaluation
+
+    leader, (result, shared), evaluation = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert not evaluation.cancelled
+    # Nobody else received the result, so the follower reports its usage
+    assert (result, shared) == ("verdict", False)
+
+
+def test_execution_is_cancelled_when_every_caller_leaves():
+    async def scenario():
+        flights = SingleFlight()
+        evaluation = Evaluation()
+        callers = [asyncio.ensure_future(flights.do("k", evaluation)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return flights, evaluation
+
+    flights, evaluation = asyncio.run(scenario())
+    assert evaluation.cancelled
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_new_call_after_completion_runs_again():
+    async def scenario():
+        flights = SingleFlight()
+        evaluation = Evaluation()
+        evaluation.release.set()
+        first = await flights.do("k", evaluation)
+        second = await flights.do("k", evaluation)
+        return first, second, evaluation.calls
+
+    assert asyncio.run(scenario()) == (("verdict", False), ("verdict", False), 2)